@@ -0,0 +1,79 @@
+"""
+Thread scaling benchmark for the batch pricers.
+
+Prices a synthetic book of zero-coupon and conventional gilts with
+:func:`fift_analytics.gilts.parallel.map_batch` on 1, 2, 4, ... threads and prints the throughput
+and speed-up over one thread. Run it on a regular and on a free-threaded CPython build
+(e.g. ``python3.13t``) to compare::
+
+    python benchmarks/thread_scaling.py --rows 2000000 --max-threads 8
+
+"""
+import argparse
+import os
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from fift_analytics.gilts.fixed_coupon.dmo_fixed_pricers import calculate_fixed_coupon_gilt_price_dmo_batch
+from fift_analytics.gilts.parallel import map_batch
+from fift_analytics.gilts.zero_coupon.zc_pricers import get_zero_coupon_gilt_price_batch
+
+
+def _book(n_rows: int, seed: int = 0) -> dict[str, dict[str, np.ndarray]]:
+    rng = np.random.default_rng(seed)
+    settlement = np.datetime64("2025-02-17")
+    maturity = settlement + rng.integers(30, 50 * 365, n_rows).astype("timedelta64[D]")
+    annual_yield = rng.uniform(0.0, 0.06, n_rows)
+    return {
+        "zero-coupon": {"face_value": np.full(n_rows, 100.0), "annual_yield": annual_yield, "maturity_date": maturity},
+        "conventional": {
+            "annual_coupon_rate": rng.uniform(0.0, 0.06, n_rows),
+            "maturity_date": maturity,
+            "nominal_redemption_yield": annual_yield,
+        },
+    }
+
+
+def _time(function, columns, n_threads: int, chunk_size: int, repeat: int, **options) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        map_batch(function, columns, workers=n_threads, chunk_size=chunk_size, **options)
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--max-threads", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"python {sys.version.split()[0]}  GIL {'enabled' if gil_enabled else 'disabled'}  cpus {os.cpu_count()}")
+
+    book = _book(args.rows)
+    options = {"settlement_date": "2025-02-17", "precision": "raw"}
+    kernels = {
+        "zero-coupon": (get_zero_coupon_gilt_price_batch, options),
+        "conventional": (calculate_fixed_coupon_gilt_price_dmo_batch, options),
+    }
+    thread_counts = [1 << i for i in range(args.max_threads.bit_length()) if 1 << i <= args.max_threads]
+
+    for name, (function, options) in kernels.items():
+        baseline = None
+        for n_threads in thread_counts:
+            seconds = _time(function, book[name], n_threads, args.chunk_size, args.repeat, **options)
+            baseline = baseline or seconds
+            print(
+                f"{name:<13} threads {n_threads:>3}  {args.rows / seconds:>14,.0f} rows/s  "
+                f"speed-up {baseline / seconds:.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""
+Command Line Interface
+======================
+
+``fift-analytics`` entry point for batch pricing and risk runs, e.g. overnight jobs::
+
+    fift-analytics batch-price zero-coupon positions.csv --settlement-date 2025-02-17 --output prices.csv
+    fift-analytics risk conventional positions.csv --curve curves.csv --workers 4 --output dv01.csv
+    fift-analytics batch-price conventional positions.csv --workers 8 --executor thread
+    fift-analytics curve curves.csv 6 12 120
+
+Position files are csv files with a header row:
+
+- zero-coupon: ``face_value``, ``maturity_date`` and ``annual_yield``.
+- conventional: ``annual_coupon_rate``, ``maturity_date``, ``nominal_redemption_yield`` and optionally
+  ``nominal`` to scale the DV01 (default 100, i.e. DV01 per £100 nominal). Prices are per £100 nominal.
+
+Either file may have a ``settlement_date`` column to settle each row on its own date, in which case
+``--settlement-date`` must not be given; otherwise every row settles on ``--settlement-date`` (default today).
+
+With ``--curve`` the yield column is not needed: each bond is priced at the yield interpolated from the
+zero curve for its remaining maturity. Curve files use the ``date,tenor_months,yield`` format of
+:func:`~fift_analytics.gilts.curve_replay.read_curve_snapshots`; the last snapshot is used unless
+``--curve-date`` is given.
+
+Results are written as csv (input columns followed by result columns) to ``--output`` or stdout, and a
+run report with rows per second, the time spent in each stage and the peak resident set size (of the main
+process and of the largest worker process, where the platform reports it) is printed to stderr. With
+``--trace-memory`` the report adds the peak allocation of each stage of the main process, traced with
+:mod:`tracemalloc`; tracing slows the run down, and excludes the worker processes of ``--executor process``.
+
+"""
+import argparse
+import csv
+import sys
+from contextlib import ExitStack, contextmanager
+from functools import partial
+from time import perf_counter
+from typing import Callable, Iterator, Optional, Sequence
+
+import numpy as np
+
+from fift_analytics.gilts.curve_replay import read_curve_snapshots
+from fift_analytics.gilts.day_count import year_fraction
+from fift_analytics.gilts.execution import allocation_stage, track_allocations
+from fift_analytics.gilts.fixed_coupon.dmo_accrued_interest import calculate_gilt_clean_price_batch
+from fift_analytics.gilts.fixed_coupon.dmo_fixed_pricers import calculate_fixed_coupon_gilt_price_dmo_batch
+from fift_analytics.gilts.parallel import (
+    DEFAULT_CHUNK_SIZE,
+    ExecutorKind,
+    concatenate_results,
+    make_executor,
+    split_rows,
+)
+from fift_analytics.gilts.precision import apply_precision
+from fift_analytics.gilts.uk_calendar import to_datetime64
+from fift_analytics.gilts.zero_coupon.curve_yield_extrapolation import derive_yield_from_zero_curve_batch
+from fift_analytics.gilts.zero_coupon.zc_dvone import calculate_zero_coupon_bond_dv01_batch
+from fift_analytics.gilts.zero_coupon.zc_pricers import get_zero_coupon_gilt_price_batch
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+DATE_COLUMNS = ("maturity_date", "settlement_date")
+
+POSITION_COLUMNS = {
+    "zero-coupon": ("face_value", "maturity_date", "annual_yield"),
+    "conventional": ("annual_coupon_rate", "maturity_date", "nominal_redemption_yield"),
+}
+
+ONE_BASIS_POINT = 0.0001
+
+SETTLEMENT_DATE_HELP = "settlement date as YYYY-MM-DD (default today); not with a settlement_date column"
+
+TRACE_MEMORY_HELP = "report the peak allocation of each stage of the main process (slower; excludes workers)"
+
+
+class RunReport:
+    """
+    Wall-clock time per stage and row count of a run.
+    """
+
+    def __init__(self) -> None:
+        self.timings: dict[str, float] = {}
+        self.n_rows = 0
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time a stage of the run, accumulating if the stage is entered more than once. The stage is also
+        recorded by the current :func:`~fift_analytics.gilts.execution.track_allocations` context, if any.
+
+        :param name: Stage name.
+        """
+        start = perf_counter()
+        try:
+            with allocation_stage(name):
+                yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + perf_counter() - start
+
+    def format(self, peak_rss: Optional[int] = None, peak_worker_rss: Optional[int] = None) -> str:
+        """
+        Format the report.
+
+        :param peak_rss: Peak resident set size of the main process in bytes, or None if unknown.
+        :param peak_worker_rss: Peak resident set size of the largest worker process in bytes, or None if unknown.
+        :return: Multi-line report.
+        :rtype: str
+        """
+        total = sum(self.timings.values())
+        lines = [f"rows: {self.n_rows}  total: {total:.3f}s  rows/s: {self.n_rows / total if total else 0:,.0f}"]
+        lines += [f"  {name:<10} {seconds:.3f}s" for name, seconds in self.timings.items()]
+        if peak_rss is not None:
+            line = f"peak RSS: {peak_rss / 2**20:.1f} MiB (main process)"
+            if peak_worker_rss:
+                line += f", {peak_worker_rss / 2**20:.1f} MiB (largest worker process)"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+def peak_rss() -> tuple[Optional[int], Optional[int]]:
+    """
+    Peak resident set size of this process and of its largest terminated child process, e.g. a worker.
+
+    :return: Peak sizes in bytes, or None where the platform does not report them (Windows).
+    :rtype: tuple[Optional[int], Optional[int]]
+    """
+    if resource is None:
+        return None, None
+    scale = 1 if sys.platform == "darwin" else 1024  # ru_maxrss is in bytes on macOS, KiB elsewhere
+    return (
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale,
+    )
+
+
+def read_positions(path: str, required: Sequence[str] = ()) -> dict[str, np.ndarray]:
+    """
+    Read a position csv file into columns: dates as ``datetime64[D]``, everything else as float64.
+
+    :param path: Path of the csv file.
+    :param required: Columns that must be present.
+    :raises ValueError: If a required column is missing or a value cannot be parsed.
+    :return: Columns by name.
+    :rtype: dict[str, np.ndarray]
+    """
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        values = list(zip(*reader)) or [()] * len(header)
+
+    missing = [name for name in required if name not in header]
+    if missing:
+        raise ValueError(f"Missing columns in position file: {', '.join(missing)}.")
+
+    return {
+        name: to_datetime64(np.array(column)) if name in DATE_COLUMNS else np.array(column, dtype=np.float64)
+        for name, column in zip(header, values)
+    }
+
+
+def write_results(path: Optional[str], columns: dict[str, np.ndarray]) -> None:
+    """
+    Write columns as csv to a file, or to stdout if no path is given.
+
+    :param path: Output path, or None for stdout.
+    :param columns: Columns by name, all with the same length.
+    """
+    f = open(path, "w", newline="") if path else sys.stdout
+    try:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(zip(*(column.astype(str) for column in columns.values())))
+    finally:
+        if path:
+            f.close()
+
+
+def _settlement(columns: dict[str, np.ndarray], settlement_date) -> np.ndarray:
+    return columns.get("settlement_date", settlement_date)
+
+
+def _zero_coupon_price(columns: dict[str, np.ndarray], settlement_date, precision) -> dict[str, np.ndarray]:
+    settlement_date = _settlement(columns, settlement_date)
+    price = get_zero_coupon_gilt_price_batch(
+        columns["face_value"], columns["annual_yield"], columns["maturity_date"], settlement_date, precision
+    )
+    return {"price": price}
+
+
+def _zero_coupon_risk(columns: dict[str, np.ndarray], settlement_date, precision) -> dict[str, np.ndarray]:
+    settlement_date = _settlement(columns, settlement_date)
+    dv01 = calculate_zero_coupon_bond_dv01_batch(
+        columns["face_value"], columns["annual_yield"], columns["maturity_date"], settlement_date, precision=precision
+    )
+    return {"dv01": dv01}
+
+
+def _conventional_price(columns: dict[str, np.ndarray], settlement_date, precision) -> dict[str, np.ndarray]:
+    prices = calculate_gilt_clean_price_batch(
+        columns["annual_coupon_rate"],
+        _settlement(columns, settlement_date),
+        columns["maturity_date"],
+        columns["nominal_redemption_yield"],
+        precision,
+    )
+    return {
+        "clean_price": prices.clean_price,
+        "dirty_price": prices.dirty_price,
+        "accrued_interest": prices.accrued_interest,
+    }
+
+
+def _conventional_risk(columns: dict[str, np.ndarray], settlement_date, precision) -> dict[str, np.ndarray]:
+    args = (columns["annual_coupon_rate"], _settlement(columns, settlement_date), columns["maturity_date"])
+    nominal_redemption_yield = columns["nominal_redemption_yield"]
+    price = calculate_fixed_coupon_gilt_price_dmo_batch(*args, nominal_redemption_yield, "raw")
+    price_up = calculate_fixed_coupon_gilt_price_dmo_batch(*args, nominal_redemption_yield + ONE_BASIS_POINT, "raw")
+    nominal = columns.get("nominal", np.full(price.shape, 100.0))
+    return {"dv01": apply_precision(nominal / 100 * (price - price_up), precision)}
+
+
+ENGINES: dict[tuple[str, str], Callable[..., dict[str, np.ndarray]]] = {
+    ("batch-price", "zero-coupon"): _zero_coupon_price,
+    ("risk", "zero-coupon"): _zero_coupon_risk,
+    ("batch-price", "conventional"): _conventional_price,
+    ("risk", "conventional"): _conventional_risk,
+}
+
+
+def run_engine(
+    engine: Callable[..., dict[str, np.ndarray]],
+    columns: dict[str, np.ndarray],
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    executor: ExecutorKind = "process",
+    **kwargs,
+) -> dict[str, np.ndarray]:
+    """
+    Run a batch engine over all the rows, optionally splitting them into chunks across a worker pool.
+
+    :param engine: Function mapping a dict of columns to a dict of result columns.
+    :param columns: Input columns, all with the same length.
+    :param workers: Number of workers (1 runs in process).
+    :param chunk_size: Largest number of rows sent to a worker at once.
+    :param executor: "process" (default) or "thread".
+    :param kwargs: Other keyword arguments of ``engine``.
+    :return: Result columns for all the rows, in input order.
+    :rtype: dict[str, np.ndarray]
+    """
+    if workers <= 1:
+        return engine(columns, **kwargs)
+
+    n_rows = len(next(iter(columns.values())))
+    chunks = split_rows(columns, max(workers, -(-n_rows // chunk_size)))
+
+    with make_executor(executor, workers) as pool:
+        results = list(pool.map(partial(engine, **kwargs), chunks))
+    return concatenate_results(results)
+
+
+def _select_curve(path: str, curve_date: Optional[str]) -> list[tuple[int, float]]:
+    zero_curve = None
+    for snapshot in read_curve_snapshots(path):
+        zero_curve = snapshot.zero_curve
+        if curve_date is not None and snapshot.date == np.datetime64(curve_date, "D"):
+            return zero_curve
+    if zero_curve is None or curve_date is not None:
+        raise ValueError("Curve date not found in curve file." if curve_date else "Curve file is empty.")
+    return zero_curve
+
+
+def _run_positions(args: argparse.Namespace, report: RunReport) -> None:
+    yield_column = POSITION_COLUMNS[args.instrument][-1]
+    settlement_date = np.datetime64(args.settlement_date or "today", "D")
+    required = POSITION_COLUMNS[args.instrument][:-1] if args.curve else POSITION_COLUMNS[args.instrument]
+
+    with report.stage("read"):
+        columns = read_positions(args.positions, required)
+        report.n_rows = len(columns["maturity_date"])
+    if "settlement_date" in columns and args.settlement_date:
+        raise ValueError("Use either --settlement-date or a settlement_date column, not both.")
+
+    if args.curve:
+        with report.stage("curve"):
+            zero_curve = _select_curve(args.curve, args.curve_date)
+            months_to_maturity = np.maximum(
+                12 * year_fraction(_settlement(columns, settlement_date), columns["maturity_date"]), 0
+            )
+            columns[yield_column] = derive_yield_from_zero_curve_batch(zero_curve, months_to_maturity)
+
+    with report.stage("compute"):
+        results = run_engine(
+            ENGINES[(args.command, args.instrument)],
+            columns,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            executor=args.executor,
+            settlement_date=settlement_date,
+            precision=args.precision,
+        )
+
+    with report.stage("write"):
+        write_results(args.output, {**columns, **results})
+
+
+def _run_curve(args: argparse.Namespace, report: RunReport) -> None:
+    with report.stage("read"):
+        zero_curve = _select_curve(args.curve, args.curve_date)
+        target_maturity = np.asarray(args.maturity_months, dtype=np.float64)
+        report.n_rows = target_maturity.size
+
+    with report.stage("compute"):
+        annual_yield = derive_yield_from_zero_curve_batch(zero_curve, target_maturity)
+
+    with report.stage("write"):
+        write_results(args.output, {"maturity_months": target_maturity, "annual_yield": annual_yield})
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the argument parser of the ``fift-analytics`` command.
+
+    :return: Argument parser.
+    :rtype: argparse.ArgumentParser
+    """
+    parser = argparse.ArgumentParser(prog="fift-analytics", description="Batch pricing and risk for UK gilts.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for command, help_text in (("batch-price", "price a position file"), ("risk", "DV01 of a position file")):
+        subparser = subparsers.add_parser(command, help=help_text)
+        subparser.add_argument("instrument", choices=sorted(POSITION_COLUMNS))
+        subparser.add_argument("positions", help="position csv file")
+        subparser.add_argument("--settlement-date", help=SETTLEMENT_DATE_HELP)
+        subparser.add_argument("--curve", help="curve csv file; yields are interpolated from it")
+        subparser.add_argument("--curve-date", help="curve snapshot to use (default the last one)")
+        subparser.add_argument("--precision", choices=("reporting", "raw"), default=None)
+        subparser.add_argument("--workers", type=int, default=1, help="number of workers (default 1)")
+        subparser.add_argument("--executor", choices=("process", "thread"), default="process", help="worker pool")
+        subparser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows per worker task")
+        subparser.add_argument("--output", help="output csv file (default stdout)")
+        subparser.add_argument("--trace-memory", action="store_true", help=TRACE_MEMORY_HELP)
+        subparser.set_defaults(run=_run_positions)
+
+    subparser = subparsers.add_parser("curve", help="interpolate yields from a zero curve")
+    subparser.add_argument("curve", help="curve csv file")
+    subparser.add_argument("maturity_months", type=float, nargs="+", help="target maturities in months")
+    subparser.add_argument("--curve-date", help="curve snapshot to use (default the last one)")
+    subparser.add_argument("--output", help="output csv file (default stdout)")
+    subparser.add_argument("--trace-memory", action="store_true", help=TRACE_MEMORY_HELP)
+    subparser.set_defaults(run=_run_curve)
+
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the ``fift-analytics`` command.
+
+    :param argv: Command line arguments, defaults to ``sys.argv[1:]``.
+    :return: Exit code.
+    :rtype: int
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    report = RunReport()
+
+    with ExitStack() as stack:
+        tracker = stack.enter_context(track_allocations()) if args.trace_memory else None
+        try:
+            args.run(args, report)
+        except (ValueError, OSError) as e:
+            parser.exit(2, f"fift-analytics: error: {e}\n")
+
+    print(report.format(*peak_rss()), file=sys.stderr)
+    if tracker is not None:
+        print("allocations (main process, excludes worker processes):", file=sys.stderr)
+        print(tracker.format_report(), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
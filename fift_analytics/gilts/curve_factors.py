@@ -0,0 +1,233 @@
+"""
+Curve Factors
+=============
+
+Principal component model of zero-curve moves, for fast scenario generation and scenario P&L.
+
+A history of zero curves in the ``list[tuple[int, float]]`` format of
+:func:`~fift_analytics.gilts.zero_coupon.curve_yield_extrapolation.derive_yield_from_zero_curve` is sampled on common
+tenors, and the principal components of the curve changes over ``lag`` observations are the factor loadings
+:math:`L` (factors x tenors): typically level, slope and curvature for the first three, explaining almost all of the
+variance. Each loading is signed so that its largest entry is positive.
+
+A book's bond x node sensitivities (:class:`~fift_analytics.gilts.curve_sensitivities.CurveSensitivities`) are
+projected once onto the factors. Each bond's yield is linear in the node yields, :math:`y_b = w_b \\cdot Y`, so
+factor moves :math:`f` (scenarios x factors) move the bond yields by :math:`f E^T` with :math:`E = W L^T`
+(bonds x factors), and the scenario P&L is a small matrix product followed by each bond's own delta and gamma:
+
+.. math:: \\text{P\\&L}_{sb} \\approx \\frac{\\partial P_b}{\\partial y_b} (f E^T)_{sb}
+          + \\frac{1}{2} \\frac{\\partial^2 P_b}{\\partial y_b^2} (f E^T)_{sb}^2
+
+:Example:
+    >>> rng = np.random.default_rng(0)
+    >>> tenors = np.array([3, 24, 60, 120, 360])
+    >>> level, slope = 0.0005 * rng.standard_normal((2, 250, 1))
+    >>> moves = level + 0.6 * slope * (tenors / 360 - 0.5)
+    >>> curves = [list(zip(tenors.tolist(), (0.04 + move).tolist())) for move in np.cumsum(moves, axis=0)]
+    >>> model = fit_curve_factors(curves, n_factors=2)
+    >>> model.loadings.round(2)
+    array([[ 0.46,  0.46,  0.45,  0.45,  0.42],
+           [-0.36, -0.29, -0.17,  0.04,  0.87]])
+    >>> model.explained_variance_ratio.round(3)
+    array([0.958, 0.042])
+
+"""
+from typing import Iterable, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from fift_analytics.gilts.curve_sensitivities import CurveSensitivities
+from fift_analytics.gilts.zero_coupon.curve_yield_extrapolation import derive_yield_from_zero_curve_batch
+
+DEFAULT_FACTORS = 3
+
+
+class CurveFactorModel(NamedTuple):
+    """
+    Principal components of zero-curve changes.
+
+    :param tenors: Tenors in months the curves are sampled on.
+    :param loadings: Unit factor loadings, shape ``(n_factors, n_tenors)``.
+    :param factor_volatility: Standard deviation of each factor over one change (decimal yield).
+    :param explained_variance_ratio: Share of the variance of the curve changes explained by each factor.
+    :param mean_change: Mean curve change over the history, removed before the decomposition.
+    """
+
+    tenors: np.ndarray
+    loadings: np.ndarray
+    factor_volatility: np.ndarray
+    explained_variance_ratio: np.ndarray
+    mean_change: np.ndarray
+
+
+def sample_curves(curves: Iterable[list[tuple[int, float]]], tenors) -> np.ndarray:
+    """
+    Sample zero curves on common tenors, interpolating as
+    :func:`~fift_analytics.gilts.zero_coupon.curve_yield_extrapolation.derive_yield_from_zero_curve`.
+
+    :param curves: Zero curves as lists of (maturity_in_months, annual_yield).
+    :param tenors: Tenors in months.
+    :return: Yields of shape ``(n_curves, n_tenors)``.
+    :rtype: np.ndarray
+    """
+    tenors = np.asarray(tenors, dtype=np.float64)
+    return np.array([derive_yield_from_zero_curve_batch(curve, tenors) for curve in curves]).reshape(-1, tenors.size)
+
+
+def fit_curve_factors(
+    curves: Sequence[list[tuple[int, float]]],
+    n_factors: int = DEFAULT_FACTORS,
+    tenors=None,
+    lag: int = 1,
+) -> CurveFactorModel:
+    """
+    Fit the principal components of the changes of a history of zero curves.
+
+    :param curves: Zero curves in date order, as lists of (maturity_in_months, annual_yield).
+    :param n_factors: Number of factors to keep.
+    :param tenors: Tenors in months to sample the curves on, defaults to the tenors of the first curve.
+    :param lag: Number of observations between the curves of each change (e.g. 1 for daily, 5 for weekly
+                changes of daily curves).
+    :raises ValueError: If there are fewer than two changes, or more factors than tenors or changes.
+    :return: The factor model.
+    :rtype: CurveFactorModel
+    """
+    curves = list(curves)
+    if tenors is None:
+        tenors = sorted(tenor for tenor, _ in curves[0]) if curves else []
+    tenors = np.asarray(tenors, dtype=np.float64)
+
+    yields = sample_curves(curves, tenors)
+    changes = yields[lag:] - yields[:-lag]
+    if changes.shape[0] < 2:
+        raise ValueError("Curve history must contain at least two changes.")
+    if not 1 <= n_factors <= min(tenors.size, changes.shape[0]):
+        raise ValueError("Number of factors must be between 1 and the number of tenors and of changes.")
+
+    mean_change = changes.mean(axis=0)
+    _, singular_values, components = np.linalg.svd(changes - mean_change, full_matrices=False)
+    variance = singular_values**2 / (changes.shape[0] - 1)
+
+    loadings = components[:n_factors]
+    largest = loadings[np.arange(n_factors), np.abs(loadings).argmax(axis=1)]
+    loadings = loadings * np.sign(largest)[:, None]
+
+    return CurveFactorModel(
+        tenors=tenors,
+        loadings=loadings,
+        factor_volatility=np.sqrt(variance[:n_factors]),
+        explained_variance_ratio=variance[:n_factors] / variance.sum(),
+        mean_change=mean_change,
+    )
+
+
+def factor_scores(model: CurveFactorModel, curves: Sequence[list[tuple[int, float]]], lag: int = 1) -> np.ndarray:
+    """
+    Project the changes of a history of zero curves onto the factors, e.g. to replay history in factor space.
+
+    :param model: Factor model.
+    :param curves: Zero curves in date order.
+    :param lag: Number of observations between the curves of each change.
+    :return: Factor moves of shape ``(n_changes, n_factors)``.
+    :rtype: np.ndarray
+    """
+    yields = sample_curves(curves, model.tenors)
+    return (yields[lag:] - yields[:-lag]) @ model.loadings.T
+
+
+def factor_node_shocks(model: CurveFactorModel, factor_moves) -> np.ndarray:
+    """
+    Curve moves at the model tenors generated by factor moves.
+
+    :param model: Factor model.
+    :param factor_moves: Factor moves (decimal yield), shape ``(n_factors,)`` or ``(n_scenarios, n_factors)``.
+    :return: Yield shocks of shape ``(n_scenarios, n_tenors)``.
+    :rtype: np.ndarray
+    """
+    return np.atleast_2d(np.asarray(factor_moves, dtype=np.float64)) @ model.loadings
+
+
+def simulate_factor_moves(
+    model: CurveFactorModel,
+    n_scenarios: int,
+    horizon: float = 1.0,
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Draw independent Gaussian factor moves with the fitted factor volatilities.
+
+    :param model: Factor model.
+    :param n_scenarios: Number of scenarios.
+    :param horizon: Horizon in numbers of changes of the history (volatilities scale with its square root).
+    :param seed: Seed of the random generator.
+    :return: Factor moves of shape ``(n_scenarios, n_factors)``.
+    :rtype: np.ndarray
+    """
+    normals = np.random.default_rng(seed).standard_normal((n_scenarios, model.loadings.shape[0]))
+    return normals * model.factor_volatility * np.sqrt(horizon)
+
+
+class FactorSensitivities:
+    """
+    Bond x factor sensitivities of a book, projected once from its curve-node sensitivities.
+
+    Loadings are interpolated linearly from the model tenors onto the nodes of the book's curve
+    (flat beyond the first and last tenors), so the two need not share tenors.
+
+    :param sensitivities: Curve-node sensitivities of the book, e.g. from
+                          :func:`~fift_analytics.gilts.curve_sensitivities.build_fixed_coupon_sensitivities`.
+    :param model: Factor model.
+
+    :Example:
+        >>> from fift_analytics.gilts.curve_sensitivities import build_zero_coupon_sensitivities
+        >>> parallel_shift = CurveFactorModel(
+        ...     np.array([3.0, 120.0]), np.array([[1.0, 1.0]]), np.ones(1), np.ones(1), np.zeros(2)
+        ... )
+        >>> zero_curve = [(3, 0.03), (120, 0.045)]
+        >>> book = build_zero_coupon_sensitivities([1_000_000], ["2030-02-17"], zero_curve, "2025-02-17")
+        >>> FactorSensitivities(book, parallel_shift).scenario_pnl([0.001]).round(2)
+        array([[-4140.51]])
+    """
+
+    def __init__(self, sensitivities: CurveSensitivities, model: CurveFactorModel) -> None:
+        self.model = model
+        self.sensitivities = sensitivities
+        self.node_loadings = np.array(
+            [np.interp(sensitivities.tenors, model.tenors, loading) for loading in model.loadings]
+        )
+        self.exposure = sensitivities.weights @ self.node_loadings.T
+        self.delta = sensitivities.yield_delta[:, None] * self.exposure
+
+    def scenario_pnl(self, factor_moves, second_order: bool = True, bonds: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        P&L of each bond under factor moves, as a bonds x factors matrix product.
+
+        :param factor_moves: Factor moves (decimal yield), shape ``(n_factors,)`` or ``(n_scenarios, n_factors)``.
+        :param second_order: True (default) to add each bond's yield gamma, False for delta only.
+        :param bonds: Optional indices of the bonds to revalue, all bonds by default.
+        :raises ValueError: If the moves do not match the factors.
+        :return: P&L of shape ``(n_scenarios, n_bonds)``.
+        :rtype: np.ndarray
+        """
+        factor_moves = np.atleast_2d(np.asarray(factor_moves, dtype=np.float64))
+        if factor_moves.ndim != 2 or factor_moves.shape[1] != self.exposure.shape[1]:
+            raise ValueError("Factor moves must have shape (n_factors,) or (n_scenarios, n_factors).")
+
+        bonds = slice(None) if bonds is None else bonds
+        yield_move = factor_moves @ self.exposure[bonds].T
+        pnl = yield_move * self.sensitivities.yield_delta[bonds]
+        if second_order:
+            pnl += 0.5 * yield_move**2 * self.sensitivities.yield_gamma[bonds]
+        return pnl
+
+    def full_reprice(self, factor_moves, bonds: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Full revaluation P&L under factor moves, through the pricer of the curve sensitivities.
+
+        :param factor_moves: Factor moves (decimal yield), shape ``(n_factors,)`` or ``(n_scenarios, n_factors)``.
+        :param bonds: Optional indices of the bonds to reprice, all bonds by default.
+        :return: P&L of shape ``(n_scenarios, n_bonds)``.
+        :rtype: np.ndarray
+        """
+        node_shocks = np.atleast_2d(np.asarray(factor_moves, dtype=np.float64)) @ self.node_loadings
+        return self.sensitivities.full_reprice(node_shocks, bonds)
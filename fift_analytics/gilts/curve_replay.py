@@ -0,0 +1,268 @@
+"""
+Curve Replay
+============
+
+Streaming backtest harness over a history of dated zero curves.
+
+Curve snapshots are read lazily from a csv file with one row per curve point::
+
+    date,tenor_months,yield
+    2005-01-04,3,0.0478
+    2005-01-04,6,0.0481
+    ...
+
+Rows must be grouped by date in ascending order. Each snapshot is a zero curve in the
+``list[tuple[int, float]]`` format used by
+:func:`~fift_analytics.gilts.zero_coupon.curve_yield_extrapolation.derive_yield_from_zero_curve`.
+
+:class:`CurveReplay` keeps the positions and their coupon schedules across days, reprices them off
+each day's curve (each bond at the curve yield for its remaining maturity) and yields one
+:class:`DailyResult` per snapshot. Nothing is accumulated across days, so memory stays flat over a
+multi-decade history; :func:`write_replay_results` streams the results to a csv file.
+
+Daily P&L is the change in dirty value of the positions held overnight plus the coupons they earned
+(coupons going ex-dividend) and redemptions, so rebalancing at the close is self-financing.
+
+"""
+import csv
+from itertools import groupby
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+
+import numpy as np
+
+from fift_analytics.gilts.day_count import year_fraction
+from fift_analytics.gilts.fixed_coupon.dmo_fixed_pricers import _dmo_dirty_price
+from fift_analytics.gilts.fixed_coupon.quasi_coupon import build_coupon_schedule, locate_in_schedule
+from fift_analytics.gilts.uk_calendar import to_datetime64
+from fift_analytics.gilts.zero_coupon.curve_yield_extrapolation import derive_yield_from_zero_curve_batch
+from fift_analytics.gilts.zero_coupon.zc_pricers import _zero_coupon_price
+
+ONE_BASIS_POINT = 0.0001
+
+REPLAY_RESULT_COLUMNS = ("date", "market_value", "cash", "pnl", "cumulative_pnl", "dv01")
+
+
+class CurveSnapshot(NamedTuple):
+    """
+    Zero curve as of a date.
+
+    :param date: Curve date.
+    :param zero_curve: List of (maturity_in_months, annual_yield).
+    """
+
+    date: np.datetime64
+    zero_curve: list[tuple[int, float]]
+
+
+class DailyResult(NamedTuple):
+    """
+    Replay result for one day. Instrument arrays list conventional gilts first, then zero-coupon gilts.
+
+    :param date: Valuation date.
+    :param price: Dirty price per £100 nominal of each instrument (zero once redeemed).
+    :param instrument_dv01: DV01 per £100 nominal of each instrument.
+    :param nominal: Nominal held over the day, before any rebalancing at the close.
+    :param market_value: Dirty value of the positions.
+    :param cash: Coupons and redemptions earned over the day.
+    :param pnl: P&L since the previous snapshot.
+    :param cumulative_pnl: P&L since the first snapshot.
+    :param dv01: DV01 of the positions.
+    """
+
+    date: np.datetime64
+    price: np.ndarray
+    instrument_dv01: np.ndarray
+    nominal: np.ndarray
+    market_value: float
+    cash: float
+    pnl: float
+    cumulative_pnl: float
+    dv01: float
+
+
+def read_curve_snapshots(path: str) -> Iterator[CurveSnapshot]:
+    """
+    Stream dated zero curve snapshots from a csv file, one snapshot at a time.
+
+    :param path: Path of a csv file with ``date``, ``tenor_months`` and ``yield`` columns.
+    :raises ValueError: If the dates are not in ascending order.
+    :return: Generator of curve snapshots.
+    :rtype: Iterator[CurveSnapshot]
+    """
+    with open(path, newline="") as f:
+        previous_date = None
+        for date, rows in groupby(csv.DictReader(f), key=lambda row: row["date"]):
+            snapshot_date = np.datetime64(date, "D")
+            if previous_date is not None and snapshot_date <= previous_date:
+                raise ValueError("Curve snapshots must be in ascending date order.")
+            previous_date = snapshot_date
+            yield CurveSnapshot(snapshot_date, [(int(row["tenor_months"]), float(row["yield"])) for row in rows])
+
+
+class CurveReplay:
+    """
+    Reprice a book of gilts day by day over a stream of zero curve snapshots.
+
+    :param start_date: First date of the replay; coupon schedules are built once from it.
+    :param annual_coupon_rate: Annual coupon rates (decimal) of the conventional gilts.
+    :param maturity_date: Maturity dates of the conventional gilts.
+    :param nominal: Nominal held in each conventional gilt.
+    :param zero_coupon_maturity_date: Maturity dates of the zero-coupon gilts.
+    :param zero_coupon_nominal: Face value held in each zero-coupon gilt.
+    :param rebalance: Optional strategy called at each close with the day's result, returning the nominal
+                      to hold over the next day (e.g. a DV01 hedge).
+
+    :Example:
+        >>> replay = CurveReplay("2025-01-02", [0.04], ["2030-03-07"], [1_000_000])
+        >>> snapshots = [CurveSnapshot(np.datetime64("2025-01-02"), [(3, 0.04), (120, 0.045)])]
+        >>> [round(day.pnl, 2) for day in replay.run(snapshots)]
+        [0.0]
+    """
+
+    def __init__(
+        self,
+        start_date,
+        annual_coupon_rate=(),
+        maturity_date=(),
+        nominal=(),
+        zero_coupon_maturity_date=(),
+        zero_coupon_nominal=(),
+        rebalance: Optional[Callable[[DailyResult], np.ndarray]] = None,
+    ) -> None:
+        self.start_date = to_datetime64(start_date)
+        self.coupon = 100 * np.asarray(annual_coupon_rate, dtype=np.float64).reshape(-1)
+        self.maturity_date = to_datetime64(maturity_date).reshape(-1)
+        self.zero_coupon_maturity_date = to_datetime64(zero_coupon_maturity_date).reshape(-1)
+        nominal = np.asarray(nominal, dtype=np.float64).reshape(-1)
+        zero_coupon_nominal = np.asarray(zero_coupon_nominal, dtype=np.float64).reshape(-1)
+
+        if not (self.coupon.size == self.maturity_date.size == nominal.size) or (
+            zero_coupon_nominal.size != self.zero_coupon_maturity_date.size
+        ):
+            raise ValueError("Coupon rates, maturity dates and nominals must have matching lengths.")
+
+        self.nominal = np.concatenate([nominal, zero_coupon_nominal])
+        self.rebalance = rebalance
+        self.schedule = build_coupon_schedule(self.maturity_date, self.start_date)
+
+        self._previous_date: Optional[np.datetime64] = None
+        self._previous_price: Optional[np.ndarray] = None
+        self._cumulative_pnl = 0.0
+
+    def _fixed_coupon_prices(self, date: np.datetime64, zero_curve: list[tuple[int, float]]):
+        months_to_maturity = 12 * year_fraction(date, self.maturity_date)
+        annual_yield = derive_yield_from_zero_curve_batch(zero_curve, np.maximum(months_to_maturity, 0))
+        position = locate_in_schedule(self.schedule, date)
+        live = position.in_schedule & (date < self.maturity_date)
+
+        r = (position.next_date - date).astype(np.int64)
+        s = (position.next_date - position.prior_date).astype(np.int64)
+        n = np.maximum(position.n_periods, 0)
+        d1 = np.where(date >= position.ex_dividend_date, 0.0, self.coupon / 2)
+
+        price = _dmo_dirty_price(self.coupon, annual_yield, r, s, n, d1)
+        price_up = _dmo_dirty_price(self.coupon, annual_yield + ONE_BASIS_POINT, r, s, n, d1)
+        return np.where(live, price, 0.0), np.where(live, price - price_up, 0.0)
+
+    def _zero_coupon_prices(self, date: np.datetime64, zero_curve: list[tuple[int, float]]):
+        maturity_date = self.zero_coupon_maturity_date
+        live = date < maturity_date
+        settlement = np.where(live, date, maturity_date - 1)
+        months_to_maturity = 12 * year_fraction(settlement, maturity_date)
+        annual_yield = derive_yield_from_zero_curve_batch(zero_curve, months_to_maturity)
+
+        price = _zero_coupon_price(100.0, annual_yield, settlement, maturity_date)
+        price_up = _zero_coupon_price(100.0, annual_yield + ONE_BASIS_POINT, settlement, maturity_date)
+        return np.where(live, price, 0.0), np.where(live, price - price_up, 0.0)
+
+    def _cash(self, date: np.datetime64) -> np.ndarray:
+        """
+        Coupons and redemptions per £100 nominal earned since the previous date.
+        """
+        if self._previous_date is None:
+            return np.zeros(self.nominal.size)
+
+        previous_date = self._previous_date
+        ex_dividend_dates = self.schedule.ex_dividend_dates
+        coupons = ((ex_dividend_dates > previous_date) & (ex_dividend_dates <= date)).sum(axis=1)
+        fixed_cash = coupons * self.coupon / 2 + np.where(
+            (self.maturity_date > previous_date) & (self.maturity_date <= date), 100.0, 0.0
+        )
+        zero_coupon_cash = np.where(
+            (self.zero_coupon_maturity_date > previous_date) & (self.zero_coupon_maturity_date <= date), 100.0, 0.0
+        )
+        return np.concatenate([fixed_cash, zero_coupon_cash])
+
+    def step(self, snapshot: CurveSnapshot) -> DailyResult:
+        """
+        Reprice the book off one curve snapshot and roll the state forward.
+
+        :param snapshot: Curve snapshot, dated after the previous one.
+        :raises ValueError: If the snapshot is before the start date or not after the previous snapshot.
+        :return: Prices, risk and P&L for the day.
+        :rtype: DailyResult
+        """
+        date = np.datetime64(snapshot.date, "D")
+        if date < self.start_date or (self._previous_date is not None and date <= self._previous_date):
+            raise ValueError("Curve snapshots must be in ascending date order from the start date.")
+
+        fixed_price, fixed_dv01 = self._fixed_coupon_prices(date, snapshot.zero_curve)
+        zero_coupon_price, zero_coupon_dv01 = self._zero_coupon_prices(date, snapshot.zero_curve)
+        price = np.concatenate([fixed_price, zero_coupon_price])
+        instrument_dv01 = np.concatenate([fixed_dv01, zero_coupon_dv01])
+
+        units = self.nominal / 100
+        cash = float(units @ self._cash(date))
+        pnl = 0.0 if self._previous_price is None else float(units @ (price - self._previous_price)) + cash
+        self._cumulative_pnl += pnl
+
+        result = DailyResult(
+            date=date,
+            price=price,
+            instrument_dv01=instrument_dv01,
+            nominal=self.nominal,
+            market_value=float(units @ price),
+            cash=cash,
+            pnl=pnl,
+            cumulative_pnl=self._cumulative_pnl,
+            dv01=float(units @ instrument_dv01),
+        )
+
+        if self.rebalance is not None:
+            self.nominal = np.asarray(self.rebalance(result), dtype=np.float64)
+        self._previous_date = date
+        self._previous_price = price
+
+        return result
+
+    def run(self, snapshots: Iterable[CurveSnapshot]) -> Iterator[DailyResult]:
+        """
+        Replay a stream of curve snapshots lazily.
+
+        :param snapshots: Curve snapshots in ascending date order, e.g. from :func:`read_curve_snapshots`.
+        :return: Generator of daily results.
+        :rtype: Iterator[DailyResult]
+        """
+        for snapshot in snapshots:
+            yield self.step(snapshot)
+
+
+def write_replay_results(results: Iterable[DailyResult], path: str) -> int:
+    """
+    Stream daily P&L and risk to a csv file as the results are produced.
+
+    :param results: Daily results, e.g. from :meth:`CurveReplay.run`.
+    :param path: Output csv path.
+    :return: Number of days written.
+    :rtype: int
+    """
+    n_days = 0
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(REPLAY_RESULT_COLUMNS)
+        for result in results:
+            writer.writerow(
+                [str(result.date), result.market_value, result.cash, result.pnl, result.cumulative_pnl, result.dv01]
+            )
+            n_days += 1
+    return n_days
@@ -0,0 +1,250 @@
+"""
+Curve Sensitivities
+===================
+
+Linearised what-if repricing of a book of gilts against moves of the zero-curve nodes.
+
+Each bond is priced at the yield interpolated from the zero curve for its remaining maturity, as in
+:func:`~fift_analytics.gilts.zero_coupon.curve_yield_extrapolation.derive_yield_from_zero_curve`.
+The interpolated yield is linear in the node yields, :math:`y_b = \\sum_k w_{bk} Y_k`, so once per curve
+we compute the bond x node matrices
+
+.. math:: \\Delta_{bk} = \\frac{\\partial P_b}{\\partial y_b} w_{bk}, \\qquad
+          \\Gamma_{bk} = \\frac{\\partial^2 P_b}{\\partial y_b^2} w_{bk}^2
+
+(yield derivatives by central differences of 1bp), and any set of node shocks :math:`S` (scenarios x nodes)
+is then repriced as the matrix product
+
+.. math:: \\text{P\\&L} \\approx S \\Delta^T + \\frac{1}{2} S^2 \\Gamma^T
+
+Only the diagonal second-order terms are kept, so bonds between two nodes miss their cross-gamma;
+:meth:`CurveSensitivities.reprice` reports the error against a full reprice of the bonds most exposed to it.
+
+:Example:
+    >>> zero_curve = [(3, 0.03), (60, 0.04), (120, 0.045)]
+    >>> book = build_zero_coupon_sensitivities([1_000_000], ["2030-02-17"], zero_curve, "2025-02-17")
+    >>> book.delta.shape
+    (1, 3)
+    >>> result = book.reprice([0.0, 0.001, 0.0])
+    >>> result.pnl.round(2), result.error_estimate.round(2)
+    (array([[-4082.92]]), array([0.02]))
+
+"""
+from typing import Callable, NamedTuple, Optional
+
+import numpy as np
+
+from fift_analytics.gilts.day_count import year_fraction
+from fift_analytics.gilts.fixed_coupon.dmo_fixed_pricers import _dmo_dirty_price
+from fift_analytics.gilts.fixed_coupon.quasi_coupon import get_ex_dividend_dates, get_quasi_coupon_dates
+from fift_analytics.gilts.uk_calendar import to_datetime64
+from fift_analytics.gilts.zero_coupon.curve_yield_extrapolation import derive_yield_from_zero_curve_batch
+from fift_analytics.gilts.zero_coupon.zc_pricers import _zero_coupon_price
+
+ONE_BASIS_POINT = 0.0001
+
+DEFAULT_CHECKED_BONDS = 16
+
+
+class DeltaGammaPnL(NamedTuple):
+    """
+    Linearised P&L of a book under node shocks.
+
+    :param pnl: Delta-gamma P&L, shape ``(n_scenarios, n_bonds)``.
+    :param error_estimate: Largest absolute difference against a full reprice of the checked bonds, per scenario.
+    :param checked_bonds: Indices of the bonds fully repriced for the error estimate.
+    """
+
+    pnl: np.ndarray
+    error_estimate: np.ndarray
+    checked_bonds: np.ndarray
+
+
+def curve_node_weights(zero_curve: list[tuple[int, float]], target_maturity) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Weights of each zero-curve node in the yields interpolated for the target maturities.
+
+    :param zero_curve: Zero curve as a list of (maturity_in_months, annual_yield).
+    :param target_maturity: Target maturities in months, shape ``(n_bonds,)``.
+    :return: Node tenors in ascending order and the ``(n_bonds, n_nodes)`` weight matrix.
+    :rtype: tuple[np.ndarray, np.ndarray]
+
+    :Example:
+        >>> curve_node_weights([(3, 0.01), (12, 0.02)], [6])[1]
+        array([[0.66666667, 0.33333333]])
+    """
+    tenors = np.array(sorted(tenor for tenor, _ in zero_curve), dtype=np.float64)
+    unit_curves = np.eye(tenors.size)
+    weights = np.stack(
+        [derive_yield_from_zero_curve_batch(list(zip(tenors, unit)), target_maturity) for unit in unit_curves],
+        axis=-1,
+    )
+    return tenors, weights
+
+
+class CurveSensitivities:
+    """
+    Bond x curve-node sensitivities of a book, computed once per curve.
+
+    :param zero_curve: Zero curve as a list of (maturity_in_months, annual_yield).
+    :param months_to_maturity: Remaining maturity of each bond in months.
+    :param yield_pricer: Function mapping yields of shape ``(..., n_selected)`` and the selected bond indices
+                         (a slice or an index array) to the values of those positions.
+    :param bump: Yield bump of the central differences (default is 1bp).
+
+    Use :func:`build_zero_coupon_sensitivities` or :func:`build_fixed_coupon_sensitivities` to build one.
+    """
+
+    def __init__(
+        self,
+        zero_curve: list[tuple[int, float]],
+        months_to_maturity: np.ndarray,
+        yield_pricer: Callable[[np.ndarray, object], np.ndarray],
+        bump: float = ONE_BASIS_POINT,
+    ) -> None:
+        self.tenors, self.weights = curve_node_weights(zero_curve, months_to_maturity)
+        self.annual_yield = derive_yield_from_zero_curve_batch(zero_curve, months_to_maturity)
+        self.yield_pricer = yield_pricer
+
+        all_bonds = slice(None)
+        self.price = yield_pricer(self.annual_yield, all_bonds)
+        price_up = yield_pricer(self.annual_yield + bump, all_bonds)
+        price_down = yield_pricer(self.annual_yield - bump, all_bonds)
+        self.yield_delta = (price_up - price_down) / (2 * bump)
+        self.yield_gamma = (price_up - 2 * self.price + price_down) / bump**2
+
+        self.delta = self.yield_delta[:, None] * self.weights
+        self.gamma = self.yield_gamma[:, None] * self.weights**2
+
+    def _node_shocks(self, node_shocks) -> np.ndarray:
+        node_shocks = np.atleast_2d(np.asarray(node_shocks, dtype=np.float64))
+        if node_shocks.ndim != 2 or node_shocks.shape[1] != self.tenors.size:
+            raise ValueError("Node shocks must have shape (n_nodes,) or (n_scenarios, n_nodes).")
+        return node_shocks
+
+    def full_reprice(self, node_shocks, bonds: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Full revaluation P&L under node shocks, through the pricer.
+
+        :param node_shocks: Yield shocks (decimal) of the curve nodes, shape ``(n_nodes,)`` or
+                            ``(n_scenarios, n_nodes)``.
+        :param bonds: Optional indices of the bonds to reprice, all bonds by default.
+        :raises ValueError: If the shocks do not match the curve nodes.
+        :return: P&L of shape ``(n_scenarios, n_bonds)``.
+        :rtype: np.ndarray
+        """
+        node_shocks = self._node_shocks(node_shocks)
+        bonds = slice(None) if bonds is None else bonds
+        shocked_yield = self.annual_yield[bonds] + node_shocks @ self.weights[bonds].T
+        return self.yield_pricer(shocked_yield, bonds) - self.price[bonds]
+
+    def reprice(self, node_shocks, n_checked: int = DEFAULT_CHECKED_BONDS) -> DeltaGammaPnL:
+        """
+        Delta-gamma P&L under node shocks as a matrix product, with an error estimate.
+
+        The error estimate fully reprices the ``n_checked`` bonds with the largest second-order move under
+        the shocks, where the truncation and the missing cross-gamma are largest.
+
+        :param node_shocks: Yield shocks (decimal) of the curve nodes, shape ``(n_nodes,)`` or
+                            ``(n_scenarios, n_nodes)``.
+        :param n_checked: Number of bonds fully repriced for the error estimate (0 to skip it).
+        :raises ValueError: If the shocks do not match the curve nodes.
+        :return: Linearised P&L and its error estimate.
+        :rtype: DeltaGammaPnL
+        """
+        node_shocks = self._node_shocks(node_shocks)
+        pnl = node_shocks @ self.delta.T + 0.5 * (node_shocks**2) @ self.gamma.T
+
+        largest_yield_move = (np.abs(node_shocks) @ np.abs(self.weights).T).max(axis=0)
+        exposure = np.abs(self.yield_gamma) * largest_yield_move**2
+        checked_bonds = np.sort(np.argsort(exposure)[::-1][:n_checked])
+        if checked_bonds.size == 0:
+            return DeltaGammaPnL(pnl, np.full(node_shocks.shape[0], np.nan), checked_bonds)
+
+        full_pnl = self.full_reprice(node_shocks, checked_bonds)
+        error_estimate = np.abs(full_pnl - pnl[:, checked_bonds]).max(axis=1)
+        return DeltaGammaPnL(pnl, error_estimate, checked_bonds)
+
+
+def build_zero_coupon_sensitivities(
+    face_value,
+    maturity_date,
+    zero_curve: list[tuple[int, float]],
+    settlement_date=None,
+) -> CurveSensitivities:
+    """
+    Build the curve-node sensitivities of zero-coupon gilt positions.
+
+    Prices follow :func:`~fift_analytics.gilts.zero_coupon.zc_pricers.get_zero_coupon_gilt_price`.
+
+    :param face_value: Face value held in each bond.
+    :param maturity_date: Maturity dates, one per bond.
+    :param zero_curve: Zero curve as a list of (maturity_in_months, annual_yield).
+    :param settlement_date: Settlement date. Defaults to today if not provided.
+    :raises ValueError: If any maturity date is not after the settlement date.
+    :return: Sensitivities of the positions' values to the curve nodes.
+    :rtype: CurveSensitivities
+    """
+    maturity_date = to_datetime64(maturity_date).reshape(-1)
+    settlement_date = np.datetime64("today", "D") if settlement_date is None else to_datetime64(settlement_date)
+    face_value = np.broadcast_to(np.asarray(face_value, dtype=np.float64), maturity_date.shape)
+
+    if np.any(maturity_date <= settlement_date):
+        raise ValueError("Maturity date must be after the settlement date.")
+
+    def yield_pricer(annual_yield: np.ndarray, bonds) -> np.ndarray:
+        return _zero_coupon_price(face_value[bonds], annual_yield, settlement_date, maturity_date[bonds])
+
+    months_to_maturity = 12 * year_fraction(settlement_date, maturity_date)
+    return CurveSensitivities(zero_curve, months_to_maturity, yield_pricer)
+
+
+def build_fixed_coupon_sensitivities(
+    annual_coupon_rate,
+    nominal,
+    settlement_date,
+    maturity_date,
+    zero_curve: list[tuple[int, float]],
+) -> CurveSensitivities:
+    """
+    Build the curve-node sensitivities of conventional gilt positions.
+
+    Dirty prices follow
+    :func:`~fift_analytics.gilts.fixed_coupon.dmo_fixed_pricers.calculate_fixed_coupon_gilt_price_dmo`,
+    each gilt at the curve yield for its remaining maturity.
+
+    :param annual_coupon_rate: Annual coupon rates (decimal), one per gilt.
+    :param nominal: Nominal held in each gilt.
+    :param settlement_date: Settlement date.
+    :param maturity_date: Maturity dates, one per gilt.
+    :param zero_curve: Zero curve as a list of (maturity_in_months, annual_yield).
+    :raises ValueError: If any settlement date is not before its maturity date.
+    :return: Sensitivities of the positions' dirty values to the curve nodes.
+    :rtype: CurveSensitivities
+
+    :Example:
+        >>> book = build_fixed_coupon_sensitivities(
+        ...     [0.04], [1_000_000], "2025-03-07", ["2030-03-07"], [(3, 0.03), (60, 0.04), (120, 0.045)]
+        ... )
+        >>> book.price.round(2)
+        array([999987.7])
+    """
+    maturity_date = to_datetime64(maturity_date).reshape(-1)
+    settlement_date = to_datetime64(settlement_date)
+    c = np.broadcast_to(100 * np.asarray(annual_coupon_rate, dtype=np.float64), maturity_date.shape)
+    units = np.broadcast_to(np.asarray(nominal, dtype=np.float64) / 100, maturity_date.shape)
+    f = 2
+
+    if np.any(settlement_date >= maturity_date):
+        raise ValueError("Settlement date must be before maturity date.")
+
+    prior_quasi_coupon_date, next_quasi_coupon_date, n = get_quasi_coupon_dates(settlement_date, maturity_date, f)
+    r = (next_quasi_coupon_date - settlement_date).astype(np.int64)
+    s = (next_quasi_coupon_date - prior_quasi_coupon_date).astype(np.int64)
+    d1 = np.where(settlement_date >= get_ex_dividend_dates(next_quasi_coupon_date), 0.0, c / f)
+
+    def yield_pricer(annual_yield: np.ndarray, bonds) -> np.ndarray:
+        return units[bonds] * _dmo_dirty_price(c[bonds], annual_yield, r[bonds], s[bonds], n[bonds], d1[bonds], f)
+
+    months_to_maturity = 12 * year_fraction(settlement_date, maturity_date)
+    return CurveSensitivities(zero_curve, months_to_maturity, yield_pricer)
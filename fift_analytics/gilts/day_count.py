@@ -0,0 +1,171 @@
+"""
+Day Count Conventions
+=====================
+
+Vectorised day count conventions shared by the zero coupon and fixed coupon pricers.
+
+Dates can be passed as ``datetime64[D]`` arrays, integer day ordinals (days since 1970-01-01),
+'YYYY-MM-DD' strings or ``datetime`` objects, and are broadcast against each other so that
+year fractions and period counts for a whole universe are evaluated in a single call.
+
+Supported conventions:
+
+- "Actual/Actual (ISMA)": whole coupon periods plus the fraction of the current period (actual days over the
+  actual days of the period), divided by the coupon frequency, on the quasi-coupon schedule ending on the end date
+  (or ``reference_date``). This is the convention of the DMO formulae; a year between two coupon dates is exactly 1.
+- "Actual/Actual": actual days divided by the length (365 or 366) of the start date's year. This is not ISMA: it
+  is the simpler convention the zero-coupon pricers have always used, kept as the default so their prices do not
+  change. Use "Actual/Actual (ISMA)" where the coupon schedule matters.
+- "30/360": each month has 30 days and each year has 360 days.
+- "Actual/365": actual days divided by 365.
+
+"""
+from typing import Literal, NamedTuple
+
+import numpy as np
+
+from fift_analytics.gilts.fixed_coupon.quasi_coupon import get_quasi_coupon_dates
+from fift_analytics.gilts.uk_calendar import to_datetime64
+
+DayCountConvention = Literal["Actual/Actual (ISMA)", "Actual/Actual", "30/360", "Actual/365"]
+
+SUPPORTED_DAY_COUNT_CONVENTIONS = ("Actual/Actual (ISMA)", "Actual/Actual", "30/360", "Actual/365")
+
+UNSUPPORTED_DAY_COUNT_MESSAGE = (
+    "Unsupported day count convention. Use 'Actual/Actual (ISMA)', 'Actual/Actual', '30/360', or 'Actual/365'."
+)
+
+
+class DayCount(NamedTuple):
+    """
+    Year fractions and whole coupon periods between two sets of dates.
+
+    :param year_fraction: Year fractions under the requested convention.
+    :param n_periods: Number of whole coupon periods (year fraction times frequency, truncated).
+    """
+
+    year_fraction: np.ndarray
+    n_periods: np.ndarray
+
+
+def is_leap_year(year):
+    """
+    Check if a given year is a leap year, element-wise for arrays of years.
+
+    :param year: Year (or array of years) to check.
+    :return: True if leap year, False otherwise.
+    :rtype: bool
+
+    :Example:
+        >>> is_leap_year(2024)
+        True
+        >>> is_leap_year(np.array([1900, 2000]))
+        array([False,  True])
+    """
+    return (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+
+
+def _to_ordinals(dates) -> np.ndarray:
+    dates = np.asarray(dates)
+    if np.issubdtype(dates.dtype, np.integer):
+        return dates.astype(np.int64)
+    return to_datetime64(dates).astype(np.int64)
+
+
+def _split_dates(ordinals: np.ndarray):
+    dates = ordinals.astype("datetime64[D]")
+    months = dates.astype("datetime64[M]")
+    year = dates.astype("datetime64[Y]").astype(np.int64) + 1970
+    month = months.astype(np.int64) % 12 + 1
+    day = (dates - months.astype("datetime64[D]")).astype(np.int64) + 1
+    return year, month, day
+
+
+def _isma_periods(dates: np.ndarray, reference_date: np.ndarray, coupon_frequency: int) -> np.ndarray:
+    """
+    Quasi-coupon periods from each date to the reference date: whole periods plus the fraction of the current one.
+    """
+    prior_date, next_date, n_periods = get_quasi_coupon_dates(dates, reference_date, coupon_frequency)
+    r = (next_date - dates).astype(np.int64)
+    s = (next_date - prior_date).astype(np.int64)
+    return n_periods + r / s
+
+
+def year_fraction(
+    start_date,
+    end_date,
+    day_count_convention: DayCountConvention = "Actual/Actual",
+    coupon_frequency: int = 2,
+    reference_date=None,
+) -> np.ndarray:
+    """
+    Calculate year fractions between start and end dates.
+
+    :param start_date: Start dates (e.g. settlement dates).
+    :param end_date: End dates (e.g. maturity dates), broadcast against ``start_date``.
+    :param day_count_convention: One of "Actual/Actual (ISMA)", "Actual/Actual", "30/360" or "Actual/365".
+    :param coupon_frequency: Coupons per year of the "Actual/Actual (ISMA)" schedule (default is 2).
+    :param reference_date: Date the "Actual/Actual (ISMA)" schedule is built back from (e.g. the maturity date),
+                           defaults to ``end_date``.
+    :raises ValueError: If the day count convention is not supported.
+    :return: Year fractions as a float64 array.
+    :rtype: np.ndarray
+
+    :Example:
+        >>> year_fraction("2024-02-17", ["2034-02-17", "2025-02-17"])
+        array([9.98087432, 1.        ])
+        >>> year_fraction("2023-09-07", ["2024-09-07", "2024-03-07"], "Actual/Actual (ISMA)")
+        array([1. , 0.5])
+    """
+    if day_count_convention not in SUPPORTED_DAY_COUNT_CONVENTIONS:
+        raise ValueError(UNSUPPORTED_DAY_COUNT_MESSAGE)
+
+    start = _to_ordinals(start_date)
+    end = _to_ordinals(end_date)
+
+    if day_count_convention == "Actual/Actual (ISMA)":
+        start, end = (date.astype("datetime64[D]") for date in np.broadcast_arrays(start, end))
+        reference = end if reference_date is None else to_datetime64(reference_date)
+        periods = _isma_periods(start, reference, coupon_frequency) - _isma_periods(end, reference, coupon_frequency)
+        return periods / coupon_frequency
+
+    if day_count_convention == "Actual/365":
+        return (end - start) / 365.0
+
+    start_year, start_month, start_day = _split_dates(start)
+
+    if day_count_convention == "Actual/Actual":
+        year_length = np.where(is_leap_year(start_year), 366.0, 365.0)
+        return (end - start) / year_length
+
+    end_year, end_month, end_day = _split_dates(end)
+    days = np.minimum(end_day, 30) - np.minimum(start_day, 30)
+
+    return ((end_year - start_year) * 360 + (end_month - start_month) * 30 + days) / 360.0
+
+
+def calculate_day_count(
+    start_date,
+    end_date,
+    coupon_frequency: int = 2,
+    day_count_convention: DayCountConvention = "Actual/Actual",
+) -> DayCount:
+    """
+    Calculate year fractions and the number of whole coupon periods in one vectorised call.
+
+    :param start_date: Start dates (e.g. settlement dates).
+    :param end_date: End dates (e.g. maturity dates), broadcast against ``start_date``.
+    :param coupon_frequency: Number of coupon payments per year (default is 2 for semi-annual payments).
+    :param day_count_convention: One of "Actual/Actual (ISMA)", "Actual/Actual", "30/360" or "Actual/365".
+    :raises ValueError: If the day count convention is not supported.
+    :return: Year fractions and number of whole coupon periods.
+    :rtype: DayCount
+
+    :Example:
+        >>> calculate_day_count("2025-02-17", "2035-02-17", 2, "30/360").n_periods
+        np.int64(20)
+    """
+    fraction = year_fraction(start_date, end_date, day_count_convention, coupon_frequency)
+    n_periods = np.trunc(fraction * coupon_frequency).astype(np.int64)
+
+    return DayCount(fraction, n_periods)
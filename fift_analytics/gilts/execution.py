@@ -0,0 +1,512 @@
+"""
+Execution Policy
+================
+
+Memory-budgeted chunking shared by the batch pricers, the scenario engine and the streaming paths.
+
+An :class:`ExecutionPolicy` holds a memory budget. Each run estimates the bytes needed per row, for its inputs,
+its outputs and the float64 temporaries of the kernel (about ``work_factor`` per input and output column), and
+takes the largest chunk of rows which fits the budget. Large jobs then run in a few big NumPy calls rather than
+many small ones, within a known memory ceiling.
+
+The policy is set for a block of code with the :func:`execution_policy` context manager, in a
+:class:`contextvars.ContextVar` like the :func:`~fift_analytics.gilts.precision.precision_mode`. It applies to
+:func:`run_batch`, :func:`~fift_analytics.gilts.parallel.map_batch`, the scenario P&L cube and
+:class:`~fift_analytics.gilts.tick_stream.TickStream` whenever they are not given an explicit chunk size.
+
+:func:`track_allocations` reports the peak :mod:`tracemalloc` allocation of each stage of the runs within it
+(staging inputs, pricing, scenario repricing, ...).
+
+:Example:
+    >>> from fift_analytics.gilts.zero_coupon.zc_pricers import get_zero_coupon_gilt_price_batch
+    >>> with execution_policy("1MB"):
+    ...     get_execution_policy().chunk_rows(estimate_row_bytes({"annual_yield": np.zeros(3)}))
+    13107
+    >>> with track_allocations() as tracker, execution_policy("4MB"):
+    ...     prices = run_batch(
+    ...         get_zero_coupon_gilt_price_batch,
+    ...         {"annual_yield": np.linspace(0.0, 0.05, 100_000), "maturity_date": "2035-02-17"},
+    ...         face_value=100.0,
+    ...         settlement_date="2025-02-17",
+    ...     )
+    >>> prices[[0, -1]]
+    array([100.  ,  60.64])
+    >>> [(stage.stage, stage.calls) for stage in tracker.report()]
+    [('run_batch', 1), ('run_batch.stage_inputs', 3), ('run_batch.evaluate', 3)]
+
+"""
+import inspect
+import re
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Mapping, NamedTuple, Optional, Union
+
+import numpy as np
+
+from fift_analytics.gilts.precision import OutputDType, get_output_dtype
+from fift_analytics.gilts.uk_calendar import to_datetime64
+
+MemorySize = Union[int, str]
+
+DEFAULT_MEMORY_BUDGET = 256 * 2**20
+
+DEFAULT_WORK_FACTOR = 4.0
+
+MIN_CHUNK_ROWS = 1024
+
+_MEMORY_UNITS = {"": 1, "B": 1, "K": 2**10, "KB": 2**10, "M": 2**20, "MB": 2**20, "G": 2**30, "GB": 2**30}
+
+
+def parse_memory_size(size: MemorySize) -> int:
+    """
+    Convert a memory size to bytes.
+
+    :param size: Number of bytes, or a string such as "512MB", "2 GB" or "512M" (binary units: 1KB = 1024 bytes).
+    :raises ValueError: If the size is not positive or not understood.
+    :return: Size in bytes.
+    :rtype: int
+
+    :Example:
+        >>> parse_memory_size("1.5 GB")
+        1610612736
+    """
+    if isinstance(size, str):
+        match = re.fullmatch(r"\s*([0-9]*\.?[0-9]+)\s*([KMG]?B?)\s*", size.upper())
+        if match is None:
+            raise ValueError("Unsupported memory size. Use a number of bytes or e.g. '512MB'.")
+        size = int(float(match.group(1)) * _MEMORY_UNITS[match.group(2)])
+    if size <= 0:
+        raise ValueError("Memory size must be positive.")
+    return int(size)
+
+
+class ExecutionPolicy(NamedTuple):
+    """
+    Memory budget and chunking limits of batch runs.
+
+    :param memory_budget: Memory budget in bytes of the chunks evaluated at once, their inputs, outputs and
+                          temporaries included.
+    :param work_factor: Float64 temporaries allocated by the kernels per input and output column.
+    :param min_chunk_rows: Smallest chunk, whatever the budget, so that tiny budgets do not degenerate
+                           into row-by-row calls.
+    :param max_chunk_rows: Optional largest chunk, whatever the budget.
+    """
+
+    memory_budget: int = DEFAULT_MEMORY_BUDGET
+    work_factor: float = DEFAULT_WORK_FACTOR
+    min_chunk_rows: int = MIN_CHUNK_ROWS
+    max_chunk_rows: Optional[int] = None
+
+    def chunk_rows(self, row_bytes: float, n_rows: Optional[int] = None) -> int:
+        """
+        Number of rows per chunk fitting the memory budget.
+
+        :param row_bytes: Estimated bytes per row, e.g. from :func:`estimate_row_bytes`.
+        :param n_rows: Optional number of rows of the run, the chunk is never larger.
+        :return: Rows per chunk, at least 1.
+        :rtype: int
+        """
+        rows = max(int(self.memory_budget // max(row_bytes, 1)), self.min_chunk_rows)
+        if self.max_chunk_rows is not None:
+            rows = min(rows, self.max_chunk_rows)
+        if n_rows is not None:
+            rows = min(rows, n_rows)
+        return max(rows, 1)
+
+
+_execution_policy: ContextVar[Optional[ExecutionPolicy]] = ContextVar("fift_analytics_execution_policy", default=None)
+
+
+def get_execution_policy(policy: Optional[ExecutionPolicy] = None) -> ExecutionPolicy:
+    """
+    Resolve the execution policy, giving priority to the per call value over the current context.
+
+    :param policy: Per call policy, or None to use the current context (or the default budget outside any context).
+    :return: The policy in force.
+    :rtype: ExecutionPolicy
+    """
+    if policy is not None:
+        return policy
+    return _execution_policy.get() or ExecutionPolicy()
+
+
+@contextmanager
+def execution_policy(
+    memory_budget: MemorySize = DEFAULT_MEMORY_BUDGET,
+    work_factor: float = DEFAULT_WORK_FACTOR,
+    min_chunk_rows: int = MIN_CHUNK_ROWS,
+    max_chunk_rows: Optional[int] = None,
+) -> Iterator[ExecutionPolicy]:
+    """
+    Set the execution policy of the batch runs called within the context.
+
+    :param memory_budget: Memory budget of the chunks evaluated at once, in bytes or e.g. "512MB".
+    :param work_factor: Float64 temporaries allocated by the kernels per input and output column.
+    :param min_chunk_rows: Smallest chunk, whatever the budget.
+    :param max_chunk_rows: Optional largest chunk, whatever the budget.
+    :raises ValueError: If the budget, work factor or chunk limits are not positive.
+    :return: The policy in force within the context.
+    """
+    if work_factor < 0 or min_chunk_rows < 1 or (max_chunk_rows is not None and max_chunk_rows < 1):
+        raise ValueError("Work factor must be non-negative and chunk limits positive.")
+    policy = ExecutionPolicy(parse_memory_size(memory_budget), work_factor, min_chunk_rows, max_chunk_rows)
+    token = _execution_policy.set(policy)
+    try:
+        yield policy
+    finally:
+        _execution_policy.reset(token)
+
+
+def resolve_chunk_rows(chunk_size: Optional[int], row_bytes: float, n_rows: int, default: Optional[int] = None) -> int:
+    """
+    Chunk size of a run: the explicit ``chunk_size``, else the one fitting the policy in force.
+
+    Outside any :func:`execution_policy` context the ``default`` is kept when given, so existing callers
+    see no change unless they opt into a budget.
+
+    :param chunk_size: Explicit rows per chunk, or None.
+    :param row_bytes: Estimated bytes per row.
+    :param n_rows: Number of rows of the run.
+    :param default: Rows per chunk outside any policy context, or None to use the default budget.
+    :raises ValueError: If the explicit chunk size is not positive.
+    :return: Rows per chunk.
+    :rtype: int
+    """
+    if chunk_size is not None:
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be positive.")
+        return chunk_size
+    if default is not None and _execution_policy.get() is None:
+        return default
+    return get_execution_policy().chunk_rows(row_bytes, max(n_rows, 1))
+
+
+def _row_itemsize(column) -> int:
+    dtype = np.asarray(column).dtype
+    # Dates given as strings or objects are staged as datetime64, floats and other numbers as float64
+    return 8 if dtype.kind in "OSU" else max(dtype.itemsize, 1)
+
+
+def estimate_row_bytes(
+    columns: Mapping[str, Any],
+    n_outputs: int = 1,
+    dtype: OutputDType = "float64",
+    work_factor: Optional[float] = None,
+) -> float:
+    """
+    Estimate the memory needed per row of a batch run.
+
+    :param columns: Row parameters by name (only their dtypes are used).
+    :param n_outputs: Number of output columns.
+    :param dtype: Output dtype, "float64" (default) or "float32".
+    :param work_factor: Float64 temporaries per input and output column, defaults to the policy in force.
+    :return: Estimated bytes per row: inputs, outputs and kernel temporaries.
+    :rtype: float
+
+    :Example:
+        >>> estimate_row_bytes({"annual_yield": [0.04], "maturity_date": ["2035-02-17"]}, dtype="float32")
+        116.0
+    """
+    if work_factor is None:
+        work_factor = get_execution_policy().work_factor
+    input_bytes = sum(_row_itemsize(column) for column in columns.values())
+    output_bytes = n_outputs * get_output_dtype(dtype).itemsize
+    return float(input_bytes + output_bytes + work_factor * 8 * (len(columns) + n_outputs))
+
+
+class WorkBuffers:
+    """
+    Named work buffers, allocated once and reused between chunks.
+
+    A buffer grows when a larger chunk asks for it and is otherwise handed back as a view of the same memory,
+    so a chunked run allocates its staging arrays once rather than once per chunk.
+
+    :Example:
+        >>> buffers = WorkBuffers()
+        >>> first = buffers.take("annual_yield", 4, np.float64)
+        >>> buffers.take("annual_yield", 3, np.float64).base is first.base
+        True
+        >>> buffers.nbytes
+        32
+    """
+
+    def __init__(self) -> None:
+        self._buffers: dict[str, np.ndarray] = {}
+
+    def take(self, name: str, n_rows: int, dtype) -> np.ndarray:
+        """
+        View of ``n_rows`` elements of the named buffer, reallocated only when too small or of another dtype.
+
+        :param name: Buffer name, e.g. the column it stages.
+        :param n_rows: Number of elements.
+        :param dtype: Dtype of the buffer.
+        :return: Writable view of the buffer.
+        :rtype: np.ndarray
+        """
+        dtype = np.dtype(dtype)
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.dtype != dtype or buffer.size < n_rows:
+            buffer = self._buffers[name] = np.empty(n_rows, dtype=dtype)
+        return buffer[:n_rows]
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Total bytes held by the buffers.
+        """
+        return sum(buffer.nbytes for buffer in self._buffers.values())
+
+
+class StageAllocation(NamedTuple):
+    """
+    Allocations of one stage, over all its calls.
+
+    :param stage: Stage name; nested stages are prefixed by their parent, e.g. "run_batch.evaluate".
+    :param calls: Number of times the stage ran.
+    :param peak_bytes: Largest peak allocation of one call, above the memory in use when it started.
+    :param retained_bytes: Memory still allocated at the end of the calls, summed over the calls.
+    """
+
+    stage: str
+    calls: int
+    peak_bytes: int
+    retained_bytes: int
+
+
+class AllocationTracker:
+    """
+    Peak :mod:`tracemalloc` allocation per stage, from :func:`track_allocations`.
+
+    Peaks of nested stages count towards their parent's peak, so the outermost stage bounds the whole run.
+    Each thread keeps its own stack of open stages, so stages run by a
+    :class:`~fift_analytics.gilts.tick_stream.TickStream` thread or by :func:`~fift_analytics.gilts.parallel.map_batch`
+    workers are recorded under their own names.
+
+    :mod:`tracemalloc` has a single, process-wide peak. The tracker resets it at stage boundaries only when it
+    owns the tracing and no other thread has a stage open. Otherwise it leaves the peak alone, so an outer
+    tracer still sees its own peak, and the peaks reported are upper bounds measured from the last reset.
+
+    :param reset_peak: True to reset the process-wide peak at stage boundaries, when the tracker started tracing.
+    """
+
+    def __init__(self, reset_peak: bool = True) -> None:
+        self.reset_peak = reset_peak
+        self._stages: dict[str, StageAllocation] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._n_open = 0
+
+    def _stack(self) -> list[list]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _reset_peak(self, stack: list[list]) -> None:
+        # Only the stages of this thread are open: nobody else is measuring from the current peak
+        if self.reset_peak and self._n_open == len(stack):
+            tracemalloc.reset_peak()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Record the allocations of a block of code as a stage.
+
+        :param name: Stage name.
+        """
+        stack = self._stack()
+        with self._lock:
+            if stack:
+                parent = stack[-1]
+                parent[2] = max(parent[2], tracemalloc.get_traced_memory()[1] - parent[1])
+                name = f"{parent[0]}.{name}"
+            self._reset_peak(stack)
+            frame = [name, tracemalloc.get_traced_memory()[0], 0]
+            stack.append(frame)
+            self._n_open += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                stack.pop()
+                self._n_open -= 1
+                current, peak = tracemalloc.get_traced_memory()
+                peak_bytes = max(frame[2], peak - frame[1])
+                if stack:
+                    parent = stack[-1]
+                    parent[2] = max(parent[2], peak - parent[1])
+                    self._reset_peak(stack)
+                previous = self._stages.get(name, StageAllocation(name, 0, 0, 0))
+                self._stages[name] = StageAllocation(
+                    name,
+                    previous.calls + 1,
+                    max(previous.peak_bytes, peak_bytes),
+                    previous.retained_bytes + current - frame[1],
+                )
+
+    def report(self) -> list[StageAllocation]:
+        """
+        Allocations of each stage, outermost stages first.
+
+        :return: One entry per stage name.
+        :rtype: list[StageAllocation]
+        """
+        return sorted(self._stages.values(), key=lambda stage: stage.stage.count("."))
+
+    def format_report(self) -> str:
+        """
+        Allocation report as a text table, in MiB.
+
+        :return: One line per stage.
+        :rtype: str
+        """
+        lines = [f"{'stage':<40} {'calls':>6} {'peak MiB':>10} {'retained MiB':>13}"]
+        for stage in self.report():
+            lines.append(
+                f"{stage.stage:<40} {stage.calls:>6} {stage.peak_bytes / 2**20:>10.2f} "
+                f"{stage.retained_bytes / 2**20:>13.2f}"
+            )
+        return "\n".join(lines)
+
+
+_allocation_tracker: ContextVar[Optional[AllocationTracker]] = ContextVar(
+    "fift_analytics_allocation_tracker", default=None
+)
+
+
+@contextmanager
+def track_allocations() -> Iterator[AllocationTracker]:
+    """
+    Track the peak allocation of each stage of the batch runs called within the context.
+
+    Starts :mod:`tracemalloc` if it is not running (and stops it on exit). Tracing slows allocations down,
+    so use it to size a budget rather than in production runs. If another tracer is already running (e.g. a
+    ``--trace-memory`` command line run), its peak is never reset and the stage peaks are upper bounds.
+
+    :return: The tracker, whose :meth:`AllocationTracker.report` is complete once the context exits.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    tracker = AllocationTracker(reset_peak=started)
+    token = _allocation_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _allocation_tracker.reset(token)
+        if started:
+            tracemalloc.stop()
+
+
+@contextmanager
+def allocation_stage(name: str) -> Iterator[None]:
+    """
+    Record a block of code as a stage of the current :func:`track_allocations` context, no-op outside one.
+
+    :param name: Stage name.
+    """
+    tracker = _allocation_tracker.get()
+    if tracker is None:
+        yield
+        return
+    with tracker.stage(name):
+        yield
+
+
+def _accepts_out(function: Callable[..., Any]) -> bool:
+    try:
+        return "out" in inspect.signature(function).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def _needs_staging(name: str, column: np.ndarray) -> bool:
+    # only date columns are parsed; other string or object columns (e.g. yields read from a csv) pass through
+    return name.endswith("_date") and column.dtype.kind in "OSU"
+
+
+def _stage_column(buffers: WorkBuffers, name: str, column: np.ndarray, start: int, stop: int) -> np.ndarray:
+    """
+    One chunk of a column: a view for arrays the pricers read as they are, and for ``*_date`` columns given as
+    strings or objects, the chunk parsed strictly (no empty, 'NaT' or partial dates) into its reusable datetime64
+    work buffer.
+    """
+    chunk = column[start:stop]
+    if not _needs_staging(name, column):
+        return chunk
+    staged = buffers.take(name, stop - start, "datetime64[D]")
+    np.copyto(staged, to_datetime64(chunk))
+    return staged
+
+
+def run_batch(
+    function: Callable[..., Any],
+    columns: Mapping[str, Any],
+    policy: Optional[ExecutionPolicy] = None,
+    chunk_size: Optional[int] = None,
+    dtype: OutputDType = "float64",
+    out=None,
+    buffers: Optional[WorkBuffers] = None,
+    **options,
+) -> np.ndarray:
+    """
+    Evaluate an element-wise batch pricer over memory-budgeted row chunks, in the calling thread.
+
+    Chunks of array columns are passed to the pricer as views. ``*_date`` columns given per row as strings are
+    parsed chunk by chunk into reusable work buffers. The results are written into one preallocated output array
+    (through the pricer's ``out`` argument when it has one), so the memory of a run is its inputs, its outputs
+    and one chunk of temporaries.
+
+    :param function: Batch function taking the ``columns`` by keyword and returning one value per row.
+    :param columns: Row parameters by name, broadcast against each other.
+    :param policy: Execution policy, defaults to the :func:`execution_policy` in force.
+    :param chunk_size: Explicit rows per chunk, overriding the policy.
+    :param dtype: Output dtype, "float64" (default) or "float32".
+    :param out: Optional writable float32 or float64 buffer receiving the results.
+    :param buffers: Work buffers to reuse across runs, e.g. by a stream repricing at a fixed cadence.
+    :param options: Other keyword arguments of ``function``, identical for every row.
+    :raises ValueError: If the chunk size is not positive, ``out`` does not match the rows or a date is invalid.
+    :return: Results for all the rows, in input order.
+    :rtype: np.ndarray
+    """
+    names = list(columns)
+    arrays = [np.atleast_1d(np.asarray(columns[name])) for name in names]
+    # A date shared by every row is parsed once rather than once per chunk
+    arrays = [
+        to_datetime64(array) if _needs_staging(name, array) and array.size == 1 else array
+        for name, array in zip(names, arrays)
+    ]
+    arrays = np.broadcast_arrays(*arrays)
+    arrays = [array.reshape(-1) for array in arrays]
+    n_rows = arrays[0].size if arrays else 0
+
+    policy = get_execution_policy(policy)
+    output_dtype = get_output_dtype(dtype) if out is None else get_output_dtype(np.asarray(out).dtype.name)
+    row_bytes = estimate_row_bytes(columns, dtype=output_dtype.name, work_factor=policy.work_factor)
+    rows = chunk_size if chunk_size is not None else policy.chunk_rows(row_bytes, max(n_rows, 1))
+    if rows < 1:
+        raise ValueError("Chunk size must be positive.")
+
+    if out is None:
+        result = np.empty(n_rows, dtype=output_dtype)
+    else:
+        result = np.asarray(out)
+        if not result.flags.writeable or result.shape != (n_rows,):
+            raise ValueError("Output buffer must be writable with one element per row.")
+    buffers = WorkBuffers() if buffers is None else buffers
+    writes_out = _accepts_out(function)
+    if writes_out and "dtype" not in options and "dtype" in inspect.signature(function).parameters:
+        options["dtype"] = output_dtype.name
+
+    with allocation_stage("run_batch"):
+        for start in range(0, n_rows, rows):
+            stop = min(start + rows, n_rows)
+            with allocation_stage("stage_inputs"):
+                chunk = {name: _stage_column(buffers, name, array, start, stop) for name, array in zip(names, arrays)}
+            with allocation_stage("evaluate"):
+                if writes_out:
+                    function(**chunk, **options, out=result[start:stop])
+                else:
+                    result[start:stop] = function(**chunk, **options)
+    return result
@@ -0,0 +1,135 @@
+"""
+Discount Factor Tables
+======================
+
+Curve-bound cache of the periodic discount factors used by
+:func:`~fift_analytics.gilts.fixed_coupon.fixed_pricers.calculate_fixed_coupon_gilt_price_with_curve`.
+
+For a bond curve :math:`y_1, \\dots, y_K` and coupon frequency :math:`f`, the table holds
+
+.. math:: DF_i = \\frac{1}{(1 + y_i / f)^i}, \\qquad A_n = \\sum_{i=1}^{n} DF_i
+
+so that every bond priced off the same curve is a lookup: :math:`P = C \\cdot A_n + F \\cdot DF_n`.
+
+A table is built lazily per coupon frequency, only up to the longest maturity requested so far,
+and extended on demand when a longer bond is priced. Extensions are serialised by a lock and published
+as new read-only arrays, so one table can be shared by pricing threads.
+
+:Example:
+    >>> table = DiscountFactorTable([0.03] * 20)
+    >>> table.discount_factors(2).round(6)
+    array([0.985222, 0.970662])
+    >>> table.n_cached(2)
+    2
+
+"""
+import threading
+from typing import Sequence
+
+import numpy as np
+
+
+class DiscountFactorTable:
+    """
+    Periodic discount factors and their running sums on the period grid of a bond curve.
+
+    :param bond_curve: Yield for each coupon period, as passed to :func:`~fift_analytics.gilts.fixed_coupon.
+                       fixed_pricers.calculate_fixed_coupon_gilt_price_with_curve`.
+    :type bond_curve: Sequence[float]
+    :raises ValueError: If the bond curve is empty.
+    """
+
+    def __init__(self, bond_curve: Sequence[float]) -> None:
+        self.bond_curve = np.array(bond_curve, dtype=np.float64).reshape(-1)
+        if self.bond_curve.size == 0:
+            raise ValueError("Bond curve must not be empty.")
+        self.bond_curve.flags.writeable = False
+        self._tables: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        # locks cannot be pickled, e.g. to send the table to a process pool
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        for table in (self.bond_curve, *(array for tables in self._tables.values() for array in tables)):
+            table.flags.writeable = False
+
+    def __len__(self) -> int:
+        return self.bond_curve.size
+
+    def n_cached(self, coupon_frequency: int = 2) -> int:
+        """
+        Number of periods already computed for a coupon frequency.
+
+        :param coupon_frequency: Number of coupon payments per year.
+        :return: Number of cached periods (0 if the frequency has not been used yet).
+        :rtype: int
+        """
+        return self._tables.get(coupon_frequency, (np.empty(0),))[0].size
+
+    def _extend(self, n_periods: int, coupon_frequency: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Make sure the table for ``coupon_frequency`` covers ``n_periods``, growing it geometrically.
+        """
+        if n_periods > self.bond_curve.size:
+            raise ValueError("Bond curve must have at least as many entries as the number of periods until maturity.")
+
+        discount_factors, annuity_factors = self._tables.get(coupon_frequency, (np.empty(0), np.empty(0)))
+        if n_periods <= discount_factors.size:
+            return discount_factors, annuity_factors
+
+        with self._lock:
+            return self._extend_locked(n_periods, coupon_frequency)
+
+    def _extend_locked(self, n_periods: int, coupon_frequency: int) -> tuple[np.ndarray, np.ndarray]:
+        discount_factors, annuity_factors = self._tables.get(coupon_frequency, (np.empty(0), np.empty(0)))
+        n_cached = discount_factors.size
+        if n_periods <= n_cached:
+            return discount_factors, annuity_factors
+
+        n_new = min(max(n_periods, 2 * n_cached), self.bond_curve.size)
+        periods = np.arange(n_cached + 1, n_new + 1)
+        new_factors = 1.0 / (1 + self.bond_curve[n_cached:n_new] / coupon_frequency) ** periods
+        new_annuity = np.cumsum(new_factors) + (annuity_factors[-1] if n_cached else 0.0)
+
+        discount_factors = np.concatenate([discount_factors, new_factors])
+        annuity_factors = np.concatenate([annuity_factors, new_annuity])
+        discount_factors.flags.writeable = annuity_factors.flags.writeable = False
+        self._tables[coupon_frequency] = (discount_factors, annuity_factors)
+        return discount_factors, annuity_factors
+
+    def discount_factors(self, n_periods: int, coupon_frequency: int = 2) -> np.ndarray:
+        """
+        Discount factors of the first ``n_periods`` coupon periods.
+
+        :param n_periods: Number of periods.
+        :param coupon_frequency: Number of coupon payments per year.
+        :raises ValueError: If the bond curve is shorter than ``n_periods``.
+        :return: Read-only view of the discount factors.
+        :rtype: np.ndarray
+        """
+        return self._extend(n_periods, coupon_frequency)[0][:n_periods]
+
+    def price(self, face_value, periodic_coupon, n_periods, coupon_frequency: int = 2) -> np.ndarray:
+        """
+        Present value of ``n_periods`` coupons plus the face value at the last period, by table lookup.
+
+        :param face_value: Face values.
+        :param periodic_coupon: Coupon paid each period.
+        :param n_periods: Number of periods until maturity, broadcast against the other arguments.
+                          Bonds with no period left are worth their face value.
+        :param coupon_frequency: Number of coupon payments per year.
+        :raises ValueError: If the bond curve is shorter than the longest maturity.
+        :return: Unrounded prices.
+        :rtype: np.ndarray
+        """
+        n_periods = np.asarray(n_periods, dtype=np.int64)
+        discount_factors, annuity_factors = self._extend(max(int(n_periods.max(initial=0)), 1), coupon_frequency)
+        index = np.maximum(n_periods - 1, 0)
+        price = periodic_coupon * annuity_factors[index] + face_value * discount_factors[index]
+        return np.where(n_periods > 0, price, face_value)
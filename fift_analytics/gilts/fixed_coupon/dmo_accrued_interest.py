@@ -0,0 +1,210 @@
+"""
+Accrued Interest Conventional Gilts
+===================================
+
+Vectorised accrued interest, ex-dividend status and clean price for conventional gilts,
+following the DMO conventions:
+
+- accrued interest is calculated on an Actual/Actual basis over the quasi-coupon period
+  in which settlement falls.
+- a gilt settling on or after its ex-dividend date (7 business days before the coupon date)
+  trades ex-dividend and carries negative accrued interest.
+
+[DMO Formulae for Calculating Gilt Prices from Yields](https://www.dmo.gov.uk/media/0ltegugd/yldeqns.pdf)
+
+"""
+from typing import NamedTuple, Optional, Union
+
+import numpy as np
+
+from fift_analytics.gilts.fixed_coupon.dmo_fixed_pricers import calculate_fixed_coupon_gilt_price_dmo_batch
+from fift_analytics.gilts.fixed_coupon.quasi_coupon import (
+    EX_DIVIDEND_BUSINESS_DAYS,
+    get_ex_dividend_dates,
+    get_quasi_coupon_dates,
+)
+from fift_analytics.gilts.precision import PrecisionMode, apply_precision
+from fift_analytics.gilts.row_errors import (
+    ErrorPolicy,
+    MaskedResult,
+    check_policy,
+    evaluate_valid_rows,
+    validate_bond_rows,
+)
+from fift_analytics.gilts.uk_calendar import to_datetime64
+
+
+class AccruedInterest(NamedTuple):
+    """
+    Accrued interest and ex-dividend status per £100 nominal.
+
+    :param accrued_interest: Accrued interest per £100 nominal (negative when ex-dividend).
+    :param ex_dividend: True where settlement is on or after the ex-dividend date.
+    :param ex_dividend_date: Ex-dividend date of the next coupon.
+    """
+
+    accrued_interest: np.ndarray
+    ex_dividend: np.ndarray
+    ex_dividend_date: np.ndarray
+
+
+class CleanPrice(NamedTuple):
+    """
+    Clean and dirty prices with the accrued interest used to move between them.
+
+    :param clean_price: Clean price per £100 nominal, rounded to the nearest penny unless in "raw" mode.
+    :param dirty_price: Dirty price per £100 nominal, rounded to the nearest penny unless in "raw" mode.
+    :param accrued_interest: Accrued interest per £100 nominal.
+    :param ex_dividend: True where settlement is on or after the ex-dividend date.
+    """
+
+    clean_price: np.ndarray
+    dirty_price: np.ndarray
+    accrued_interest: np.ndarray
+    ex_dividend: np.ndarray
+
+
+def calculate_gilt_accrued_interest_batch(
+    annual_coupon_rate,
+    settlement_date,
+    maturity_date,
+    errors: ErrorPolicy = "raise",
+) -> Union[AccruedInterest, MaskedResult]:
+    """
+    Calculate accrued interest and ex-dividend status for a universe of conventional gilts.
+
+    :Formula:
+    .. math::
+
+        AI = \\frac{c}{f} \\cdot \\frac{t}{s} \\quad \\text{(cum-dividend)}
+
+        AI = -\\frac{c}{f} \\cdot \\frac{r}{s} \\quad \\text{(ex-dividend)}
+
+    Where :math:`t` is the number of days from the prior quasi-coupon date to settlement,
+    :math:`r` the number of days from settlement to the next quasi-coupon date and :math:`s`
+    the number of days in the quasi-coupon period.
+
+    :param annual_coupon_rate: Annual coupon rates (decimal, e.g., 0.05 for 5%).
+    :param settlement_date: Settlement dates as 'YYYY-MM-DD' strings or ``datetime64`` values.
+    :param maturity_date: Maturity dates as 'YYYY-MM-DD' strings or ``datetime64`` values.
+    :param errors: "raise" (default) to raise on the first invalid row, "mask" to compute the valid rows only
+                   and return a :class:`~fift_analytics.gilts.row_errors.MaskedResult` of ``AccruedInterest``.
+    :raises ValueError: If any date is invalid or any settlement date is not before its maturity date
+                        (with ``errors="raise"``).
+    :return: Accrued interest per £100 nominal, ex-dividend flags and ex-dividend dates.
+    :rtype: Union[AccruedInterest, MaskedResult]
+
+    Example::
+        >>> result = calculate_gilt_accrued_interest_batch(
+        ...     [0.04, 0.04], ["2025-06-07", "2025-09-01"], ["2030-03-07", "2030-09-07"]
+        ... )
+        >>> result.accrued_interest.round(6)
+        array([ 1.      , -0.065217])
+        >>> result.ex_dividend
+        array([False,  True])
+    """
+    check_policy(errors)
+    if errors == "mask":
+        annual_coupon_rate = np.asarray(annual_coupon_rate, dtype=np.float64)
+        settlement_date, maturity_date, error_code = validate_bond_rows(
+            settlement_date,
+            maturity_date,
+            numbers=(annual_coupon_rate,),
+            business_days_before=EX_DIVIDEND_BUSINESS_DAYS,
+        )
+        return evaluate_valid_rows(
+            calculate_gilt_accrued_interest_batch,
+            error_code,
+            {
+                "annual_coupon_rate": annual_coupon_rate,
+                "settlement_date": settlement_date,
+                "maturity_date": maturity_date,
+            },
+        )
+
+    c = 100 * np.asarray(annual_coupon_rate, dtype=np.float64)
+    settlement_date = to_datetime64(settlement_date)
+    maturity_date = to_datetime64(maturity_date)
+    f = 2
+
+    if np.any(settlement_date >= maturity_date):
+        raise ValueError("Settlement date must be before maturity date.")
+
+    prior_quasi_coupon_date, next_quasi_coupon_date, _ = get_quasi_coupon_dates(settlement_date, maturity_date, f)
+    ex_dividend_date = get_ex_dividend_dates(next_quasi_coupon_date)
+    ex_dividend = settlement_date >= ex_dividend_date
+
+    r = (next_quasi_coupon_date - settlement_date).astype(np.int64)
+    s = (next_quasi_coupon_date - prior_quasi_coupon_date).astype(np.int64)
+    t = s - r
+
+    accrued_interest = (c / f) * np.where(ex_dividend, -r, t) / s
+
+    return AccruedInterest(accrued_interest, ex_dividend, ex_dividend_date)
+
+
+def calculate_gilt_clean_price_batch(
+    annual_coupon_rate,
+    settlement_date,
+    maturity_date,
+    nominal_redemption_yield,
+    precision: Optional[PrecisionMode] = None,
+    errors: ErrorPolicy = "raise",
+) -> Union[CleanPrice, MaskedResult]:
+    """
+    Calculate clean prices for a universe of conventional gilts from their redemption yields.
+
+    The dirty price comes from :func:`calculate_fixed_coupon_gilt_price_dmo_batch` and the clean
+    price is obtained by subtracting the accrued interest before any rounding is applied.
+
+    :param annual_coupon_rate: Annual coupon rates (decimal, e.g., 0.05 for 5%).
+    :param settlement_date: Settlement dates as 'YYYY-MM-DD' strings or ``datetime64`` values.
+    :param maturity_date: Maturity dates as 'YYYY-MM-DD' strings or ``datetime64`` values.
+    :param nominal_redemption_yield: Nominal redemption yields (decimal).
+    :param precision: "reporting" to round prices to the nearest penny, "raw" for full float64.
+                      Defaults to the current :func:`~fift_analytics.gilts.precision.precision_mode`.
+    :param errors: "raise" (default) to raise on the first invalid row, "mask" to price the valid rows only
+                   and return a :class:`~fift_analytics.gilts.row_errors.MaskedResult` of ``CleanPrice``.
+    :raises ValueError: If any date is invalid or any settlement date is not before its maturity date
+                        (with ``errors="raise"``).
+    :return: Clean and dirty prices, accrued interest and ex-dividend flags.
+    :rtype: Union[CleanPrice, MaskedResult]
+
+    Example::
+        >>> calculate_gilt_clean_price_batch(0.04, "2025-03-07", "2030-03-07", 0.04).clean_price
+        100.0
+    """
+    check_policy(errors)
+    if errors == "mask":
+        annual_coupon_rate = np.asarray(annual_coupon_rate, dtype=np.float64)
+        nominal_redemption_yield = np.asarray(nominal_redemption_yield, dtype=np.float64)
+        settlement_date, maturity_date, error_code = validate_bond_rows(
+            settlement_date,
+            maturity_date,
+            numbers=(annual_coupon_rate, nominal_redemption_yield),
+            business_days_before=EX_DIVIDEND_BUSINESS_DAYS,
+        )
+        return evaluate_valid_rows(
+            calculate_gilt_clean_price_batch,
+            error_code,
+            {
+                "annual_coupon_rate": annual_coupon_rate,
+                "settlement_date": settlement_date,
+                "maturity_date": maturity_date,
+                "nominal_redemption_yield": nominal_redemption_yield,
+            },
+            precision=precision,
+        )
+
+    accrued = calculate_gilt_accrued_interest_batch(annual_coupon_rate, settlement_date, maturity_date)
+    dirty_price = calculate_fixed_coupon_gilt_price_dmo_batch(
+        annual_coupon_rate, settlement_date, maturity_date, nominal_redemption_yield, precision="raw"
+    )
+    clean_price = dirty_price - accrued.accrued_interest
+
+    return CleanPrice(
+        apply_precision(clean_price, precision),
+        apply_precision(dirty_price, precision),
+        accrued.accrued_interest,
+        accrued.ex_dividend,
+    )
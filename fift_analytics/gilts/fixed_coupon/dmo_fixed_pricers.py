@@ -1,6 +1,23 @@
-from datetime import datetime, date
-from typing import List, Optional
-from dateutil.relativedelta import relativedelta
+from datetime import datetime
+from typing import Optional, Union
+
+import numpy as np
+
+from fift_analytics.gilts.fixed_coupon.quasi_coupon import (
+    EX_DIVIDEND_BUSINESS_DAYS,
+    get_ex_dividend_dates,
+    get_quasi_coupon_dates,
+)
+from fift_analytics.gilts.precision import OutputDType, PrecisionMode, apply_precision, cast_output
+from fift_analytics.gilts.row_errors import (
+    ErrorPolicy,
+    MaskedResult,
+    check_policy,
+    evaluate_valid_rows,
+    validate_bond_rows,
+)
+from fift_analytics.gilts.uk_calendar import to_datetime64
+
 
 def calculate_fixed_coupon_gilt_price_dmo(
     face_value: float,
@@ -8,6 +25,7 @@ def calculate_fixed_coupon_gilt_price_dmo(
     settlement_date: str,
     maturity_date: str,
     nominal_redemption_yield: float,
+    precision: Optional[PrecisionMode] = None,
 ) -> float:
     """
     Calculate the dirty price of a conventional gilt per £100 nominal,
@@ -23,8 +41,11 @@ def calculate_fixed_coupon_gilt_price_dmo(
     :type maturity_date: str
     :param nominal_redemption_yield: Nominal redemption yield (decimal).
     :type nominal_redemption_yield: float
+    :param precision: "reporting" to round to the nearest penny, "raw" for full float64.
+                      Defaults to the current :func:`~fift_analytics.gilts.precision.precision_mode`.
+    :type precision: Optional[str]
     :raises ValueError: If inputs are invalid.
-    :return: Dirty price per £100 nominal, rounded to the nearest penny.
+    :return: Dirty price per £100 nominal, rounded to the nearest penny (unrounded in "raw" mode).
     :rtype: float
     """
     # 1. Input Validation and Date Conversion
@@ -41,57 +62,133 @@ def calculate_fixed_coupon_gilt_price_dmo(
         raise ValueError("Face value must be equal to 100, as DMO formula is per £100 nominal.")
 
     # 2. Parameters from the DMO formula
-    c = annual_coupon_rate  # Coupon per £100 nominal
+    c = face_value * annual_coupon_rate  # Coupon per £100 nominal
     y = nominal_redemption_yield  # Nominal redemption yield
     f = 2  # Coupons per year (semi-annual)
-    v = 1 / (1 + (y / f))
 
     # 3. Determine Quasi-Coupon Dates
-    # a. Find the prior quasi-coupon date
-    month_delta = 6 if maturity_date_dt.month > 6 else 0
-    year = maturity_date_dt.year
-    prior_coupon_month = 6 if maturity_date_dt.month > 6 else 12
-    prior_coupon_year = year if maturity_date_dt.month > 6 else year -1
-
-    if prior_coupon_month == 6:
-        prior_quasi_coupon_date = date(prior_coupon_year, 6, maturity_date_dt.day)
-    else:
-        prior_quasi_coupon_date = date(prior_coupon_year, 12, maturity_date_dt.day)
-        
-    # Find the next quasi-coupon date
-    if maturity_date_dt.month > 6:
-        next_quasi_coupon_date = date(maturity_date_dt.year + 1, 6, maturity_date_dt.day)
-    else:
-        next_quasi_coupon_date = date(maturity_date_dt.year, 6, maturity_date_dt.day)
+    prior_quasi_coupon_date, next_quasi_coupon_date, n = get_quasi_coupon_dates(
+        settlement_date_dt, maturity_date_dt, f
+    )
 
     # 4. Calculate 'r' and 's' (Actual/Actual Day Count)
-    r = (next_quasi_coupon_date - settlement_date_dt).days
-    s = (next_quasi_coupon_date - prior_quasi_coupon_date).days
+    r = (next_quasi_coupon_date - np.datetime64(settlement_date_dt)).astype(int)
+    s = (next_quasi_coupon_date - prior_quasi_coupon_date).astype(int)
 
-    # 5. Number of Full Quasi-Coupon Periods (n)
-    # Calculate the number of *full* quasi-coupon periods from the *next* quasi-coupon date to the maturity date.
-    n = 0
-    current_date = next_quasi_coupon_date
-    while current_date < maturity_date_dt:
-        current_date += relativedelta(months=+6)
-        n += 1
+    # 5. Cashflow at the next quasi coupon date
+    # The coupon cashflow is zero if the settlement date is on or after the ex-dividend date
+    ex_dividend = np.datetime64(settlement_date_dt) >= get_ex_dividend_dates(next_quasi_coupon_date)
+    d1 = 0.0 if ex_dividend else c / f
 
-    if current_date != maturity_date_dt:
-        n -= 1
+    # 6. Apply DMO Price/Yield Formula
+    price = float(_dmo_dirty_price(c, y, r, s, n, d1, f))
 
-    # Calculate the cashflows at the next two quasi coupon dates
-    d1 = annual_coupon_rate / 2 #Regular coupon cashflow
+    # 7. Rounding to nearest penny unless in raw mode
+    return apply_precision(price, precision)
 
-    # The coupon cashflow is zero if the settlement date is after the ex-dividend date
-    # 6. Apply DMO Price/Yield Formula
-    if n >= 1:
-        price = (
-            (d1 * v * ((1 - v**n) / (1 - v))) + (100 * v**n)
-        ) * v**(r/s)
-    else:
-        price = d1 * v**(r / s)
-    # 7. Rounding to nearest penny
-    price = round(price, 2)
 
-    return price
 
+def calculate_fixed_coupon_gilt_price_dmo_batch(
+    annual_coupon_rate,
+    settlement_date,
+    maturity_date,
+    nominal_redemption_yield,
+    precision: Optional[PrecisionMode] = None,
+    dtype: OutputDType = "float64",
+    out=None,
+    errors: ErrorPolicy = "raise",
+) -> Union[np.ndarray, MaskedResult]:
+    """
+    Calculate the dirty prices of a universe of conventional gilts per £100 nominal in one vectorised call.
+
+    Array counterpart of :func:`calculate_fixed_coupon_gilt_price_dmo`: all arguments are broadcast
+    against each other and dates can be 'YYYY-MM-DD' strings, ``datetime64`` values
+    or integer day ordinals. NumPy arrays, memoryviews and Arrow columns of float64, int64 day ordinals or
+    ``datetime64[D]`` are read without copying.
+
+    :param annual_coupon_rate: Annual coupon rates (decimal, e.g., 0.05 for 5%).
+    :param settlement_date: Settlement dates.
+    :param maturity_date: Maturity dates.
+    :param nominal_redemption_yield: Nominal redemption yields (decimal).
+    :param precision: "reporting" to round to the nearest penny, "raw" for full float64.
+                      Defaults to the current :func:`~fift_analytics.gilts.precision.precision_mode`.
+    :param dtype: Output dtype, "float64" (default) or "float32". Prices are computed in float64 either way.
+    :param out: Optional writable float32 or float64 buffer receiving the results, e.g. a column of a frame.
+    :param errors: "raise" (default) to raise on the first invalid row, "mask" to price the valid rows only
+                   and return a :class:`~fift_analytics.gilts.row_errors.MaskedResult`.
+    :raises ValueError: If any date is invalid or any settlement date is not before its maturity date
+                        (with ``errors="raise"``).
+    :return: Dirty prices per £100 nominal, rounded to the nearest penny (unrounded in "raw" mode).
+    :rtype: Union[np.ndarray, MaskedResult]
+
+    Example::
+        >>> calculate_fixed_coupon_gilt_price_dmo_batch(
+        ...     [0.04, 0.04], ["2025-03-07", "2025-03-07"], ["2030-03-07", "2035-09-07"], [0.04, 0.05]
+        ... )
+        array([100.  ,  91.91])
+    """
+    check_policy(errors)
+    if errors == "mask":
+        annual_coupon_rate = np.asarray(annual_coupon_rate, dtype=np.float64)
+        nominal_redemption_yield = np.asarray(nominal_redemption_yield, dtype=np.float64)
+        settlement_date, maturity_date, error_code = validate_bond_rows(
+            settlement_date,
+            maturity_date,
+            numbers=(annual_coupon_rate, nominal_redemption_yield),
+            business_days_before=EX_DIVIDEND_BUSINESS_DAYS,
+        )
+        return evaluate_valid_rows(
+            calculate_fixed_coupon_gilt_price_dmo_batch,
+            error_code,
+            {
+                "annual_coupon_rate": annual_coupon_rate,
+                "settlement_date": settlement_date,
+                "maturity_date": maturity_date,
+                "nominal_redemption_yield": nominal_redemption_yield,
+            },
+            out=out,
+            precision=precision,
+            dtype=dtype,
+        )
+
+    c = 100 * np.asarray(annual_coupon_rate, dtype=np.float64)
+    y = np.asarray(nominal_redemption_yield, dtype=np.float64)
+    settlement_date = to_datetime64(settlement_date)
+    maturity_date = to_datetime64(maturity_date)
+    f = 2
+
+    if np.any(settlement_date >= maturity_date):
+        raise ValueError("Settlement date must be before maturity date.")
+
+    prior_quasi_coupon_date, next_quasi_coupon_date, n = get_quasi_coupon_dates(settlement_date, maturity_date, f)
+    r = (next_quasi_coupon_date - settlement_date).astype(np.int64)
+    s = (next_quasi_coupon_date - prior_quasi_coupon_date).astype(np.int64)
+
+    ex_dividend = settlement_date >= get_ex_dividend_dates(next_quasi_coupon_date)
+    d1 = np.where(ex_dividend, 0.0, c / f)
+
+    return cast_output(apply_precision(_dmo_dirty_price(c, y, r, s, n, d1, f), precision), dtype, out)
+
+
+def _dmo_dirty_price(c, y, r, s, n, d1, f: int = 2):
+    """
+    DMO price/yield formula for a conventional gilt, working on scalars or arrays.
+
+    .. math:: P = v^{r/s} \\left( d_1 + \\frac{c}{f} \\frac{v (1 - v^n)}{1 - v} + 100 v^n \\right)
+
+    :param c: Annual coupon per £100 nominal.
+    :param y: Nominal redemption yield (decimal).
+    :param r: Days from settlement to the next quasi-coupon date.
+    :param s: Days in the quasi-coupon period in which settlement falls.
+    :param n: Number of full quasi-coupon periods from the next quasi-coupon date to maturity.
+    :param d1: Cashflow due on the next quasi-coupon date (zero if ex-dividend).
+    :param f: Coupons per year.
+    :return: Unrounded dirty price per £100 nominal.
+    """
+    v = 1 / (1 + np.asarray(y, dtype=np.float64) / f)
+    v_n = v**n
+    # sum of v^k for k = 1..n, which degenerates to n when the yield is zero
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity = np.where(v == 1.0, n, v * (1 - v_n) / (1 - v))
+
+    return v ** (r / s) * (d1 + (c / f) * annuity + 100 * v_n)
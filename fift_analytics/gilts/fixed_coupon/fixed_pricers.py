@@ -1,5 +1,26 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Union
+
+import numpy as np
+
+from fift_analytics.gilts.day_count import (
+    SUPPORTED_DAY_COUNT_CONVENTIONS,
+    UNSUPPORTED_DAY_COUNT_MESSAGE,
+    calculate_day_count,
+    is_leap_year,  # noqa: F401
+    year_fraction,
+)
+from fift_analytics.gilts.fixed_coupon.discount_factors import DiscountFactorTable
+from fift_analytics.gilts.precision import PrecisionMode, apply_precision
+from fift_analytics.gilts.row_errors import (
+    ErrorPolicy,
+    MaskedResult,
+    RowError,
+    check_policy,
+    evaluate_valid_rows,
+    validate_bond_rows,
+)
+from fift_analytics.gilts.uk_calendar import to_datetime64
 
 
 def calculate_fixed_coupon_gilt_price_with_curve(
@@ -7,9 +28,10 @@ def calculate_fixed_coupon_gilt_price_with_curve(
     annual_coupon_rate: float,
     settlement_date: str,
     maturity_date: str,
-    bond_curve: List[float],
+    bond_curve: Union[List[float], DiscountFactorTable],
     day_count_convention: str = "Actual/Actual",
     coupon_frequency: int = 2,
+    precision: Optional[PrecisionMode] = None,
 ) -> float:
     """
     Calculate the theoretical price of a fixed coupon gilt using a generic bond curve.
@@ -25,14 +47,20 @@ def calculate_fixed_coupon_gilt_price_with_curve(
     :param bond_curve: A list of discount factors or yields for specific maturities (e.g., zero-coupon rates).
                        The length of this list must match the number of periods until maturity.
                        Each entry corresponds to the yield for one period.
-    :type bond_curve: List[float]
+                       Pass a :class:`~fift_analytics.gilts.fixed_coupon.discount_factors.DiscountFactorTable`
+                       to reuse the discount factors across all the bonds priced off the same curve.
+    :type bond_curve: Union[List[float], DiscountFactorTable]
     :param day_count_convention: The day count convention used for calculating time periods (default is "Actual/Actual").
-                                 Supported values are "Actual/Actual", "30/360", and "Actual/365".
+                                 Supported values are "Actual/Actual (ISMA)", "Actual/Actual", "30/360",
+                                 and "Actual/365".
     :type day_count_convention: str
     :param coupon_frequency: Number of coupon payments per year (e.g., 1 for annual, 2 for semi-annual, 4 for quarterly).
                              Default is 2 for semi-annual payments.
     :type coupon_frequency: int
-    :return: The theoretical price of the fixed coupon gilt rounded to 2 decimal places.
+    :param precision: "reporting" to round to 2 decimal places, "raw" for full float64.
+                      Defaults to the current :func:`~fift_analytics.gilts.precision.precision_mode`.
+    :type precision: Optional[str]
+    :return: The theoretical price of the fixed coupon gilt rounded to 2 decimal places (unrounded in "raw" mode).
     :rtype: float
     
     Example::
@@ -73,25 +101,110 @@ def calculate_fixed_coupon_gilt_price_with_curve(
     # Calculate periodic coupon payment
     periodic_coupon_rate = annual_coupon_rate / coupon_frequency
     periodic_coupon_payment = face_value * periodic_coupon_rate
-    
-    # Initialize bond price
-    price = 0.0
-    
-    # Calculate present value of coupons using bond curve yields
-    for i in range(1, total_periods + 1):
-        discount_rate = bond_curve[i - 1] / coupon_frequency
-        discount_factor = (1 + discount_rate) ** i
-        price += periodic_coupon_payment / discount_factor
-    
-    # Add present value of face value at maturity using the last discount rate in the bond curve
-    final_discount_rate = bond_curve[total_periods - 1] / coupon_frequency
-    final_discount_factor = (1 + final_discount_rate) ** total_periods
-    price += face_value / final_discount_factor
-    
-    # Round intermediate result to 6 decimal places and final result to 2 decimal places
-    price = round(price, 6)
-    
-    return round(price, 2)
+
+    # Present value of the coupons and of the face value at maturity, from the curve's discount factors
+    if not isinstance(bond_curve, DiscountFactorTable):
+        bond_curve = DiscountFactorTable(bond_curve)
+    price = float(bond_curve.price(face_value, periodic_coupon_payment, total_periods, coupon_frequency))
+
+    # Round to 2 decimal places unless in raw mode
+    return apply_precision(price, precision)
+
+
+def calculate_fixed_coupon_gilt_price_with_curve_batch(
+    face_value,
+    annual_coupon_rate,
+    settlement_date,
+    maturity_date,
+    bond_curve: Union[List[float], DiscountFactorTable],
+    day_count_convention: str = "Actual/Actual",
+    coupon_frequency: int = 2,
+    precision: Optional[PrecisionMode] = None,
+    errors: ErrorPolicy = "raise",
+) -> Union[np.ndarray, MaskedResult]:
+    """
+    Calculate the theoretical prices of a book of fixed coupon gilts off one bond curve in a single vectorised call.
+
+    Array counterpart of :func:`calculate_fixed_coupon_gilt_price_with_curve`: all arguments but the curve
+    are broadcast against each other. The discount factors are computed once for the curve and every bond
+    is priced by lookup, with no exponentiation per bond.
+
+    :param face_value: Face values of the bonds.
+    :param annual_coupon_rate: Annual coupon rates as decimals.
+    :param settlement_date: Settlement dates.
+    :param maturity_date: Maturity dates.
+    :param bond_curve: Yield for each coupon period, or a
+                       :class:`~fift_analytics.gilts.fixed_coupon.discount_factors.DiscountFactorTable`.
+    :param day_count_convention: One of "Actual/Actual (ISMA)", "Actual/Actual", "30/360" or "Actual/365".
+    :param coupon_frequency: Number of coupon payments per year (default is 2 for semi-annual payments).
+    :param precision: "reporting" to round to 2 decimal places, "raw" for full float64.
+                      Defaults to the current :func:`~fift_analytics.gilts.precision.precision_mode`.
+    :param errors: "raise" (default) to raise on the first invalid row, "mask" to price the valid rows only
+                   and return a :class:`~fift_analytics.gilts.row_errors.MaskedResult`. Bonds maturing beyond
+                   the curve are flagged ``CURVE_TOO_SHORT``.
+    :raises ValueError: If inputs are invalid or the bond curve is shorter than the longest maturity
+                        (with ``errors="raise"``).
+    :return: Prices rounded to 2 decimal places (unrounded in "raw" mode).
+    :rtype: Union[np.ndarray, MaskedResult]
+
+    Example::
+        >>> calculate_fixed_coupon_gilt_price_with_curve_batch(
+        ...     1000, [0.05, 0.03], "2025-02-17", ["2035-02-17", "2030-02-17"], [0.03] * 20
+        ... )
+        array([1171.69, 1000.  ])
+    """
+    check_policy(errors)
+    face_value = np.asarray(face_value, dtype=np.float64)
+    annual_coupon_rate = np.asarray(annual_coupon_rate, dtype=np.float64)
+    if not isinstance(bond_curve, DiscountFactorTable):
+        bond_curve = DiscountFactorTable(bond_curve)
+
+    if errors == "mask":
+        settlement_date, maturity_date, error_code = validate_bond_rows(
+            settlement_date, maturity_date, face_value=face_value, annual_coupon_rate=annual_coupon_rate
+        )
+        # the curve length check needs the number of periods, only defined for otherwise valid rows
+        checked = error_code == 0
+        n_periods = np.zeros(error_code.shape, dtype=np.int64)
+        n_periods[checked] = calculate_day_count(
+            np.broadcast_to(settlement_date, checked.shape)[checked],
+            np.broadcast_to(maturity_date, checked.shape)[checked],
+            coupon_frequency,
+            day_count_convention,
+        ).n_periods
+        error_code = np.where(n_periods > len(bond_curve), np.int8(RowError.CURVE_TOO_SHORT), error_code)
+        return evaluate_valid_rows(
+            calculate_fixed_coupon_gilt_price_with_curve_batch,
+            error_code,
+            {
+                "face_value": face_value,
+                "annual_coupon_rate": annual_coupon_rate,
+                "settlement_date": settlement_date,
+                "maturity_date": maturity_date,
+            },
+            bond_curve=bond_curve,
+            day_count_convention=day_count_convention,
+            coupon_frequency=coupon_frequency,
+            precision=precision,
+        )
+
+    settlement_date = to_datetime64(settlement_date)
+    maturity_date = to_datetime64(maturity_date)
+
+    if np.any(face_value <= 0):
+        raise ValueError("Face value must be positive.")
+
+    if np.any(annual_coupon_rate < 0):
+        raise ValueError("Annual coupon rate must be non-negative.")
+
+    if np.any(maturity_date <= settlement_date):
+        raise ValueError("Maturity date must be after the settlement date.")
+
+    day_count = calculate_day_count(settlement_date, maturity_date, coupon_frequency, day_count_convention)
+    periodic_coupon_payment = face_value * annual_coupon_rate / coupon_frequency
+    price = bond_curve.price(face_value, periodic_coupon_payment, day_count.n_periods, coupon_frequency)
+
+    return apply_precision(price, precision)
 
 
 def calculate_total_periods(
@@ -112,7 +225,8 @@ def calculate_total_periods(
     :type coupon_frequency: int
     :param day_count_convention: The day count convention used for calculating time periods.
                                  Supported values are:
-                                 - "Actual/Actual": Uses actual days in each year.
+                                 - "Actual/Actual (ISMA)": Uses actual days in each quasi-coupon period.
+                                 - "Actual/Actual": Uses actual days over the length of the settlement year.
                                  - "30/360": Assumes each month has 30 days and each year has 360 days.
                                  - "Actual/365": Uses actual days divided by 365.
                                  
@@ -121,44 +235,16 @@ def calculate_total_periods(
     :rtype: int
     """
     # Validate inputs
-    if day_count_convention not in ["Actual/Actual", "30/360", "Actual/365"]:
-        raise ValueError("Unsupported day count convention. Use 'Actual/Actual', '30/360', or 'Actual/365'.")
+    if day_count_convention not in SUPPORTED_DAY_COUNT_CONVENTIONS:
+        raise ValueError(UNSUPPORTED_DAY_COUNT_MESSAGE)
     
     if settlement_date >= maturity_date:
         raise ValueError("Maturity date must be after the settlement date.")
     
-    # Calculate total years to maturity based on the day count convention
-    if day_count_convention == "Actual/Actual":
-        # Use actual days divided by the actual number of days in each year
-        total_days = (maturity_date - settlement_date).days
-        year_length = 366 if is_leap_year(settlement_date.year) else 365
-        total_years = total_days / year_length
+    # Calculate total periods based on coupon frequency and the day count convention
+    day_count = calculate_day_count(settlement_date, maturity_date, coupon_frequency, day_count_convention)
     
-    elif day_count_convention == "30/360":
-        # Assume each month has 30 days and each year has 360 days
-        total_years = calculate_30_360_years(settlement_date, maturity_date)
-    
-    elif day_count_convention == "Actual/365":
-        # Use actual days divided by 365
-        total_days = (maturity_date - settlement_date).days
-        total_years = total_days / 365.0
-    
-    # Calculate total periods based on coupon frequency
-    total_periods = int(total_years * coupon_frequency)
-    
-    return total_periods
-
-
-def is_leap_year(year: int) -> bool:
-    """
-    Check if a given year is a leap year.
-
-    :param year: Year to check.
-    :type year: int
-    :return: True if leap year, False otherwise.
-    :rtype: bool
-    """
-    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+    return int(day_count.n_periods)
 
 
 def calculate_30_360_years(start_date: datetime, end_date: datetime) -> float:
@@ -172,11 +258,4 @@ def calculate_30_360_years(start_date: datetime, end_date: datetime) -> float:
     :return: Total years between the two dates using the 30/360 convention.
     :rtype: float
     """
-    start_day = min(start_date.day, 30)
-    end_day = min(end_date.day, 30)
-
-    years = end_date.year - start_date.year
-    months = end_date.month - start_date.month
-    days = end_day - start_day
-
-    return (years * 360 + months * 30 + days) / 360.0
+    return float(year_fraction(start_date, end_date, "30/360"))
@@ -0,0 +1,248 @@
+"""
+Quasi-Coupon Schedules
+======================
+
+Quasi-coupon date logic for conventional gilts, as used by the DMO price/yield formulae.
+
+Quasi-coupon dates are the theoretical coupon dates obtained by stepping back from the maturity
+date in whole coupon periods, regardless of whether a coupon is actually paid on those dates.
+
+All functions operate on arrays of ``datetime64[D]`` (or anything numpy can convert to it,
+e.g. 'YYYY-MM-DD' strings or ``datetime.date`` objects) so that a whole universe of gilts
+can be scheduled in a single call.
+
+[DMO Formulae for Calculating Gilt Prices from Yields](https://www.dmo.gov.uk/media/0ltegugd/yldeqns.pdf)
+
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from fift_analytics.gilts.uk_calendar import get_uk_calendar, to_datetime64
+
+EX_DIVIDEND_BUSINESS_DAYS = 7
+
+
+class QuasiCouponDates(NamedTuple):
+    """
+    Quasi-coupon dates bracketing the settlement date.
+
+    :param prior_date: Last quasi-coupon date on or before settlement.
+    :param next_date: First quasi-coupon date strictly after settlement.
+    :param n_periods: Number of full quasi-coupon periods from ``next_date`` to maturity.
+    """
+
+    prior_date: np.ndarray
+    next_date: np.ndarray
+    n_periods: np.ndarray
+
+
+def add_months(dates, months) -> np.ndarray:
+    """
+    Shift dates by a whole number of months, clamping the day to the end of the target month.
+
+    :param dates: Dates to shift.
+    :param months: Number of months to shift by (can be negative), broadcast against ``dates``.
+    :return: Shifted dates as a ``datetime64[D]`` array.
+    :rtype: np.ndarray
+
+    :Example:
+        >>> add_months(np.datetime64("2025-08-31"), -6)
+        np.datetime64('2025-02-28')
+    """
+    dates = to_datetime64(dates)
+    month_start = dates.astype("datetime64[M]")
+    day_offset = (dates - month_start.astype("datetime64[D]")).astype(np.int64)
+    target_month = month_start + np.asarray(months, dtype=np.int64)
+    month_length = ((target_month + 1).astype("datetime64[D]") - target_month.astype("datetime64[D]")).astype(np.int64)
+
+    return target_month.astype("datetime64[D]") + np.minimum(day_offset, month_length - 1)
+
+
+def get_quasi_coupon_dates(settlement_date, maturity_date, coupon_frequency: int = 2) -> QuasiCouponDates:
+    """
+    Find the quasi-coupon dates bracketing each settlement date.
+
+    Every quasi-coupon date is derived directly from the maturity date, so month-end clamping
+    never drifts across the schedule.
+
+    :param settlement_date: Settlement dates.
+    :param maturity_date: Maturity dates, broadcast against ``settlement_date``.
+    :param coupon_frequency: Number of coupons per year (default is 2 for semi-annual gilts).
+    :return: Prior and next quasi-coupon dates and the number of full periods from next to maturity.
+             Rows where settlement is on or after maturity get ``n_periods < 0``.
+    :rtype: QuasiCouponDates
+    """
+    settlement_date = to_datetime64(settlement_date)
+    maturity_date = to_datetime64(maturity_date)
+    months_per_period = 12 // coupon_frequency
+
+    settlement_month = settlement_date.astype("datetime64[M]").astype(np.int64)
+    maturity_month = maturity_date.astype("datetime64[M]").astype(np.int64)
+
+    # candidate next date falls in the settlement month or at most one period after it
+    n_periods = (maturity_month - settlement_month) // months_per_period
+    candidate = add_months(maturity_date, -n_periods * months_per_period)
+    n_periods = np.where(candidate <= settlement_date, n_periods - 1, n_periods)
+
+    next_date = add_months(maturity_date, -n_periods * months_per_period)
+    prior_date = add_months(maturity_date, -(n_periods + 1) * months_per_period)
+
+    return QuasiCouponDates(prior_date, next_date, n_periods)
+
+
+def get_ex_dividend_dates(coupon_dates) -> np.ndarray:
+    """
+    Ex-dividend dates for coupon dates, following the UK convention of 7 business days before the coupon.
+
+    Business days follow the UK calendar and coupon dates falling on a non-business day are rolled
+    forward before counting back.
+
+    :param coupon_dates: Coupon dates.
+    :return: Ex-dividend dates as a ``datetime64[D]`` array.
+    :rtype: np.ndarray
+    """
+    return get_uk_calendar().add_business_days(coupon_dates, -EX_DIVIDEND_BUSINESS_DAYS)
+
+
+class CouponSchedule(NamedTuple):
+    """
+    Precomputed quasi-coupon schedules for a set of gilts.
+
+    :param coupon_dates: Quasi-coupon dates, one row per gilt in ascending order, ending on the maturity date.
+    :param ex_dividend_dates: Ex-dividend dates of each quasi-coupon date.
+    """
+
+    coupon_dates: np.ndarray
+    ex_dividend_dates: np.ndarray
+
+
+class SchedulePosition(NamedTuple):
+    """
+    Position of settlement dates within precomputed coupon schedules.
+
+    :param prior_date: Last quasi-coupon date on or before settlement.
+    :param next_date: First quasi-coupon date strictly after settlement.
+    :param n_periods: Number of full quasi-coupon periods from ``next_date`` to maturity.
+    :param ex_dividend_date: Ex-dividend date of ``next_date``.
+    :param in_schedule: False where settlement is on or after maturity or before the schedule start.
+    """
+
+    prior_date: np.ndarray
+    next_date: np.ndarray
+    n_periods: np.ndarray
+    ex_dividend_date: np.ndarray
+    in_schedule: np.ndarray
+
+
+def build_coupon_schedule(maturity_date, start_date, coupon_frequency: int = 2) -> CouponSchedule:
+    """
+    Build the quasi-coupon schedules of a set of gilts once, covering every settlement from ``start_date``.
+
+    All rows share the same number of dates, so gilts with shorter lives get extra
+    (harmless) quasi-coupon dates before ``start_date``.
+
+    :param maturity_date: Maturity dates, one per gilt.
+    :param start_date: Earliest settlement date the schedules must cover.
+    :param coupon_frequency: Number of coupons per year (default is 2 for semi-annual gilts).
+    :return: Quasi-coupon dates and their ex-dividend dates.
+    :rtype: CouponSchedule
+    """
+    maturity_date = to_datetime64(maturity_date).reshape(-1)
+    start_date = np.min(to_datetime64(start_date))
+    months_per_period = 12 // coupon_frequency
+
+    _, _, n_periods = get_quasi_coupon_dates(start_date, maturity_date, coupon_frequency)
+    periods_back = np.arange(max(int(n_periods.max(initial=0)), 0) + 1, -1, -1)
+    coupon_dates = add_months(maturity_date[:, None], -periods_back[None, :] * months_per_period)
+
+    return CouponSchedule(coupon_dates, get_ex_dividend_dates(coupon_dates))
+
+
+def locate_in_schedule(schedule: CouponSchedule, settlement_date) -> SchedulePosition:
+    """
+    Find the quasi-coupon dates bracketing settlement dates by lookup into precomputed schedules.
+
+    Settlement dates are broadcast against the gilts in the schedule, so a ``(n_dates, 1)`` array
+    of settlement dates gives ``(n_dates, n_gilts)`` results.
+
+    :param schedule: Schedules built with :func:`build_coupon_schedule`.
+    :param settlement_date: Settlement dates.
+    :return: Bracketing quasi-coupon dates, remaining periods, ex-dividend dates and validity flags.
+    :rtype: SchedulePosition
+    """
+    coupon_dates = schedule.coupon_dates.astype(np.int64)
+    n_gilts, n_dates = coupon_dates.shape
+    settlement_date = to_datetime64(settlement_date).astype(np.int64)
+
+    # offset every row into its own range so that one searchsorted covers all the schedules
+    base = coupon_dates.min(initial=0)
+    span = coupon_dates.max(initial=0) - base + 2
+    rows = np.arange(n_gilts)
+    keys = (rows[:, None] * span + (coupon_dates - base)).reshape(-1)
+    query = rows * span + np.clip(settlement_date - base, -1, span - 1)
+    count = np.searchsorted(keys, query, side="right") - rows * n_dates
+
+    in_schedule = (count >= 1) & (count < n_dates)
+    next_index = rows * n_dates + np.clip(count, 1, n_dates - 1)
+
+    return SchedulePosition(
+        prior_date=schedule.coupon_dates.reshape(-1)[next_index - 1],
+        next_date=schedule.coupon_dates.reshape(-1)[next_index],
+        n_periods=n_dates - 1 - count,
+        ex_dividend_date=schedule.ex_dividend_dates.reshape(-1)[next_index],
+        in_schedule=in_schedule,
+    )
+
+
+class CashFlows(NamedTuple):
+    """
+    Remaining cash flows of a set of gilts, one row per gilt, padded with zero amounts on the maturity date.
+
+    :param payment_date: Quasi-coupon dates from the next one after settlement to maturity.
+    :param amount: Cash flow per £100 nominal on each date: coupons (none on the next date when the gilt
+                   trades ex-dividend) and the redemption at maturity.
+    """
+
+    payment_date: np.ndarray
+    amount: np.ndarray
+
+
+def build_cash_flows(annual_coupon_rate, settlement_date, maturity_date, coupon_frequency: int = 2) -> CashFlows:
+    """
+    Build the cash flows a buyer settling on ``settlement_date`` receives, for a universe of gilts in one call.
+
+    :param annual_coupon_rate: Annual coupon rates (decimal).
+    :param settlement_date: Settlement dates, before the maturity dates.
+    :param maturity_date: Maturity dates, broadcast against the other arguments.
+    :param coupon_frequency: Number of coupons per year (default is 2 for semi-annual gilts).
+    :return: Payment dates and amounts, as ``(n_gilts, n_dates)`` arrays.
+    :rtype: CashFlows
+
+    :Example:
+        >>> flows = build_cash_flows(0.04, "2025-09-01", "2026-09-07")
+        >>> flows.payment_date
+        array([['2025-09-07', '2026-03-07', '2026-09-07']], dtype='datetime64[D]')
+        >>> flows.amount
+        array([[  0.,   2., 102.]])
+    """
+    coupon, settlement_date, maturity_date = np.broadcast_arrays(
+        100 * np.asarray(annual_coupon_rate, dtype=np.float64),
+        to_datetime64(settlement_date),
+        to_datetime64(maturity_date),
+    )
+    coupon, settlement_date, maturity_date = coupon.reshape(-1), settlement_date.reshape(-1), maturity_date.reshape(-1)
+    months_per_period = 12 // coupon_frequency
+
+    _, next_date, n_periods = get_quasi_coupon_dates(settlement_date, maturity_date, coupon_frequency)
+    ex_dividend = settlement_date >= get_ex_dividend_dates(next_date)
+    period = np.arange(max(int(n_periods.max(initial=0)), 0) + 1)
+    paid = period[None, :] <= n_periods[:, None]
+
+    periods_to_maturity = np.where(paid, n_periods[:, None] - period[None, :], 0)
+    payment_date = add_months(maturity_date[:, None], -periods_to_maturity * months_per_period)
+    amount = np.where(paid, coupon[:, None] / coupon_frequency, 0.0)
+    amount[:, 0] = np.where(ex_dividend, 0.0, amount[:, 0])
+    amount += np.where(paid & (periods_to_maturity == 0), 100.0, 0.0)
+
+    return CashFlows(payment_date, amount)
@@ -0,0 +1,159 @@
+"""
+Gilt Strips
+===========
+
+Decomposition of conventional gilts into coupon and principal strips, priced as zero-coupon gilts.
+
+Each gilt's remaining cash flows from settlement are taken from its quasi-coupon schedule
+(:func:`~fift_analytics.gilts.fixed_coupon.quasi_coupon.build_cash_flows`, the schedule logic of the DMO pricer,
+so no coupon is stripped on the next date when the gilt trades ex-dividend). Strips paying on the same date
+are netted and indexed by payment date, and every distinct payment date is discounted once through
+:func:`~fift_analytics.gilts.zero_coupon.zc_pricers.get_zero_coupon_gilt_price_batch` at the zero curve
+yield for that date. Gilt values are then gathered back from the per-date discount factors, so pricing a whole
+book scales with the number of distinct payment dates rather than bonds x coupons.
+
+:Example:
+    >>> strips = strip_gilts([0.04, 0.0425], [1_000_000, 2_000_000], "2025-03-07", ["2026-03-07", "2026-09-07"])
+    >>> strips.payment_date
+    array(['2025-09-07', '2026-03-07', '2026-09-07'], dtype='datetime64[D]')
+    >>> strips.coupon_strips
+    array([62500., 62500., 42500.])
+    >>> strips.principal_strips
+    array([      0., 1000000., 2000000.])
+
+"""
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from fift_analytics.gilts.day_count import year_fraction
+from fift_analytics.gilts.fixed_coupon.quasi_coupon import build_cash_flows
+from fift_analytics.gilts.precision import PrecisionMode, apply_precision
+from fift_analytics.gilts.uk_calendar import to_datetime64
+from fift_analytics.gilts.zero_coupon.curve_yield_extrapolation import derive_yield_from_zero_curve_batch
+from fift_analytics.gilts.zero_coupon.zc_pricers import get_zero_coupon_gilt_price_batch
+
+
+class StrippedGilts(NamedTuple):
+    """
+    Coupon and principal strips of a book of gilts, netted by payment date.
+
+    :param settlement_date: Settlement date of the decomposition.
+    :param payment_date: Distinct payment dates, in ascending order.
+    :param coupon_strips: Nominal of coupon strips paying on each date.
+    :param principal_strips: Nominal of principal strips paying on each date.
+    :param gilt: Gilt of each cash flow.
+    :param date_index: Index into ``payment_date`` of each cash flow.
+    :param amount: Amount of each cash flow (coupon and principal).
+    :param n_gilts: Number of gilts stripped.
+    """
+
+    settlement_date: np.datetime64
+    payment_date: np.ndarray
+    coupon_strips: np.ndarray
+    principal_strips: np.ndarray
+    gilt: np.ndarray
+    date_index: np.ndarray
+    amount: np.ndarray
+    n_gilts: int
+
+
+class StripsValuation(NamedTuple):
+    """
+    Strip prices and the gilt values rebuilt from them.
+
+    :param discount_factor: Discount factor of each distinct payment date.
+    :param strip_value: Value of the net strips paying on each date (coupon and principal).
+    :param gilt_value: Dirty value of each gilt position, the sum of its discounted cash flows.
+    """
+
+    discount_factor: np.ndarray
+    strip_value: np.ndarray
+    gilt_value: np.ndarray
+
+
+def strip_gilts(annual_coupon_rate, nominal, settlement_date, maturity_date) -> StrippedGilts:
+    """
+    Decompose a book of conventional gilts into coupon and principal strips, netted by payment date.
+
+    :param annual_coupon_rate: Annual coupon rates (decimal, e.g., 0.05 for 5%).
+    :param nominal: Nominal held in each gilt.
+    :param settlement_date: Settlement date, one date for the whole book.
+    :param maturity_date: Maturity dates, broadcast against the coupon rates and nominals.
+    :raises ValueError: If the settlement date is not a single date or not before every maturity date.
+    :return: Strips by payment date and the cash flows of each gilt.
+    :rtype: StrippedGilts
+    """
+    settlement_date = to_datetime64(settlement_date)
+    if settlement_date.size != 1:
+        raise ValueError("Settlement date must be a single date.")
+    settlement_date = settlement_date.reshape(())[()]
+
+    annual_coupon_rate, nominal, maturity_date = np.broadcast_arrays(
+        np.asarray(annual_coupon_rate, dtype=np.float64),
+        np.asarray(nominal, dtype=np.float64),
+        to_datetime64(maturity_date),
+    )
+    annual_coupon_rate, nominal, maturity_date = (
+        annual_coupon_rate.reshape(-1),
+        nominal.reshape(-1),
+        maturity_date.reshape(-1),
+    )
+    if np.any(settlement_date >= maturity_date):
+        raise ValueError("Settlement date must be before maturity date.")
+
+    flows = build_cash_flows(annual_coupon_rate, settlement_date, maturity_date)
+    units = nominal[:, None] / 100
+    principal = np.where(flows.payment_date == maturity_date[:, None], 100.0, 0.0) * (flows.amount > 0)
+    coupon = flows.amount - principal
+
+    paid = flows.amount > 0
+    gilt = np.broadcast_to(np.arange(nominal.size)[:, None], paid.shape)[paid]
+    payment_date, date_index = np.unique(flows.payment_date[paid], return_inverse=True)
+    n_dates = payment_date.size
+
+    return StrippedGilts(
+        settlement_date=settlement_date,
+        payment_date=payment_date,
+        coupon_strips=np.bincount(date_index, weights=(units * coupon)[paid], minlength=n_dates),
+        principal_strips=np.bincount(date_index, weights=(units * principal)[paid], minlength=n_dates),
+        gilt=gilt,
+        date_index=date_index,
+        amount=(units * flows.amount)[paid],
+        n_gilts=nominal.size,
+    )
+
+
+def price_stripped_gilts(
+    strips: StrippedGilts,
+    zero_curve: list[tuple[int, float]],
+    precision: Optional[PrecisionMode] = None,
+) -> StripsValuation:
+    """
+    Price strips off a zero curve, one zero-coupon pricing per distinct payment date, and rebuild the gilt values.
+
+    :param strips: Strips from :func:`strip_gilts`.
+    :param zero_curve: Zero curve as a list of (maturity_in_months, annual_yield).
+    :param precision: "reporting" to round the strip and gilt values to 2 decimal places, "raw" for full float64.
+                      Defaults to the current :func:`~fift_analytics.gilts.precision.precision_mode`.
+    :return: Discount factors and strip values by payment date, and gilt values.
+    :rtype: StripsValuation
+
+    :Example:
+        >>> strips = strip_gilts([0.04, 0.0425], [1_000_000, 2_000_000], "2025-03-07", ["2026-03-07", "2026-09-07"])
+        >>> price_stripped_gilts(strips, [(3, 0.04), (24, 0.042)]).gilt_value
+        array([ 998763.47, 2001540.31])
+    """
+    months_to_payment = 12 * year_fraction(strips.settlement_date, strips.payment_date)
+    annual_yield = derive_yield_from_zero_curve_batch(zero_curve, months_to_payment)
+    discount_factor = get_zero_coupon_gilt_price_batch(
+        1.0, annual_yield, strips.payment_date, strips.settlement_date, precision="raw"
+    )
+
+    strip_value = (strips.coupon_strips + strips.principal_strips) * discount_factor
+    gilt_value = np.bincount(
+        strips.gilt, weights=strips.amount * discount_factor[strips.date_index], minlength=strips.n_gilts
+    )
+    return StripsValuation(
+        discount_factor, apply_precision(strip_value, precision), apply_precision(gilt_value, precision)
+    )
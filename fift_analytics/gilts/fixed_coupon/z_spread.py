@@ -0,0 +1,171 @@
+"""
+Z-Spread Conventional Gilts
+===========================
+
+Spread of conventional gilts over a zero curve, solved for a whole universe at once.
+
+Each gilt's remaining cash flows :math:`CF_i`, from
+:func:`~fift_analytics.gilts.fixed_coupon.quasi_coupon.build_cash_flows`, are discounted off the zero curve
+interpolated at their payment times :math:`t_i` (years, Actual/Actual), with continuous compounding as in
+:func:`~fift_analytics.gilts.zero_coupon.zc_pricers.get_zero_coupon_gilt_price`, plus a constant spread :math:`s`:
+
+.. math:: P(s) = \\sum_i CF_i \\, e^{-(z(t_i) + s) t_i}, \\qquad P'(s) = -\\sum_i t_i \\, CF_i \\, e^{-(z(t_i) + s) t_i}
+
+The Z-spread solves :math:`P(s) = P_{dirty}`. :math:`P` is decreasing and convex in :math:`s`, so Newton
+iterations with the analytic derivative converge from the duration-based first guess
+:math:`s_0 = \\ln(P(0) / P_{dirty}) / D` (exact for a single cash flow). All bonds iterate together on the
+cash flow grid, and only those not yet converged are updated at each step.
+
+:Example:
+    >>> zero_curve = [(3, 0.04), (60, 0.042), (120, 0.045)]
+    >>> result = calculate_z_spread_batch(0.04, "2025-03-07", ["2030-03-07", "2035-03-07"], [98.5, 95.0], zero_curve)
+    >>> (result.z_spread * 10_000).round(2)
+    array([ 9.47, 11.34])
+    >>> result.converged
+    array([ True,  True])
+
+"""
+from typing import NamedTuple, Union
+
+import numpy as np
+
+from fift_analytics.gilts.day_count import year_fraction
+from fift_analytics.gilts.fixed_coupon.quasi_coupon import EX_DIVIDEND_BUSINESS_DAYS, build_cash_flows
+from fift_analytics.gilts.row_errors import (
+    ErrorPolicy,
+    MaskedResult,
+    RowError,
+    check_policy,
+    evaluate_valid_rows,
+    validate_bond_rows,
+)
+from fift_analytics.gilts.uk_calendar import to_datetime64
+from fift_analytics.gilts.zero_coupon.curve_yield_extrapolation import derive_yield_from_zero_curve_batch
+
+DEFAULT_TOLERANCE = 1e-10
+
+DEFAULT_MAX_ITERATIONS = 50
+
+
+class ZSpreadResult(NamedTuple):
+    """
+    Z-spreads and convergence diagnostics.
+
+    :param z_spread: Spread over the zero curve (decimal, continuously compounded).
+    :param converged: True where the repriced dirty price is within the tolerance of the target.
+    :param iterations: Newton iterations taken by each bond.
+    :param price_error: Dirty price at the returned spread minus the target dirty price.
+    """
+
+    z_spread: np.ndarray
+    converged: np.ndarray
+    iterations: np.ndarray
+    price_error: np.ndarray
+
+
+def _discounted_cash_flows(annual_coupon_rate, settlement_date, maturity_date, zero_curve):
+    """
+    Cash flows discounted off the zero curve alone and their payment times, as ``(n_bonds, n_dates)`` arrays.
+    """
+    flows = build_cash_flows(annual_coupon_rate, settlement_date, maturity_date)
+    time = year_fraction(settlement_date[:, None], flows.payment_date)
+    zero_yield = derive_yield_from_zero_curve_batch(zero_curve, 12 * time)
+    return flows.amount * np.exp(-zero_yield * time), time
+
+
+def calculate_z_spread_batch(
+    annual_coupon_rate,
+    settlement_date,
+    maturity_date,
+    dirty_price,
+    zero_curve: list[tuple[int, float]],
+    tolerance: float = DEFAULT_TOLERANCE,
+    max_iterations: int = DEFAULT_MAX_ITERATIONS,
+    errors: ErrorPolicy = "raise",
+) -> Union[ZSpreadResult, MaskedResult]:
+    """
+    Solve the Z-spreads of a universe of conventional gilts over a zero curve with vectorised Newton iterations.
+
+    :param annual_coupon_rate: Annual coupon rates (decimal, e.g., 0.05 for 5%).
+    :param settlement_date: Settlement dates.
+    :param maturity_date: Maturity dates.
+    :param dirty_price: Market dirty prices per £100 nominal.
+    :param zero_curve: Zero curve as a list of (maturity_in_months, annual_yield), interpolated as in
+                       :func:`~fift_analytics.gilts.zero_coupon.curve_yield_extrapolation.derive_yield_from_zero_curve`.
+    :param tolerance: Largest absolute dirty price error per £100 nominal for a bond to be converged.
+    :param max_iterations: Largest number of Newton iterations.
+    :param errors: "raise" (default) to raise on the first invalid row, "mask" to solve the valid rows only
+                   and return a :class:`~fift_analytics.gilts.row_errors.MaskedResult` of ``ZSpreadResult``.
+    :raises ValueError: If any date is invalid, any settlement date is not before its maturity date or any
+                        dirty price is not positive (with ``errors="raise"``), or the zero curve has fewer
+                        than two points.
+    :return: Z-spreads, convergence flags, iteration counts and residual price errors.
+    :rtype: Union[ZSpreadResult, MaskedResult]
+    """
+    check_policy(errors)
+    annual_coupon_rate = np.asarray(annual_coupon_rate, dtype=np.float64)
+    dirty_price = np.asarray(dirty_price, dtype=np.float64)
+
+    if errors == "mask":
+        settlement_date, maturity_date, error_code = validate_bond_rows(
+            settlement_date,
+            maturity_date,
+            numbers=(annual_coupon_rate, dirty_price),
+            business_days_before=EX_DIVIDEND_BUSINESS_DAYS,
+        )
+        non_positive_price = (error_code == 0) & (dirty_price <= 0)
+        error_code = np.where(non_positive_price, np.int8(RowError.NON_POSITIVE_PRICE), error_code)
+        return evaluate_valid_rows(
+            calculate_z_spread_batch,
+            error_code,
+            {
+                "annual_coupon_rate": annual_coupon_rate,
+                "settlement_date": settlement_date,
+                "maturity_date": maturity_date,
+                "dirty_price": dirty_price,
+            },
+            zero_curve=zero_curve,
+            tolerance=tolerance,
+            max_iterations=max_iterations,
+        )
+
+    settlement_date = to_datetime64(settlement_date)
+    maturity_date = to_datetime64(maturity_date)
+    if np.any(settlement_date >= maturity_date):
+        raise ValueError("Settlement date must be before maturity date.")
+    if np.any(dirty_price <= 0):
+        raise ValueError("Dirty price must be positive.")
+
+    shape = np.broadcast_shapes(annual_coupon_rate.shape, settlement_date.shape, maturity_date.shape, dirty_price.shape)
+    annual_coupon_rate, settlement_date, maturity_date, target = (
+        np.broadcast_to(column, shape).reshape(-1)
+        for column in (annual_coupon_rate, settlement_date, maturity_date, dirty_price)
+    )
+    discounted, time = _discounted_cash_flows(annual_coupon_rate, settlement_date, maturity_date, zero_curve)
+
+    # duration-based first guess, exact for a single cash flow
+    present_value = discounted.sum(axis=1)
+    duration = (time * discounted).sum(axis=1) / present_value
+    z_spread = np.log(present_value / target) / duration
+    iterations = np.zeros(target.size, dtype=np.int64)
+    price_error = np.full(target.size, np.inf)
+
+    active = np.arange(target.size)
+    for iteration in range(max_iterations + 1):
+        weighted = discounted[active] * np.exp(-z_spread[active, None] * time[active])
+        price_error[active] = weighted.sum(axis=1) - target[active]
+        unconverged = np.abs(price_error[active]) > tolerance
+        active, weighted = active[unconverged], weighted[unconverged]
+        if active.size == 0 or iteration == max_iterations:
+            break
+
+        slope = -(time[active] * weighted).sum(axis=1)
+        z_spread[active] -= price_error[active] / slope
+        iterations[active] += 1
+
+    return ZSpreadResult(
+        z_spread.reshape(shape),
+        (np.abs(price_error) <= tolerance).reshape(shape),
+        iterations.reshape(shape),
+        price_error.reshape(shape),
+    )
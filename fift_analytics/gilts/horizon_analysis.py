@@ -0,0 +1,212 @@
+"""
+Horizon Analysis
+================
+
+Carry and roll-down analysis: price a set of gilts across a vector of future settlement dates
+in one broadcast evaluation, returning ``(n_dates, n_bonds)`` price and DV01 grids.
+
+Yields at each horizon date can come from:
+
+- fixed yields per bond (pure carry at constant yield).
+- a zero curve, ``list[tuple[int, float]]`` as used by
+  :func:`~fift_analytics.gilts.zero_coupon.curve_yield_extrapolation.derive_yield_from_zero_curve`,
+  either held static so that bonds roll down it (``curve_mode="rolldown"``), or rolled forward
+  so that each bond is priced at its implied forward yield (``curve_mode="forward"``).
+  The curve is taken to be as of the earliest settlement date.
+
+Cells where the bond has matured by the settlement date are NaN, so a bond that matures before the
+earliest settlement date gives a column of NaN rather than failing the whole grid.
+
+"""
+from typing import Literal, NamedTuple, Optional
+
+import numpy as np
+
+from fift_analytics.gilts.day_count import year_fraction
+from fift_analytics.gilts.fixed_coupon.dmo_fixed_pricers import _dmo_dirty_price
+from fift_analytics.gilts.fixed_coupon.quasi_coupon import build_coupon_schedule, locate_in_schedule
+from fift_analytics.gilts.precision import PrecisionMode, apply_precision
+from fift_analytics.gilts.uk_calendar import to_datetime64
+from fift_analytics.gilts.zero_coupon.curve_yield_extrapolation import derive_yield_from_zero_curve_batch
+from fift_analytics.gilts.zero_coupon.zc_pricers import _zero_coupon_price
+
+CurveMode = Literal["rolldown", "forward"]
+
+ONE_BASIS_POINT = 0.0001
+
+
+class HorizonGrid(NamedTuple):
+    """
+    Prices and risk of a set of bonds across settlement dates.
+
+    :param settlement_date: Settlement dates, shape ``(n_dates,)``.
+    :param annual_yield: Yields used for pricing, shape ``(n_dates, n_bonds)``.
+    :param price: Dirty prices, shape ``(n_dates, n_bonds)``, NaN once matured.
+    :param dv01: Price change for a 1bp increase in yield, shape ``(n_dates, n_bonds)``, NaN once matured.
+    """
+
+    settlement_date: np.ndarray
+    annual_yield: np.ndarray
+    price: np.ndarray
+    dv01: np.ndarray
+
+
+def _horizon_yields(
+    settlement_date: np.ndarray,
+    maturity_date: np.ndarray,
+    annual_yield,
+    zero_curve: Optional[list[tuple[int, float]]],
+    curve_mode: CurveMode,
+) -> np.ndarray:
+    """
+    Yields of each bond at each settlement date, shape ``(n_dates, n_bonds)``.
+    """
+    shape = (settlement_date.shape[0], maturity_date.shape[-1])
+    if (annual_yield is None) == (zero_curve is None):
+        raise ValueError("Provide exactly one of annual_yield or zero_curve.")
+
+    if annual_yield is not None:
+        return np.broadcast_to(np.asarray(annual_yield, dtype=np.float64), shape)
+
+    if curve_mode == "rolldown":
+        months_to_maturity = 12 * year_fraction(settlement_date, maturity_date)
+        return derive_yield_from_zero_curve_batch(zero_curve, np.maximum(months_to_maturity, 0))
+
+    if curve_mode == "forward":
+        # bonds that have matured by the curve date have no forward yield; their cells are NaN
+        curve_date = settlement_date.min()
+        months_to_maturity = np.maximum(12 * year_fraction(curve_date, maturity_date), 0)
+        months_to_settlement = 12 * year_fraction(curve_date, settlement_date)
+        spot_maturity = derive_yield_from_zero_curve_batch(zero_curve, months_to_maturity)
+        spot_settlement = derive_yield_from_zero_curve_batch(zero_curve, months_to_settlement)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            forward = (spot_maturity * months_to_maturity - spot_settlement * months_to_settlement) / (
+                months_to_maturity - months_to_settlement
+            )
+        return np.broadcast_to(np.where(maturity_date > curve_date, forward, np.nan), shape)
+
+    raise ValueError("Unsupported curve mode. Use 'rolldown' or 'forward'.")
+
+
+def _settlement_grid(settlement_dates) -> np.ndarray:
+    settlement_dates = to_datetime64(settlement_dates).reshape(-1)
+    if settlement_dates.size == 0:
+        raise ValueError("Settlement dates must not be empty.")
+    return settlement_dates
+
+
+def calculate_zero_coupon_horizon(
+    face_value,
+    maturity_date,
+    settlement_dates,
+    annual_yield=None,
+    zero_curve: Optional[list[tuple[int, float]]] = None,
+    curve_mode: CurveMode = "rolldown",
+    precision: Optional[PrecisionMode] = None,
+) -> HorizonGrid:
+    """
+    Price zero-coupon gilts across a vector of settlement dates.
+
+    Prices follow :func:`~fift_analytics.gilts.zero_coupon.zc_pricers.get_zero_coupon_gilt_price`
+    (continuous compounding, Actual/Actual).
+
+    :param face_value: Face values, one per bond.
+    :param maturity_date: Maturity dates, one per bond.
+    :param settlement_dates: Settlement dates of the horizon.
+    :param annual_yield: Annual yields, one per bond, held constant across dates.
+    :param zero_curve: Zero curve as a list of (maturity_in_months, annual_yield), used instead of ``annual_yield``.
+    :param curve_mode: "rolldown" to hold the curve static, "forward" to use implied forward yields.
+    :param precision: "reporting" to round to 2 decimal places, "raw" for full float64.
+                      Defaults to the current :func:`~fift_analytics.gilts.precision.precision_mode`.
+    :raises ValueError: If both or neither of ``annual_yield`` and ``zero_curve`` are given.
+    :return: Price and DV01 grids of shape ``(n_dates, n_bonds)``.
+    :rtype: HorizonGrid
+
+    :Example:
+        >>> grid = calculate_zero_coupon_horizon(
+        ...     [100, 100], ["2030-02-17", "2035-02-17"], ["2025-02-17", "2026-02-17"], annual_yield=[0.04, 0.045]
+        ... )
+        >>> grid.price
+        array([[81.86, 63.75],
+               [85.21, 66.68]])
+    """
+    settlement_dates = _settlement_grid(settlement_dates)
+    maturity_date = to_datetime64(maturity_date).reshape(-1)
+    face_value = np.asarray(face_value, dtype=np.float64)
+    settlement = settlement_dates[:, None]
+
+    annual_yield = _horizon_yields(settlement, maturity_date, annual_yield, zero_curve, curve_mode)
+    live = settlement < maturity_date
+
+    price = _zero_coupon_price(face_value, annual_yield, settlement, maturity_date)
+    price_up = _zero_coupon_price(face_value, annual_yield + ONE_BASIS_POINT, settlement, maturity_date)
+    price = np.where(live, price, np.nan)
+    dv01 = np.where(live, price - price_up, np.nan)
+
+    return HorizonGrid(
+        settlement_dates, annual_yield, apply_precision(price, precision), apply_precision(dv01, precision)
+    )
+
+
+def calculate_fixed_coupon_horizon(
+    annual_coupon_rate,
+    maturity_date,
+    settlement_dates,
+    nominal_redemption_yield=None,
+    zero_curve: Optional[list[tuple[int, float]]] = None,
+    curve_mode: CurveMode = "rolldown",
+    precision: Optional[PrecisionMode] = None,
+) -> HorizonGrid:
+    """
+    Price conventional gilts per £100 nominal across a vector of settlement dates.
+
+    Prices follow :func:`~fift_analytics.gilts.fixed_coupon.dmo_fixed_pricers.calculate_fixed_coupon_gilt_price_dmo`.
+    Each gilt's quasi-coupon schedule and ex-dividend dates are built once and every settlement date
+    is located in them by lookup.
+
+    :param annual_coupon_rate: Annual coupon rates (decimal), one per gilt.
+    :param maturity_date: Maturity dates, one per gilt.
+    :param settlement_dates: Settlement dates of the horizon.
+    :param nominal_redemption_yield: Nominal redemption yields, one per gilt, held constant across dates.
+    :param zero_curve: Zero curve as a list of (maturity_in_months, annual_yield), used instead of
+                       ``nominal_redemption_yield``.
+    :param curve_mode: "rolldown" to hold the curve static, "forward" to use implied forward yields.
+    :param precision: "reporting" to round to the nearest penny, "raw" for full float64.
+                      Defaults to the current :func:`~fift_analytics.gilts.precision.precision_mode`.
+    :raises ValueError: If both or neither of ``nominal_redemption_yield`` and ``zero_curve`` are given.
+    :return: Dirty price and DV01 grids of shape ``(n_dates, n_gilts)``.
+    :rtype: HorizonGrid
+
+    :Example:
+        >>> grid = calculate_fixed_coupon_horizon(
+        ...     [0.04], ["2030-03-07"], ["2025-03-07", "2025-09-07"], nominal_redemption_yield=[0.04]
+        ... )
+        >>> grid.price
+        array([[100.],
+               [100.]])
+    """
+    settlement_dates = _settlement_grid(settlement_dates)
+    maturity_date = to_datetime64(maturity_date).reshape(-1)
+    c = 100 * np.asarray(annual_coupon_rate, dtype=np.float64)
+    settlement = settlement_dates[:, None]
+    f = 2
+
+    annual_yield = _horizon_yields(settlement, maturity_date, nominal_redemption_yield, zero_curve, curve_mode)
+
+    schedule = build_coupon_schedule(maturity_date, settlement_dates.min(), f)
+    position = locate_in_schedule(schedule, settlement)
+    live = position.in_schedule & (settlement < maturity_date)
+
+    r = (position.next_date - settlement).astype(np.int64)
+    s = (position.next_date - position.prior_date).astype(np.int64)
+    n = np.maximum(position.n_periods, 0)
+    d1 = np.where(settlement >= position.ex_dividend_date, 0.0, c / f)
+
+    price = _dmo_dirty_price(c, annual_yield, r, s, n, d1, f)
+    price_up = _dmo_dirty_price(c, annual_yield + ONE_BASIS_POINT, r, s, n, d1, f)
+    price = np.where(live, price, np.nan)
+    dv01 = np.where(live, price - price_up, np.nan)
+
+    return HorizonGrid(
+        settlement_dates, annual_yield, apply_precision(price, precision), apply_precision(dv01, precision)
+    )
@@ -0,0 +1,140 @@
+"""
+Precision Policy
+================
+
+Controls whether pricing kernels round their results to the penny or return full float64.
+
+- "reporting" (default): results are rounded to the nearest penny, as quoted in the market.
+- "raw": results are returned unrounded, as needed for finite-difference risk and P&L explain.
+  Rounding is then applied once, at the reporting boundary, with :func:`round_for_reporting`.
+
+Batch kernels can also store their results as float32 through :func:`cast_output`, halving the memory
+of large result arrays; all the computation and any aggregation stays in float64.
+
+The policy can be set per call through the ``precision`` argument of the pricers, or for a block
+of code with the :func:`precision_mode` context manager. The context is stored in a
+:class:`contextvars.ContextVar`, so it is local to the current thread or asyncio task.
+
+:Example:
+    >>> from fift_analytics.gilts.zero_coupon.zc_pricers import compute_continuous_price
+    >>> compute_continuous_price(1000, 0.03, 10)
+    740.82
+    >>> with precision_mode("raw"):
+    ...     compute_continuous_price(1000, 0.03, 10)
+    740.8182206817179
+
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Literal, Optional
+
+import numpy as np
+
+PrecisionMode = Literal["reporting", "raw"]
+
+OutputDType = Literal["float32", "float64"]
+
+REPORTING_DECIMALS = 2
+
+_precision_mode: ContextVar[PrecisionMode] = ContextVar("fift_analytics_precision_mode", default="reporting")
+
+
+def get_precision_mode(precision: Optional[PrecisionMode] = None) -> PrecisionMode:
+    """
+    Resolve the precision mode, giving priority to the per call value over the current context.
+
+    :param precision: Per call precision mode, or None to use the current context.
+    :raises ValueError: If the precision mode is not supported.
+    :return: The precision mode in force.
+    :rtype: PrecisionMode
+    """
+    if precision is None:
+        return _precision_mode.get()
+    if precision not in ("reporting", "raw"):
+        raise ValueError("Unsupported precision mode. Use 'reporting' or 'raw'.")
+    return precision
+
+
+@contextmanager
+def precision_mode(precision: PrecisionMode) -> Iterator[None]:
+    """
+    Set the precision mode for the pricers called within the context.
+
+    :param precision: "reporting" or "raw".
+    :raises ValueError: If the precision mode is not supported.
+    """
+    token = _precision_mode.set(get_precision_mode(precision))
+    try:
+        yield
+    finally:
+        _precision_mode.reset(token)
+
+
+def round_for_reporting(values, n_decimals: int = REPORTING_DECIMALS):
+    """
+    Round results at the reporting boundary, in one vectorised pass over the whole array.
+
+    :param values: Scalar or array of results.
+    :param n_decimals: Number of decimals (default is 2, the nearest penny).
+    :return: Rounded results, as a float for scalar inputs or an array otherwise.
+    """
+    if np.ndim(values) == 0:
+        return round(float(values), n_decimals)
+    return np.round(values, n_decimals)
+
+
+def apply_precision(values, precision: Optional[PrecisionMode] = None, n_decimals: int = REPORTING_DECIMALS):
+    """
+    Apply the precision policy to kernel results.
+
+    :param values: Scalar or array of unrounded results.
+    :param precision: Per call precision mode, or None to use the current context.
+    :param n_decimals: Number of decimals used in "reporting" mode.
+    :return: Unrounded results in "raw" mode, rounded results in "reporting" mode.
+    """
+    if get_precision_mode(precision) == "raw":
+        return float(values) if np.ndim(values) == 0 else values
+    return round_for_reporting(values, n_decimals)
+
+
+def get_output_dtype(dtype: OutputDType = "float64") -> np.dtype:
+    """
+    Validate an output dtype name.
+
+    :param dtype: "float64" (default) or "float32".
+    :raises ValueError: If the dtype is not supported.
+    :return: The NumPy dtype.
+    :rtype: np.dtype
+    """
+    if dtype not in ("float32", "float64"):
+        raise ValueError("Unsupported output dtype. Use 'float32' or 'float64'.")
+    return np.dtype(dtype)
+
+
+def cast_output(values, dtype: OutputDType = "float64", out=None) -> np.ndarray:
+    """
+    Cast float64 kernel results to the requested output dtype, or write them into a caller-supplied buffer.
+
+    :param values: Scalar or array of float64 results.
+    :param dtype: "float64" (default) or "float32" to halve the memory of the results.
+    :param out: Optional writable float32 or float64 buffer (NumPy array, memoryview, ...) receiving
+                the results; its dtype takes precedence over ``dtype``.
+    :raises ValueError: If the dtype is not supported, or ``out`` is read-only or has the wrong shape.
+    :return: Results with the requested dtype (no copy for float64), scalars stay scalars.
+             With ``out``, an array viewing the caller's buffer.
+    :rtype: np.ndarray
+    """
+    if out is not None:
+        out = np.asarray(out)
+        get_output_dtype(out.dtype.name)
+        if not out.flags.writeable:
+            raise ValueError("Output buffer must be writable.")
+        if out.shape != np.shape(values):
+            raise ValueError("Output buffer shape must match the shape of the results.")
+        np.copyto(out, values, casting="same_kind")
+        return out
+
+    output_dtype = get_output_dtype(dtype)
+    if np.ndim(values) == 0:
+        return output_dtype.type(values) if output_dtype != np.float64 else values
+    return np.asarray(values).astype(output_dtype, copy=False)
@@ -0,0 +1,255 @@
+"""
+Result Store
+============
+
+Content-addressed, persistent store of pricing and risk results, so that end-of-day reruns and
+restarts only compute what changed.
+
+Every result row is keyed by a 16 byte BLAKE2b digest of:
+
+- the function (module and qualified name), its non-row options and the precision mode in force,
+- the curve version the inputs were taken from,
+- the ``fift_analytics`` library version,
+- the row's instrument parameters.
+
+Dates (``*_date`` parameters, ``datetime64`` values and strings) are normalised to day ordinals and numbers to
+float64, in the rows and in the options, so a date given as a string or as ``datetime64`` hashes the same. Array
+options are hashed in full, with their dtype and shape, and a
+:class:`~fift_analytics.gilts.fixed_coupon.discount_factors.DiscountFactorTable` by its bond curve. Other objects
+are rejected, as their ``repr`` (e.g. with a memory address) would change the keys from one run to the next.
+
+Results are appended to one compact binary file per function (16 byte key + float64 value per row)
+and looked up in bulk with a sorted index and a single ``searchsorted``. Index loads and appends are
+lock-protected, so one store can be shared by threads.
+
+Hashing is the one per-row Python step: :meth:`ResultStore.make_keys` makes one keyed BLAKE2b call per row,
+a few microseconds each. That is small next to curve or scenario pricing, but of the order of a closed-form
+batch pricer itself, so the store pays off when the cached function is expensive or most rows are unchanged.
+
+:Example:
+    >>> import tempfile
+    >>> from fift_analytics.gilts.zero_coupon.zc_pricers import get_zero_coupon_gilt_price_batch
+    >>> store = ResultStore(tempfile.mkdtemp())
+    >>> store.evaluate(
+    ...     get_zero_coupon_gilt_price_batch,
+    ...     columns={"face_value": [1000, 1000], "annual_yield": [0.03, -0.01], "maturity_date": "2035-02-17",
+    ...              "settlement_date": "2025-02-17"},
+    ...     curve_version="2025-02-14",
+    ... )
+    array([ 740.7 , 1105.23])
+
+"""
+import hashlib
+import os
+import threading
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Callable, Mapping, Optional
+
+import numpy as np
+
+from fift_analytics import __version__
+from fift_analytics.gilts.fixed_coupon.discount_factors import DiscountFactorTable
+from fift_analytics.gilts.precision import get_precision_mode
+from fift_analytics.gilts.uk_calendar import to_datetime64
+
+KEY_DTYPE = np.dtype("S16")
+RECORD_DTYPE = np.dtype([("key", KEY_DTYPE), ("value", "<f8")])
+
+
+def _is_date(name: str, array: np.ndarray) -> bool:
+    return name.endswith("_date") or array.dtype.kind == "M"
+
+
+def _column_bytes(name: str, column) -> np.ndarray:
+    """
+    Normalise a column to float64 or day ordinals and view it as bytes, one row of 8 bytes per value.
+    """
+    column = np.asarray(column)
+    if _is_date(name, column) or column.dtype.kind in "USO":
+        column = to_datetime64(column).astype(np.int64)
+    else:
+        column = column.astype(np.float64)
+    return np.ascontiguousarray(column).reshape(-1, 1).view(np.uint8)
+
+
+def _option_bytes(name: str, value) -> bytes:
+    """
+    Canonical serialisation of a non-row option: whole arrays (never a truncated repr), dates as day ordinals
+    and numbers as float64, so that equal options give equal bytes whatever their Python type.
+    """
+    if value is None:
+        return b"none"
+    if isinstance(value, DiscountFactorTable):
+        # priced the same as its bond curve
+        value = value.bond_curve
+    if isinstance(value, (str, bytes)) and not name.endswith("_date"):
+        return b"str:" + (value.encode() if isinstance(value, str) else value)
+    array = np.asarray(value)
+    if array.dtype.kind == "O":
+        raise TypeError(f"Option '{name}' cannot be hashed. Use numbers, dates, strings, arrays or curves.")
+    if _is_date(name, array):
+        array = to_datetime64(array).astype(np.int64)
+    elif array.dtype.kind in "biuf":
+        array = array.astype(np.float64)
+    return f"{array.dtype.str}{array.shape}:".encode() + np.ascontiguousarray(array).tobytes()
+
+
+def installed_version() -> str:
+    """
+    Version of the installed ``fift_analytics`` distribution, so that every release gets new keys.
+
+    :return: Distribution version, or ``fift_analytics.__version__`` when running from a source tree.
+    :rtype: str
+    """
+    try:
+        return version("fift_analytics")
+    except PackageNotFoundError:
+        return __version__
+
+
+def _namespace_key(*parts: bytes) -> bytes:
+    """
+    32 byte digest of length-prefixed parts, so that no two different part lists hash the same bytes.
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    for part in parts:
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    return digest.digest()
+
+
+class ResultStore:
+    """
+    Persistent result store keyed by a hash of function, parameters, curve version and library version.
+
+    :param path: Directory holding the binary result files (created if missing).
+    :type path: str
+    :param library_version: Library version mixed into every key, defaults to :func:`installed_version`.
+    :type library_version: str
+    """
+
+    def __init__(self, path: str, library_version: Optional[str] = None) -> None:
+        self.path = path
+        self.library_version = installed_version() if library_version is None else library_version
+        self._index: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.RLock()
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, function_name: str) -> str:
+        return os.path.join(self.path, f"{function_name}.bin")
+
+    def make_keys(
+        self,
+        function_name: str,
+        columns: Mapping[str, Any],
+        curve_version: str = "",
+        options: Optional[Mapping[str, Any]] = None,
+    ) -> np.ndarray:
+        """
+        Hash rows of instrument parameters into 16 byte keys.
+
+        The rows are normalised to bytes in bulk, then hashed with one BLAKE2b call per row (a few microseconds
+        each).
+
+        :param function_name: Name of the function producing the results.
+        :param columns: Row parameters by name, broadcast against each other.
+        :param curve_version: Version of the curve or market data the parameters come from.
+        :param options: Non-row options of the function, hashed into every key.
+        :return: One key per row, with the broadcast shape of the columns.
+        :rtype: np.ndarray
+        """
+        namespace = [function_name, curve_version, self.library_version, get_precision_mode()]
+        option_parts = []
+        for name, value in sorted((options or {}).items()):
+            option_parts += [name.encode(), _option_bytes(name, value)]
+        namespace_key = _namespace_key(*(part.encode() for part in namespace), *option_parts)
+
+        names = sorted(columns)
+        arrays = np.broadcast_arrays(*(np.asarray(columns[name]) for name in names))
+        shape = arrays[0].shape if arrays else ()
+        rows = (
+            np.hstack([_column_bytes(name, array) for name, array in zip(names, arrays)])
+            if arrays
+            else np.zeros((1, 0), np.uint8)
+        )
+
+        keys = [hashlib.blake2b(row.tobytes(), digest_size=16, key=namespace_key).digest() for row in rows]
+        return np.array(keys, dtype=KEY_DTYPE).reshape(shape)
+
+    def _load(self, function_name: str) -> tuple[np.ndarray, np.ndarray]:
+        with self._lock:
+            if function_name not in self._index:
+                path = self._file(function_name)
+                records = np.fromfile(path, dtype=RECORD_DTYPE) if os.path.exists(path) else np.empty(0, RECORD_DTYPE)
+                # keep the latest value written for each key
+                keys, first = np.unique(records["key"][::-1], return_index=True)
+                self._index[function_name] = (keys, records["value"][::-1][first])
+            return self._index[function_name]
+
+    def get_many(self, function_name: str, keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Look up many keys at once.
+
+        :param function_name: Name of the function producing the results.
+        :param keys: Keys from :meth:`make_keys`.
+        :return: Values (NaN where missing) and a mask of the keys found.
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        stored_keys, stored_values = self._load(function_name)
+        keys = np.asarray(keys, dtype=KEY_DTYPE)
+        position = np.minimum(np.searchsorted(stored_keys, keys), max(stored_keys.size - 1, 0))
+        found = stored_keys[position] == keys if stored_keys.size else np.zeros(keys.shape, dtype=bool)
+        values = np.where(found, stored_values[position] if stored_keys.size else np.nan, np.nan)
+        return values, found
+
+    def put_many(self, function_name: str, keys: np.ndarray, values) -> None:
+        """
+        Append results to the store.
+
+        :param function_name: Name of the function producing the results.
+        :param keys: Keys from :meth:`make_keys`.
+        :param values: Result values, one per key.
+        """
+        records = np.empty(np.size(keys), dtype=RECORD_DTYPE)
+        records["key"] = np.asarray(keys, dtype=KEY_DTYPE).reshape(-1)
+        records["value"] = np.asarray(values, dtype=np.float64).reshape(-1)
+        with self._lock:
+            with open(self._file(function_name), "ab") as f:
+                records.tofile(f)
+            self._index.pop(function_name, None)
+
+    def evaluate(
+        self,
+        function: Callable[..., np.ndarray],
+        columns: Mapping[str, Any],
+        curve_version: str = "",
+        options: Optional[Mapping[str, Any]] = None,
+    ) -> np.ndarray:
+        """
+        Evaluate an element-wise batch function, computing only the rows missing from the store.
+
+        :param function: Batch function such as ``get_zero_coupon_gilt_price_batch`` returning one value per row.
+        :param columns: Row parameters passed to ``function`` by keyword, broadcast against each other.
+        :param curve_version: Version of the curve or market data the parameters come from.
+        :param options: Other keyword arguments of ``function``, identical for every row.
+        :raises ValueError: If ``options`` asks for ``errors="mask"``: only plain values are stored.
+        :return: Results for every row, with the broadcast shape of the columns.
+        :rtype: np.ndarray
+        """
+        options = dict(options or {})
+        if options.get("errors", "raise") != "raise":
+            raise ValueError("Result store only caches plain values. Use errors='raise'.")
+        function_name = f"{function.__module__}.{function.__qualname__}"
+        names = list(columns)
+        arrays = dict(zip(names, np.broadcast_arrays(*(np.asarray(columns[name]) for name in names))))
+
+        keys = self.make_keys(function_name, arrays, curve_version, options)
+        values, found = self.get_many(function_name, keys)
+
+        if not found.all():
+            missing = ~found
+            computed = function(**{name: array[missing] for name, array in arrays.items()}, **options)
+            values[missing] = computed
+            self.put_many(function_name, keys[missing], computed)
+
+        return values
@@ -0,0 +1,238 @@
+"""
+Row Errors
+==========
+
+Per-row validation for the batch APIs, so that one bad trade does not abort a whole batch.
+
+With ``errors="mask"`` the batch pricing and risk functions validate every row vectorially, price the
+valid rows only and return a :class:`MaskedResult` with the usual values (NaN for invalid rows), a
+validity mask and an error code per row. The error codes are the categories of the ``ValueError``
+raised by the scalar functions:
+
+============================================ ===========================================================
+Code                                         Message
+============================================ ===========================================================
+``RowError.VALID``                           (valid row)
+``RowError.NON_POSITIVE_FACE_VALUE``         Face value must be positive.
+``RowError.INVALID_DATE``                    Invalid date format. Dates must be in 'YYYY-MM-DD' format.
+``RowError.MATURITY_NOT_AFTER_SETTLEMENT``   Maturity date must be after the settlement date.
+``RowError.NEGATIVE_COUPON_RATE``            Annual coupon rate must be non-negative.
+``RowError.NON_FINITE_INPUT``                Inputs must be finite numbers.
+``RowError.CURVE_TOO_SHORT``                 Bond curve must have at least as many entries as the number
+                                             of periods until maturity.
+``RowError.NON_POSITIVE_PRICE``              Dirty price must be positive.
+``RowError.DATE_OUTSIDE_CALENDAR``           Dates must fall between 1970 and 2100.
+============================================ ===========================================================
+
+When a row fails several checks, the first one in the order of the scalar function is reported.
+
+:Example:
+    >>> from fift_analytics.gilts.zero_coupon.zc_pricers import get_zero_coupon_gilt_price_batch
+    >>> result = get_zero_coupon_gilt_price_batch(
+    ...     [1000, -5, 1000], 0.03, ["2035-02-17", "2035-02-17", "2035-02-30"], "2025-02-17", errors="mask"
+    ... )
+    >>> result.values
+    array([740.7,   nan,   nan])
+    >>> error_messages(result.error_code).tolist()
+    ['', 'Face value must be positive.', "Invalid date format. Dates must be in 'YYYY-MM-DD' format."]
+
+"""
+from enum import IntEnum
+from typing import Any, Callable, Literal, NamedTuple, Optional
+
+import numpy as np
+
+from fift_analytics.gilts.uk_calendar import get_uk_calendar, to_datetime64_masked
+
+ErrorPolicy = Literal["raise", "mask"]
+
+
+class RowError(IntEnum):
+    """
+    Error categories of a batch row.
+    """
+
+    VALID = 0
+    NON_POSITIVE_FACE_VALUE = 1
+    INVALID_DATE = 2
+    MATURITY_NOT_AFTER_SETTLEMENT = 3
+    NEGATIVE_COUPON_RATE = 4
+    NON_FINITE_INPUT = 5
+    CURVE_TOO_SHORT = 6
+    NON_POSITIVE_PRICE = 7
+    DATE_OUTSIDE_CALENDAR = 8
+
+
+ROW_ERROR_MESSAGES = {
+    RowError.VALID: "",
+    RowError.NON_POSITIVE_FACE_VALUE: "Face value must be positive.",
+    RowError.INVALID_DATE: "Invalid date format. Dates must be in 'YYYY-MM-DD' format.",
+    RowError.MATURITY_NOT_AFTER_SETTLEMENT: "Maturity date must be after the settlement date.",
+    RowError.NEGATIVE_COUPON_RATE: "Annual coupon rate must be non-negative.",
+    RowError.NON_FINITE_INPUT: "Inputs must be finite numbers.",
+    RowError.CURVE_TOO_SHORT: (
+        "Bond curve must have at least as many entries as the number of periods until maturity."
+    ),
+    RowError.NON_POSITIVE_PRICE: "Dirty price must be positive.",
+    RowError.DATE_OUTSIDE_CALENDAR: "Dates must fall between 1970 and 2100.",
+}
+
+
+class MaskedResult(NamedTuple):
+    """
+    Batch results with per-row validity.
+
+    :param values: Results in the usual return type of the batch function, NaN (NaT, False) for invalid rows.
+    :param valid: True for the rows that were priced.
+    :param error_code: :class:`RowError` code per row, 0 for valid rows.
+    """
+
+    values: Any
+    valid: np.ndarray
+    error_code: np.ndarray
+
+
+def error_messages(error_code) -> np.ndarray:
+    """
+    Map error codes to the messages of the scalar functions.
+
+    :param error_code: Array of :class:`RowError` codes.
+    :return: Message per row, empty for valid rows.
+    :rtype: np.ndarray
+    """
+    messages = np.array([ROW_ERROR_MESSAGES[code] for code in RowError], dtype=object)
+    return messages[np.asarray(error_code)]
+
+
+def check_policy(errors: ErrorPolicy) -> None:
+    """
+    Validate an error policy.
+
+    :param errors: "raise" or "mask".
+    :raises ValueError: If the policy is not supported.
+    """
+    if errors not in ("raise", "mask"):
+        raise ValueError("Unsupported error policy. Use 'raise' or 'mask'.")
+
+
+def flag_rows(*checks: tuple[np.ndarray, RowError]) -> np.ndarray:
+    """
+    Combine failed-row masks into error codes, the first failed check of each row winning.
+
+    :param checks: Pairs of (mask of failed rows, error code), in order of precedence.
+    :return: Error code per row, with the broadcast shape of the masks.
+    :rtype: np.ndarray
+    """
+    shape = np.broadcast_shapes(*(np.shape(failed) for failed, _ in checks))
+    error_code = np.zeros(shape, dtype=np.int8)
+    for failed, code in checks:
+        error_code = np.where((error_code == 0) & failed, np.int8(code), error_code)
+    return error_code
+
+
+class BondRows(NamedTuple):
+    """
+    Converted dates and error codes of a batch of bonds.
+
+    :param settlement_date: Settlement dates as ``datetime64[D]``, NaT where invalid.
+    :param maturity_date: Maturity dates as ``datetime64[D]``, NaT where invalid.
+    :param error_code: Error code per row.
+    """
+
+    settlement_date: np.ndarray
+    maturity_date: np.ndarray
+    error_code: np.ndarray
+
+
+def validate_bond_rows(
+    settlement_date,
+    maturity_date,
+    face_value=None,
+    annual_coupon_rate=None,
+    numbers=(),
+    business_days_before: Optional[int] = None,
+) -> BondRows:
+    """
+    Validate the common inputs of a batch of bonds, row by row.
+
+    Checks, in order: positive face value, date format, non-negative coupon rate, maturity after settlement,
+    finite numbers and, for the functions looking dates up in the UK calendar, dates within it.
+
+    :param settlement_date: Settlement dates.
+    :param maturity_date: Maturity dates.
+    :param face_value: Optional face values, float64.
+    :param annual_coupon_rate: Optional annual coupon rates, float64.
+    :param numbers: Other float64 inputs which must be finite (e.g. yields).
+    :param business_days_before: If given, flag the rows whose dates fall outside the UK calendar, settlement
+                                 dates needing this many business days of it before them (e.g. to count
+                                 back from the next coupon to its ex-dividend date).
+    :return: Converted dates and error codes, broadcast against each other.
+    :rtype: BondRows
+    """
+    settlement_date, settlement_ok = to_datetime64_masked(settlement_date)
+    maturity_date, maturity_ok = to_datetime64_masked(maturity_date)
+    face_value = np.float64(1.0) if face_value is None else face_value
+    annual_coupon_rate = np.float64(0.0) if annual_coupon_rate is None else annual_coupon_rate
+    finite = np.isfinite(face_value) & np.isfinite(annual_coupon_rate)
+    for number in numbers:
+        finite = finite & np.isfinite(number)
+
+    error_code = flag_rows(
+        (face_value <= 0, RowError.NON_POSITIVE_FACE_VALUE),
+        (~(settlement_ok & maturity_ok), RowError.INVALID_DATE),
+        (annual_coupon_rate < 0, RowError.NEGATIVE_COUPON_RATE),
+        (maturity_date <= settlement_date, RowError.MATURITY_NOT_AFTER_SETTLEMENT),
+        (~finite, RowError.NON_FINITE_INPUT),
+        (~_in_calendar(settlement_date, maturity_date, business_days_before), RowError.DATE_OUTSIDE_CALENDAR),
+    )
+    return BondRows(settlement_date, maturity_date, error_code)
+
+
+def _in_calendar(settlement_date: np.ndarray, maturity_date: np.ndarray, business_days_before: Optional[int]):
+    if business_days_before is None:
+        return np.True_
+    calendar = get_uk_calendar()
+    return calendar.covers(settlement_date, business_days_before) & calendar.covers(maturity_date)
+
+
+def _fill_invalid(valid_values, valid: np.ndarray, out=None) -> np.ndarray:
+    """
+    Scatter the results of the valid rows into a full array, filling invalid rows by dtype.
+    """
+    valid_values = np.asarray(valid_values)
+    if out is None:
+        fill = {"M": np.datetime64("NaT"), "b": False, "i": 0}.get(valid_values.dtype.kind, np.nan)
+        out = np.full(valid.shape, fill, dtype=valid_values.dtype)
+    else:
+        out[...] = np.nan
+    out[valid] = valid_values
+    return out
+
+
+def evaluate_valid_rows(
+    function: Callable[..., Any],
+    error_code: np.ndarray,
+    columns: dict[str, np.ndarray],
+    out=None,
+    **options,
+) -> MaskedResult:
+    """
+    Evaluate a batch function on the valid rows only and scatter the results back.
+
+    :param function: Batch function, called with the valid rows of ``columns`` and ``options``.
+    :param error_code: Error code per row, from :func:`flag_rows`.
+    :param columns: Row parameters, already converted and broadcast to the shape of ``error_code``.
+    :param out: Optional writable buffer receiving the values (arrays only).
+    :param options: Other keyword arguments of ``function``.
+    :return: Values, validity mask and error codes.
+    :rtype: MaskedResult
+    """
+    valid = error_code == 0
+    valid_columns = {name: np.broadcast_to(column, valid.shape)[valid] for name, column in columns.items()}
+    result = function(**valid_columns, **options)
+
+    if isinstance(result, tuple):
+        values = type(result)(*(_fill_invalid(field, valid) for field in result))
+    else:
+        values = _fill_invalid(result, valid, None if out is None else np.asarray(out))
+    return MaskedResult(values, valid, error_code)
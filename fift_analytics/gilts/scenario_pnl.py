@@ -0,0 +1,238 @@
+"""
+Scenario P&L
+============
+
+Full revaluation P&L of a book of gilts under many yield scenarios, returned as an
+``(n_scenarios, n_bonds)`` cube.
+
+Per-bond inputs (time to maturity, quasi-coupon position, ex-dividend status and base price) are
+computed once; each block of ``chunk_size`` scenarios is then repriced in float64 and written into a
+preallocated cube of the requested output dtype. Without an explicit ``chunk_size`` the blocks are sized to the
+:func:`~fift_analytics.gilts.execution.execution_policy` in force.
+
+Output dtype and accuracy
+-------------------------
+
+``dtype="float32"`` halves the memory of the cube, which dominates for large books and scenario sets.
+Pricing is always done in float64 and only the stored P&L is rounded to float32, so each cell
+carries a relative error of at most ``2**-24`` (about 6e-8) against the float64 result, and
+against the scalar reference functions
+:func:`~fift_analytics.gilts.zero_coupon.zc_pricers.get_zero_coupon_gilt_price` and
+:func:`~fift_analytics.gilts.fixed_coupon.dmo_fixed_pricers.calculate_fixed_coupon_gilt_price_dmo`
+called with ``precision="raw"``. For a £100m position moving by £1m this is around 6p, so float32
+cubes are suitable for risk and VaR but not for penny-exact settlement amounts.
+
+:func:`aggregate_scenario_pnl` always accumulates in float64, so summing a float32 cube adds no
+further error beyond the storage rounding of each cell.
+
+:Example:
+    >>> pnl = calculate_zero_coupon_scenario_pnl(
+    ...     [1_000_000], [0.04], ["2035-02-17"], "2025-02-17", [-0.01, 0.01], dtype="float32"
+    ... )
+    >>> pnl.dtype
+    dtype('float32')
+    >>> aggregate_scenario_pnl(pnl).round(2)
+    array([ 70523.31, -63808.63])
+
+"""
+from typing import Optional
+
+import numpy as np
+
+from fift_analytics.gilts.day_count import year_fraction
+from fift_analytics.gilts.execution import allocation_stage, estimate_row_bytes, resolve_chunk_rows
+from fift_analytics.gilts.fixed_coupon.dmo_fixed_pricers import _dmo_dirty_price
+from fift_analytics.gilts.fixed_coupon.quasi_coupon import get_ex_dividend_dates, get_quasi_coupon_dates
+from fift_analytics.gilts.precision import OutputDType, get_output_dtype
+from fift_analytics.gilts.uk_calendar import to_datetime64
+
+DEFAULT_SCENARIO_CHUNK_SIZE = 1024
+
+
+def _scenario_shocks(yield_shocks, n_bonds: int) -> np.ndarray:
+    """
+    Yield shocks as a float64 ``(n_scenarios, n_bonds)`` array, from parallel shifts or per-bond shocks.
+    """
+    yield_shocks = np.asarray(yield_shocks, dtype=np.float64)
+    if yield_shocks.ndim == 1:
+        yield_shocks = yield_shocks[:, None]
+    if yield_shocks.ndim != 2 or yield_shocks.shape[1] not in (1, n_bonds):
+        raise ValueError("Yield shocks must have shape (n_scenarios,) or (n_scenarios, n_bonds).")
+    return yield_shocks
+
+
+def _fill_cube(
+    repricer, yield_shocks: np.ndarray, n_bonds: int, dtype: OutputDType, chunk_size: Optional[int], out=None
+) -> np.ndarray:
+    """
+    Evaluate ``repricer`` on blocks of scenarios in float64 and store the P&L in the output dtype,
+    or directly in the caller's ``out`` buffer.
+    """
+    shape = (yield_shocks.shape[0], n_bonds)
+    if out is None:
+        pnl = np.empty(shape, dtype=get_output_dtype(dtype))
+    else:
+        pnl = np.asarray(out)
+        get_output_dtype(pnl.dtype.name)
+        if not pnl.flags.writeable or pnl.shape != shape:
+            raise ValueError("Output buffer must be writable with shape (n_scenarios, n_bonds).")
+
+    row_bytes = n_bonds * estimate_row_bytes({"yield_shock": yield_shocks}, dtype=pnl.dtype.name)
+    chunk_size = resolve_chunk_rows(chunk_size, row_bytes, shape[0], default=DEFAULT_SCENARIO_CHUNK_SIZE)
+    with allocation_stage("scenario_pnl"):
+        for start in range(0, yield_shocks.shape[0], chunk_size):
+            pnl[start:start + chunk_size] = repricer(yield_shocks[start:start + chunk_size])
+    return pnl
+
+
+def calculate_zero_coupon_scenario_pnl(
+    face_value,
+    annual_yield,
+    maturity_date,
+    settlement_date,
+    yield_shocks,
+    dtype: OutputDType = "float64",
+    chunk_size: Optional[int] = None,
+    out=None,
+) -> np.ndarray:
+    """
+    Full revaluation P&L of zero-coupon gilt positions under yield scenarios.
+
+    Prices follow :func:`~fift_analytics.gilts.zero_coupon.zc_pricers.get_zero_coupon_gilt_price`
+    (continuous compounding, Actual/Actual, face value within 3 days of maturity).
+
+    :param face_value: Face value held in each bond.
+    :param annual_yield: Current annual yields, one per bond.
+    :param maturity_date: Maturity dates, one per bond.
+    :param settlement_date: Settlement date(s), broadcast against the bonds.
+    :param yield_shocks: Yield changes (decimal), shape ``(n_scenarios,)`` for parallel shifts or
+                         ``(n_scenarios, n_bonds)``.
+    :param dtype: Output dtype, "float64" (default) or "float32". Pricing is in float64 either way.
+    :param chunk_size: Number of scenarios repriced per block. Defaults to the block fitting the
+                       :func:`~fift_analytics.gilts.execution.execution_policy` in force, or
+                       ``DEFAULT_SCENARIO_CHUNK_SIZE`` outside one.
+    :param out: Optional writable float32 or float64 buffer of shape ``(n_scenarios, n_bonds)`` receiving the P&L.
+    :raises ValueError: If any maturity date is not after the settlement date or the shapes do not match.
+    :return: P&L cube of shape ``(n_scenarios, n_bonds)``.
+    :rtype: np.ndarray
+    """
+    maturity_date = to_datetime64(maturity_date).reshape(-1)
+    settlement_date, maturity_date = np.broadcast_arrays(to_datetime64(settlement_date), maturity_date)
+    face_value, annual_yield = np.broadcast_arrays(
+        np.asarray(face_value, dtype=np.float64), np.asarray(annual_yield, dtype=np.float64)
+    )
+    n_bonds = maturity_date.shape[-1]
+
+    if np.any(maturity_date <= settlement_date):
+        raise ValueError("Maturity date must be after the settlement date.")
+
+    days_to_maturity = (maturity_date - settlement_date).astype(np.int64)
+    time_to_maturity = np.where(days_to_maturity < 3, 0.0, year_fraction(settlement_date, maturity_date))
+    base_price = face_value * np.exp(-annual_yield * time_to_maturity)
+
+    def repricer(shocks: np.ndarray) -> np.ndarray:
+        return base_price * np.expm1(-shocks * time_to_maturity)
+
+    return _fill_cube(repricer, _scenario_shocks(yield_shocks, n_bonds), n_bonds, dtype, chunk_size, out)
+
+
+def calculate_fixed_coupon_scenario_pnl(
+    annual_coupon_rate,
+    nominal,
+    settlement_date,
+    maturity_date,
+    nominal_redemption_yield,
+    yield_shocks,
+    dtype: OutputDType = "float64",
+    chunk_size: Optional[int] = None,
+    out=None,
+) -> np.ndarray:
+    """
+    Full revaluation P&L of conventional gilt positions under yield scenarios.
+
+    Dirty prices follow
+    :func:`~fift_analytics.gilts.fixed_coupon.dmo_fixed_pricers.calculate_fixed_coupon_gilt_price_dmo`;
+    the quasi-coupon dates and ex-dividend status of each gilt are located once for all scenarios.
+
+    :param annual_coupon_rate: Annual coupon rates (decimal), one per gilt.
+    :param nominal: Nominal held in each gilt.
+    :param settlement_date: Settlement date(s), broadcast against the gilts.
+    :param maturity_date: Maturity dates, one per gilt.
+    :param nominal_redemption_yield: Current nominal redemption yields, one per gilt.
+    :param yield_shocks: Yield changes (decimal), shape ``(n_scenarios,)`` for parallel shifts or
+                         ``(n_scenarios, n_gilts)``.
+    :param dtype: Output dtype, "float64" (default) or "float32". Pricing is in float64 either way.
+    :param chunk_size: Number of scenarios repriced per block. Defaults to the block fitting the
+                       :func:`~fift_analytics.gilts.execution.execution_policy` in force, or
+                       ``DEFAULT_SCENARIO_CHUNK_SIZE`` outside one.
+    :param out: Optional writable float32 or float64 buffer of shape ``(n_scenarios, n_bonds)`` receiving the P&L.
+    :raises ValueError: If any settlement date is not before its maturity date or the shapes do not match.
+    :return: P&L cube of shape ``(n_scenarios, n_gilts)``.
+    :rtype: np.ndarray
+
+    :Example:
+        >>> calculate_fixed_coupon_scenario_pnl(
+        ...     [0.04], [1_000_000], "2025-03-07", ["2030-03-07"], [0.04], [0.0, 0.0001]
+        ... ).round(2)
+        array([[   0.  ],
+               [-449.01]])
+    """
+    maturity_date = to_datetime64(maturity_date).reshape(-1)
+    settlement_date, maturity_date = np.broadcast_arrays(to_datetime64(settlement_date), maturity_date)
+    c, units, y = np.broadcast_arrays(
+        100 * np.asarray(annual_coupon_rate, dtype=np.float64),
+        np.asarray(nominal, dtype=np.float64) / 100,
+        np.asarray(nominal_redemption_yield, dtype=np.float64),
+    )
+    n_bonds = maturity_date.shape[-1]
+    f = 2
+
+    if np.any(settlement_date >= maturity_date):
+        raise ValueError("Settlement date must be before maturity date.")
+
+    prior_quasi_coupon_date, next_quasi_coupon_date, n = get_quasi_coupon_dates(settlement_date, maturity_date, f)
+    r = (next_quasi_coupon_date - settlement_date).astype(np.int64)
+    s = (next_quasi_coupon_date - prior_quasi_coupon_date).astype(np.int64)
+    d1 = np.where(settlement_date >= get_ex_dividend_dates(next_quasi_coupon_date), 0.0, c / f)
+    base_price = _dmo_dirty_price(c, y, r, s, n, d1, f)
+
+    def repricer(shocks: np.ndarray) -> np.ndarray:
+        return units * (_dmo_dirty_price(c, y + shocks, r, s, n, d1, f) - base_price)
+
+    return _fill_cube(repricer, _scenario_shocks(yield_shocks, n_bonds), n_bonds, dtype, chunk_size, out)
+
+
+def aggregate_scenario_pnl(
+    pnl,
+    groups=None,
+    chunk_size: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Aggregate a scenario P&L cube across bonds, accumulating in float64 whatever the cube's dtype.
+
+    :param pnl: P&L cube of shape ``(n_scenarios, n_bonds)``, float32 or float64.
+    :param groups: Optional group label per bond (e.g. book or sector). Without groups the whole book is summed.
+    :param chunk_size: Number of scenarios aggregated per block, defaulting as in the P&L cube.
+    :return: Float64 totals of shape ``(n_scenarios,)``, or ``(n_scenarios, n_groups)`` with one column
+             per label in ``np.unique(groups)`` order.
+    :rtype: np.ndarray
+
+    :Example:
+        >>> aggregate_scenario_pnl(np.ones((2, 3), dtype=np.float32), groups=["a", "b", "a"])
+        array([[2., 1.],
+               [2., 1.]])
+    """
+    pnl = np.asarray(pnl)
+    if groups is None:
+        return np.sum(pnl, axis=-1, dtype=np.float64)
+
+    labels, group_index = np.unique(np.asarray(groups), return_inverse=True)
+    membership = np.zeros((pnl.shape[-1], labels.size))
+    membership[np.arange(pnl.shape[-1]), group_index] = 1.0
+
+    totals = np.empty((pnl.shape[0], labels.size))
+    row_bytes = estimate_row_bytes({"pnl": pnl[:0]}, n_outputs=labels.size) * pnl.shape[-1]
+    chunk_size = resolve_chunk_rows(chunk_size, row_bytes, pnl.shape[0], default=DEFAULT_SCENARIO_CHUNK_SIZE)
+    for start in range(0, pnl.shape[0], chunk_size):
+        totals[start:start + chunk_size] = pnl[start:start + chunk_size].astype(np.float64) @ membership
+    return totals
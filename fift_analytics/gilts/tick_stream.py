@@ -0,0 +1,389 @@
+"""
+Tick Stream
+===========
+
+Real-time repricing of a gilt universe from a stream of yield ticks.
+
+Ticks are written into a latest-value-wins buffer holding one slot per instrument: a tick arriving before
+the previous one for the same instrument has been priced replaces it (and is counted as coalesced). The
+buffer is drained at a fixed cadence, only the instruments which ticked since the last drain are repriced,
+in one call to the batch kernels
+(:func:`~fift_analytics.gilts.fixed_coupon.dmo_fixed_pricers.calculate_fixed_coupon_gilt_price_dmo_batch`
+for conventional gilts and :func:`~fift_analytics.gilts.zero_coupon.zc_pricers.get_zero_coupon_gilt_price_batch`
+for zero-coupon gilts), and the prices are published to the subscribers as one :class:`PriceBatch`.
+
+So the cost of a drain depends on the number of instruments which changed, not on the tick rate, and a burst
+of ticks on one instrument costs a single repricing. Under an :func:`~fift_analytics.gilts.execution.execution_policy`
+a drain touching more instruments than fit the memory budget is repriced in chunks.
+
+Ticks are accepted from any thread. Ticks on unknown instruments, with a non-finite yield or older than the
+latest tick accepted for their instrument are dropped and counted. Tick-to-price latency is measured from the
+tick timestamp of each published price to its publication, over a sliding window of the latest prices.
+
+:Example:
+    >>> stream = TickStream("2025-03-07", ["UKT 4 2030", "UKT 4 2035"], [0.04, 0.04], ["2030-03-07", "2035-03-07"])
+    >>> published = []
+    >>> stream.subscribe(published.append)
+    >>> stream.on_tick("UKT 4 2030", 0.041)
+    >>> stream.on_tick("UKT 4 2030", 0.040)
+    >>> stream.drain()
+    1
+    >>> published[0].price
+    array([100.])
+    >>> stream.stats().coalesced
+    1
+
+"""
+import contextvars
+import threading
+import time
+from typing import Callable, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from fift_analytics.gilts.execution import allocation_stage, estimate_row_bytes, resolve_chunk_rows
+from fift_analytics.gilts.fixed_coupon.dmo_fixed_pricers import calculate_fixed_coupon_gilt_price_dmo_batch
+from fift_analytics.gilts.precision import PrecisionMode
+from fift_analytics.gilts.uk_calendar import to_datetime64
+from fift_analytics.gilts.zero_coupon.zc_pricers import get_zero_coupon_gilt_price_batch
+
+DEFAULT_CADENCE = 0.05
+
+DEFAULT_LATENCY_WINDOW = 100_000
+
+LATENCY_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class PriceBatch(NamedTuple):
+    """
+    Prices published by one drain, for the instruments which ticked since the previous drain.
+
+    :param instrument: Instrument identifiers.
+    :param annual_yield: Latest yield of each instrument.
+    :param price: Dirty price per £100 nominal, NaN where the instrument cannot be priced (e.g. matured).
+    :param valid: True for the instruments which were priced.
+    :param tick_time: Timestamp of the tick each price was computed from.
+    :param publish_time: Timestamp of the publication, on the same clock.
+    """
+
+    instrument: np.ndarray
+    annual_yield: np.ndarray
+    price: np.ndarray
+    valid: np.ndarray
+    tick_time: np.ndarray
+    publish_time: float
+
+
+class TickStats(NamedTuple):
+    """
+    Counters and latency of a tick stream.
+
+    :param received: Ticks received.
+    :param coalesced: Ticks replaced by a later tick on the same instrument before being priced.
+    :param dropped: Ticks rejected (unknown instrument, non-finite yield or older than the latest accepted tick).
+    :param priced: Prices published.
+    :param drains: Drains which published at least one price.
+    :param latency: Tick-to-price latency percentiles in seconds, by percentile, over the latest prices.
+    """
+
+    received: int
+    coalesced: int
+    dropped: int
+    priced: int
+    drains: int
+    latency: dict[float, float]
+
+
+class TickStream:
+    """
+    Coalescing yield tick buffer repricing a gilt universe at a fixed cadence.
+
+    :param settlement_date: Settlement date of the published prices.
+    :param instrument: Identifiers of the conventional gilts.
+    :param annual_coupon_rate: Annual coupon rates (decimal) of the conventional gilts.
+    :param maturity_date: Maturity dates of the conventional gilts.
+    :param zero_coupon_instrument: Identifiers of the zero-coupon gilts.
+    :param zero_coupon_maturity_date: Maturity dates of the zero-coupon gilts.
+    :param cadence: Seconds between drains when running in the background (see :meth:`start`).
+    :param precision: "reporting" to round prices to the nearest penny, "raw" for full float64.
+                      Defaults to the :func:`~fift_analytics.gilts.precision.precision_mode` of the drain.
+    :param latency_window: Number of latest prices the latency percentiles are computed over.
+    :param clock: Monotonic clock in seconds, used for the default tick timestamps and the publication times.
+    :raises ValueError: If the instrument arrays have mismatched lengths, an identifier is repeated,
+                        the cadence is not positive or a date is invalid.
+    """
+
+    def __init__(
+        self,
+        settlement_date,
+        instrument: Sequence = (),
+        annual_coupon_rate=(),
+        maturity_date=(),
+        zero_coupon_instrument: Sequence = (),
+        zero_coupon_maturity_date=(),
+        cadence: float = DEFAULT_CADENCE,
+        precision: Optional[PrecisionMode] = None,
+        latency_window: int = DEFAULT_LATENCY_WINDOW,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.settlement_date = to_datetime64(settlement_date)
+        self.annual_coupon_rate = np.asarray(annual_coupon_rate, dtype=np.float64).reshape(-1)
+        self.maturity_date = to_datetime64(maturity_date).reshape(-1)
+        self.zero_coupon_maturity_date = to_datetime64(zero_coupon_maturity_date).reshape(-1)
+        self.instrument = np.array(list(instrument) + list(zero_coupon_instrument), dtype=object)
+
+        n_fixed = self.annual_coupon_rate.size
+        if not (len(instrument) == n_fixed == self.maturity_date.size) or (
+            len(zero_coupon_instrument) != self.zero_coupon_maturity_date.size
+        ):
+            raise ValueError("Instruments, coupon rates and maturity dates must have matching lengths.")
+        if cadence <= 0:
+            raise ValueError("Cadence must be positive.")
+
+        self._index = {name: i for i, name in enumerate(self.instrument)}
+        if len(self._index) != self.instrument.size:
+            raise ValueError("Instrument identifiers must be unique.")
+
+        self.n_fixed = n_fixed
+        self.cadence = cadence
+        self.precision = precision
+        self.clock = clock
+
+        n_instruments = self.instrument.size
+        self._lock = threading.Lock()
+        self._pending = np.zeros(n_instruments, dtype=bool)
+        self._pending_yield = np.zeros(n_instruments)
+        self._pending_time = np.full(n_instruments, -np.inf)
+
+        self._latency = np.zeros(latency_window)
+        self._n_latency = 0
+        self._received = self._coalesced = self._dropped = self._priced = self._drains = 0
+
+        self._subscribers: list[Callable[[PriceBatch], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    def subscribe(self, callback: Callable[[PriceBatch], None]) -> None:
+        """
+        Register a callback receiving every :class:`PriceBatch`, on the draining thread.
+
+        :param callback: Function of one :class:`PriceBatch`.
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[PriceBatch], None]) -> None:
+        """
+        Remove a callback registered with :meth:`subscribe`.
+
+        :param callback: The registered function.
+        """
+        self._subscribers.remove(callback)
+
+    def on_tick(self, instrument, annual_yield: float, timestamp: Optional[float] = None) -> None:
+        """
+        Buffer one yield tick, replacing any tick of the same instrument not priced yet.
+
+        :param instrument: Instrument identifier.
+        :param annual_yield: Yield (decimal).
+        :param timestamp: Tick time on the stream clock, defaults to now.
+        """
+        timestamp = self.clock() if timestamp is None else timestamp
+        i = self._index.get(instrument)
+        with self._lock:
+            self._received += 1
+            if i is None or not np.isfinite(annual_yield) or timestamp < self._pending_time[i]:
+                self._dropped += 1
+                return
+            self._coalesced += int(self._pending[i])
+            self._pending[i] = True
+            self._pending_yield[i] = annual_yield
+            self._pending_time[i] = timestamp
+
+    def on_ticks(self, instrument, annual_yield, timestamp=None) -> None:
+        """
+        Buffer a batch of yield ticks as if each was passed to :meth:`on_tick` in arrival order: per instrument
+        the newest tick wins, and a tick older than one arrived before it is dropped.
+
+        :param instrument: Instrument identifiers.
+        :param annual_yield: Yields (decimal).
+        :param timestamp: Tick times on the stream clock, defaults to now for the whole batch.
+        """
+        instrument = np.asarray(instrument, dtype=object).reshape(-1)
+        annual_yield = np.broadcast_to(np.asarray(annual_yield, dtype=np.float64), instrument.shape)
+        now = self.clock() if timestamp is None else timestamp
+        timestamp = np.broadcast_to(np.asarray(now, dtype=np.float64), instrument.shape)
+
+        index = np.array([self._index.get(name, -1) for name in instrument], dtype=np.int64)
+        known = np.flatnonzero((index >= 0) & np.isfinite(annual_yield))
+        # known ticks by instrument, then arrival; a tick is newest so far when no earlier tick is newer
+        order = known[np.argsort(index[known], kind="stable")]
+        group = index[order]
+        _, time_rank = np.unique(timestamp[order], return_inverse=True)
+        key = group * (order.size + 1) + time_rank.reshape(-1)
+        previous = np.concatenate(([-1], np.maximum.accumulate(key)))[:-1]
+        newest_so_far = key >= previous
+
+        with self._lock:
+            accepted = order[newest_so_far & (timestamp[order] >= self._pending_time[group])]
+            accepted_index = index[accepted]
+            # the last accepted tick of each instrument is its newest
+            last = accepted_index != np.append(accepted_index[1:], -1)
+            latest, latest_index = accepted[last], accepted_index[last]
+
+            self._received += instrument.size
+            self._dropped += instrument.size - accepted.size
+            self._coalesced += accepted.size - latest.size + int(self._pending[latest_index].sum())
+            self._pending[latest_index] = True
+            self._pending_yield[latest_index] = annual_yield[latest]
+            self._pending_time[latest_index] = timestamp[latest]
+
+    def _take_pending(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        with self._lock:
+            changed = np.flatnonzero(self._pending)
+            self._pending[changed] = False
+            return changed, self._pending_yield[changed], self._pending_time[changed]
+
+    def _reprice(self, changed: np.ndarray, annual_yield: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Price the changed instruments in chunks fitting the
+        :func:`~fift_analytics.gilts.execution.execution_policy` in force (all at once outside a policy).
+        """
+        columns = {
+            "annual_coupon_rate": self.annual_coupon_rate,
+            "maturity_date": self.maturity_date,
+            "annual_yield": annual_yield,
+        }
+        row_bytes = estimate_row_bytes(columns, n_outputs=2)
+        rows = resolve_chunk_rows(None, row_bytes, changed.size, default=max(changed.size, 1))
+        price = np.empty(changed.size)
+        valid = np.empty(changed.size, dtype=bool)
+        with allocation_stage("tick_stream.reprice"):
+            for start in range(0, changed.size, rows):
+                chunk = slice(start, start + rows)
+                price[chunk], valid[chunk] = self._reprice_chunk(changed[chunk], annual_yield[chunk])
+        return price, valid
+
+    def _reprice_chunk(self, changed: np.ndarray, annual_yield: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Price the changed instruments with the batch kernels, conventional and zero-coupon gilts in one call each.
+        """
+        price = np.full(changed.size, np.nan)
+        valid = np.zeros(changed.size, dtype=bool)
+
+        fixed = changed < self.n_fixed
+        if fixed.any():
+            result = calculate_fixed_coupon_gilt_price_dmo_batch(
+                self.annual_coupon_rate[changed[fixed]],
+                self.settlement_date,
+                self.maturity_date[changed[fixed]],
+                annual_yield[fixed],
+                precision=self.precision,
+                errors="mask",
+            )
+            price[fixed], valid[fixed] = result.values, result.valid
+
+        if not fixed.all():
+            result = get_zero_coupon_gilt_price_batch(
+                100.0,
+                annual_yield[~fixed],
+                self.zero_coupon_maturity_date[changed[~fixed] - self.n_fixed],
+                self.settlement_date,
+                precision=self.precision,
+                errors="mask",
+            )
+            price[~fixed], valid[~fixed] = result.values, result.valid
+
+        return price, valid
+
+    def _record_latency(self, latency: np.ndarray) -> None:
+        window = self._latency.size
+        latency = latency[-window:]
+        slots = (self._n_latency + np.arange(latency.size)) % window
+        self._latency[slots] = latency
+        self._n_latency += latency.size
+
+    def drain(self) -> int:
+        """
+        Reprice the instruments which ticked since the previous drain and publish their prices.
+
+        :return: Number of prices published.
+        :rtype: int
+        """
+        changed, annual_yield, tick_time = self._take_pending()
+        if changed.size == 0:
+            return 0
+
+        price, valid = self._reprice(changed, annual_yield)
+        publish_time = self.clock()
+        batch = PriceBatch(self.instrument[changed], annual_yield, price, valid, tick_time, publish_time)
+        for callback in list(self._subscribers):
+            callback(batch)
+
+        with self._lock:
+            self._record_latency(publish_time - tick_time)
+            self._priced += changed.size
+            self._drains += 1
+        return changed.size
+
+    def stats(self, percentiles: Sequence[float] = LATENCY_PERCENTILES) -> TickStats:
+        """
+        Tick counters and tick-to-price latency percentiles.
+
+        :param percentiles: Latency percentiles to report, between 0 and 100.
+        :return: Counters and latency percentiles in seconds (NaN before the first price).
+        :rtype: TickStats
+        """
+        with self._lock:
+            latency = self._latency[: min(self._n_latency, self._latency.size)].copy()
+            counters = (self._received, self._coalesced, self._dropped, self._priced, self._drains)
+
+        if latency.size:
+            values = np.percentile(latency, percentiles)
+        else:
+            values = np.full(len(percentiles), np.nan)
+        return TickStats(*counters, dict(zip(percentiles, values.tolist())))
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.wait(self.cadence):
+                self.drain()
+        except BaseException as error:  # surfaced by stop()
+            self._error = error
+
+    def start(self) -> None:
+        """
+        Start draining every ``cadence`` seconds on a background thread, in a copy of the caller's context
+        (so the caller's :func:`~fift_analytics.gilts.precision.precision_mode` applies).
+
+        :raises ValueError: If the stream is already running.
+        """
+        if self._thread is not None:
+            raise ValueError("Tick stream is already running.")
+        self._stop.clear()
+        self._error = None
+        context = contextvars.copy_context()
+        self._thread = threading.Thread(target=context.run, args=(self._run,), name="fift-tick-stream", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background thread and publish the ticks still buffered.
+
+        :raises Exception: The exception raised by a drain (e.g. in a subscriber) on the background thread.
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+        self.drain()
+
+    def __enter__(self) -> "TickStream":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
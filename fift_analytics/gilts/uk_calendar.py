@@ -0,0 +1,384 @@
+"""
+UK Business Day Calendar
+========================
+
+England & Wales business day calendar used for gilt settlement and ex-dividend dates.
+
+The calendar precomputes, once, a business day bitmap over a multi-decade range together with
+its cumulative index, so that rolling, adding and counting business days are O(1) array lookups
+and work on whole arrays of ``datetime64[D]`` dates at once.
+
+- Bitmap: ``True`` for every day in the range which is neither a weekend nor a bank holiday.
+- Rank: number of business days strictly before each day in the range.
+- Business days: ordinals of all the business days, so that ``business_days[rank]`` inverts the rank.
+
+[UK Bank Holidays](https://www.gov.uk/bank-holidays)
+
+"""
+from datetime import date, timedelta
+import threading
+from typing import Literal, Optional
+
+import numpy as np
+
+RollConvention = Literal["following", "preceding", "modified_following"]
+
+# one-off bank holidays and moved fixed holidays, England & Wales
+_SPECIAL_HOLIDAYS = {
+    date(1977, 6, 7),  # Silver Jubilee
+    date(1981, 7, 29),  # Royal Wedding
+    date(1999, 12, 31),  # Millennium
+    date(2002, 6, 3),  # Golden Jubilee
+    date(2011, 4, 29),  # Royal Wedding
+    date(2012, 6, 5),  # Diamond Jubilee
+    date(2022, 6, 3),  # Platinum Jubilee
+    date(2022, 9, 19),  # State Funeral
+    date(2023, 5, 8),  # Coronation
+}
+_EARLY_MAY_OVERRIDES = {1995: date(1995, 5, 8), 2020: date(2020, 5, 8)}
+_SPRING_OVERRIDES = {1977: date(1977, 6, 6), 2002: date(2002, 6, 4), 2012: date(2012, 6, 4), 2022: date(2022, 6, 2)}
+
+
+def to_datetime64(dates) -> np.ndarray:
+    """
+    Convert dates to a ``datetime64[D]`` array.
+
+    ``datetime64[D]`` arrays and int64 day ordinals (days since 1970-01-01, e.g. a memoryview or an Arrow
+    ``int64`` column) are viewed without copying. Other integer ordinals, such as an Arrow ``date32`` column,
+    are copied once to int64.
+
+    :param dates: Dates as 'YYYY-MM-DD' strings, ``datetime.date`` objects, ``datetime64`` values,
+                  integer day ordinals or any buffer-protocol column of those.
+    :raises ValueError: If any string or object is not a complete date (e.g. '', 'NaT' or '2035-02').
+    :return: Dates as a ``datetime64[D]`` array.
+    :rtype: np.ndarray
+
+    :Example:
+        >>> to_datetime64(memoryview(np.array([20136, 20137])))
+        array(['2025-02-17', '2025-02-18'], dtype='datetime64[D]')
+    """
+    array = np.asarray(dates)
+    if array.dtype.kind in "iu":
+        return array.astype(np.int64, copy=False).view("datetime64[D]")
+    if array.dtype.kind == "M":
+        return array.astype("datetime64[D]", copy=False)
+    if array.dtype.kind in "USO":
+        # parsed strictly, so that '', 'NaT' or a partial date such as '2035-02' is not read as a date
+        converted, valid = to_datetime64_masked(array)
+        if not valid.all():
+            raise ValueError("Invalid date format. Use YYYY-MM-DD.")
+        return converted
+    try:
+        return array.astype("datetime64[D]")
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid date format. Use YYYY-MM-DD.") from e
+
+
+def _parse_iso_dates(text: np.ndarray) -> np.ndarray:
+    """
+    Strictly parse 'YYYY-MM-DD' strings, element-wise without Python loops, NaT where malformed.
+
+    Like ``datetime.strptime(text, "%Y-%m-%d")`` in the scalar pricers, the month and day may have one or two
+    digits ('2025-1-1').
+    """
+    text = text.astype(str)
+    length = np.strings.str_len(text)
+    codes = np.ascontiguousarray(text.astype("U10")).view(np.uint32).reshape(*text.shape, 10).astype(np.int64)
+    digits = codes - ord("0")
+    position = np.arange(10)
+    is_digit = (digits >= 0) & (digits <= 9) & (position < length[..., None])
+
+    # the second dash ends a one or two digit month
+    month_end = np.where(codes[..., 6] == ord("-"), 6, 7)
+    day_length = length - month_end - 1
+    expected_digit = (position < length[..., None]) & (position != 4) & (position != month_end[..., None])
+    well_formed = (length <= 10) & (day_length >= 1) & (day_length <= 2)
+    second_dash = np.take_along_axis(codes, month_end[..., None], -1)[..., 0]
+    well_formed &= (codes[..., 4] == ord("-")) & (second_dash == ord("-"))
+    well_formed &= (is_digit == expected_digit).all(axis=-1)
+    digits = np.where(well_formed[..., None] & is_digit, digits, 0)
+
+    def number(start: np.ndarray, n_digits: np.ndarray) -> np.ndarray:
+        first = np.take_along_axis(digits, start[..., None], -1)[..., 0]
+        second = np.take_along_axis(digits, np.minimum(start + 1, 9)[..., None], -1)[..., 0]
+        return np.where(n_digits == 2, first * 10 + second, first)
+
+    year = digits[..., 0] * 1000 + digits[..., 1] * 100 + digits[..., 2] * 10 + digits[..., 3]
+    month = number(np.full(length.shape, 5), month_end - 5)
+    day = number(month_end + 1, day_length)
+    well_formed &= (month >= 1) & (month <= 12)
+
+    month_start = ((year - 1970) * 12 + np.clip(month, 1, 12) - 1).astype("datetime64[M]")
+    days_in_month = ((month_start + 1).astype("datetime64[D]") - month_start.astype("datetime64[D]")).astype(np.int64)
+    well_formed &= (day >= 1) & (day <= days_in_month)
+
+    return np.where(well_formed, month_start.astype("datetime64[D]") + (day - 1), np.datetime64("NaT"))
+
+
+def to_datetime64_masked(dates) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Convert dates to a ``datetime64[D]`` array, flagging the entries which cannot be parsed instead of raising.
+
+    :param dates: Dates as accepted by :func:`to_datetime64`. Strings must be complete 'YYYY-MM-DD' dates,
+                  the month and day with one or two digits as in the scalar pricers.
+    :return: Dates (NaT where invalid) and a mask of the valid entries.
+    :rtype: tuple[np.ndarray, np.ndarray]
+
+    :Example:
+        >>> to_datetime64_masked(["2025-02-17", "2025-02-30", "17/02/2025"])[1]
+        array([ True, False, False])
+    """
+    array = np.asarray(dates)
+    if array.dtype.kind in "US":
+        # Strings are always parsed strictly, so a partial date such as '2030-03' is invalid whatever the other rows
+        converted = _parse_iso_dates(array)
+    elif array.dtype.kind == "O":
+        converted = np.array([_to_datetime64_or_nat(value) for value in array.reshape(-1)], dtype="datetime64[D]")
+        converted = converted.reshape(array.shape)
+    else:
+        try:
+            converted = to_datetime64(dates)
+        except ValueError:
+            converted = np.full(array.shape, np.datetime64("NaT"), dtype="datetime64[D]")
+    return converted, ~np.isnat(converted)
+
+
+def _to_datetime64_or_nat(value) -> np.datetime64:
+    if isinstance(value, (str, bytes)):
+        return _parse_iso_dates(np.asarray(value))[()]
+    try:
+        return np.datetime64(value, "D")
+    except (ValueError, TypeError):
+        return np.datetime64("NaT", "D")
+
+
+def easter_sunday(year: int) -> date:
+    """
+    Easter Sunday for a given year using the anonymous Gregorian algorithm.
+
+    :param year: Year.
+    :return: Easter Sunday.
+    :rtype: date
+    """
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7  # noqa: E741
+    m = (a + 11 * h + 19 * l) // 433
+    month, day = divmod(h + l - 7 * m + 90, 25)
+    return date(year, month, (h + l - 7 * m + 33 * month + 19) % 32)
+
+
+def _weekday_on_or_before(day: date, weekday: int) -> date:
+    return day - timedelta(days=(day.weekday() - weekday) % 7)
+
+
+def _weekday_on_or_after(day: date, weekday: int) -> date:
+    return day + timedelta(days=(weekday - day.weekday()) % 7)
+
+
+def uk_bank_holidays(year: int) -> list[date]:
+    """
+    England & Wales bank holidays for a given year, including substitute days.
+
+    :param year: Year.
+    :return: Sorted list of bank holidays.
+    :rtype: list[date]
+
+    :Example:
+        >>> [d.isoformat() for d in uk_bank_holidays(2025)]
+        ['2025-01-01', '2025-04-18', '2025-04-21', '2025-05-05', '2025-05-26', '2025-08-25', '2025-12-25', '2025-12-26']
+    """
+    holidays = set()
+
+    # New Year's Day, substituted to the following Monday when on a weekend (from 1974)
+    if year >= 1974:
+        new_year = date(year, 1, 1)
+        holidays.add(_weekday_on_or_after(new_year, 0) if new_year.weekday() >= 5 else new_year)
+
+    easter = easter_sunday(year)
+    holidays.add(easter - timedelta(days=2))
+    holidays.add(easter + timedelta(days=1))
+
+    # Early May bank holiday, first Monday in May (from 1978)
+    if year >= 1978:
+        holidays.add(_EARLY_MAY_OVERRIDES.get(year, _weekday_on_or_after(date(year, 5, 1), 0)))
+
+    # Spring and Summer bank holidays, last Monday of May and August
+    holidays.add(_SPRING_OVERRIDES.get(year, _weekday_on_or_before(date(year, 5, 31), 0)))
+    holidays.add(_weekday_on_or_before(date(year, 8, 31), 0))
+
+    # Christmas and Boxing Day, substituted so that two weekdays are always given
+    christmas, boxing_day = date(year, 12, 25), date(year, 12, 26)
+    if christmas.weekday() == 5:
+        holidays.update({christmas + timedelta(days=2), boxing_day + timedelta(days=2)})
+    elif christmas.weekday() == 6:
+        holidays.update({christmas + timedelta(days=2), boxing_day})
+    elif christmas.weekday() == 4:
+        holidays.update({christmas, boxing_day + timedelta(days=2)})
+    else:
+        holidays.update({christmas, boxing_day})
+
+    holidays.update(d for d in _SPECIAL_HOLIDAYS if d.year == year)
+
+    return sorted(holidays)
+
+
+class UKBusinessCalendar:
+    """
+    Precomputed England & Wales business day calendar.
+
+    :param start_year: First year covered by the calendar.
+    :type start_year: int
+    :param end_year: Last year covered by the calendar (inclusive).
+    :type end_year: int
+
+    :Example:
+        >>> calendar = UKBusinessCalendar(2020, 2030)
+        >>> calendar.add_business_days("2025-04-17", 1)
+        np.datetime64('2025-04-22')
+    """
+
+    def __init__(self, start_year: int = 1970, end_year: int = 2100) -> None:
+        if end_year < start_year:
+            raise ValueError("End year must not be before start year.")
+
+        self.start_year = start_year
+        self.end_year = end_year
+        self._start = np.datetime64(f"{start_year}-01-01", "D")
+        self._end = np.datetime64(f"{end_year + 1}-01-01", "D")
+
+        holidays = [d for year in range(start_year, end_year + 1) for d in uk_bank_holidays(year)]
+        days = np.arange(self._start, self._end, dtype="datetime64[D]")
+        self.holidays = np.array(holidays, dtype="datetime64[D]")
+        self.bitmap = np.is_busday(days, holidays=self.holidays)
+        self.rank = np.concatenate(([0], np.cumsum(self.bitmap)))
+        self.business_days = days[self.bitmap]
+        # shared across threads by get_uk_calendar, so freeze the lookup tables
+        for table in (self.holidays, self.bitmap, self.rank, self.business_days):
+            table.flags.writeable = False
+
+    def _offsets(self, dates) -> np.ndarray:
+        dates = to_datetime64(dates)
+        offsets = (dates - self._start).astype(np.int64)
+        if np.any((offsets < 0) | (offsets >= self.bitmap.size)):
+            raise ValueError(f"Dates must fall between {self.start_year} and {self.end_year}.")
+        return offsets
+
+    def covers(self, dates, business_days_before: int = 0) -> np.ndarray:
+        """
+        Check whether dates fall within the calendar, without raising.
+
+        :param dates: Dates to check, NaT allowed.
+        :param business_days_before: Number of business days of the calendar required before each date,
+                                     e.g. to count back to an ex-dividend date.
+        :return: True for the dates inside the calendar.
+        :rtype: np.ndarray
+        """
+        offsets = (to_datetime64(dates) - self._start).astype(np.int64)
+        inside = (offsets >= 0) & (offsets < self.bitmap.size)
+        return inside & (self.rank[np.clip(offsets, 0, self.bitmap.size - 1)] >= business_days_before)
+
+    def is_business_day(self, dates) -> np.ndarray:
+        """
+        Check whether dates are business days.
+
+        :param dates: Dates to check.
+        :return: True for business days.
+        :rtype: np.ndarray
+        """
+        return self.bitmap[self._offsets(dates)]
+
+    def _rolled_rank(self, dates, roll: RollConvention) -> np.ndarray:
+        offsets = self._offsets(dates)
+        following = self.rank[offsets]
+        if roll == "following":
+            return following
+        preceding = self.rank[offsets + 1] - 1
+        if roll == "preceding":
+            return preceding
+        if roll == "modified_following":
+            month = to_datetime64(dates).astype("datetime64[M]")
+            rolled_day = self.business_days[np.minimum(following, self.business_days.size - 1)]
+            rolled_month = rolled_day.astype("datetime64[M]")
+            return np.where(rolled_month == month, following, preceding)
+        raise ValueError("Unsupported roll convention. Use 'following', 'preceding' or 'modified_following'.")
+
+    def roll(self, dates, roll: RollConvention = "following") -> np.ndarray:
+        """
+        Roll dates onto business days.
+
+        :param dates: Dates to roll.
+        :param roll: Roll convention: "following", "preceding" or "modified_following".
+        :return: Rolled dates as ``datetime64[D]``.
+        :rtype: np.ndarray
+        """
+        return self._lookup(self._rolled_rank(dates, roll))
+
+    def add_business_days(self, dates, n_days, roll: RollConvention = "following") -> np.ndarray:
+        """
+        Add a number of business days to dates, rolling them onto a business day first.
+
+        :param dates: Start dates.
+        :param n_days: Number of business days to add (can be negative), broadcast against ``dates``.
+        :param roll: Roll convention applied to non-business start dates.
+        :return: Shifted dates as ``datetime64[D]``.
+        :rtype: np.ndarray
+        """
+        return self._lookup(self._rolled_rank(dates, roll) + np.asarray(n_days, dtype=np.int64))
+
+    def count_business_days(self, start_dates, end_dates) -> np.ndarray:
+        """
+        Count business days in the half-open interval ``[start, end)``.
+
+        :param start_dates: Start dates.
+        :param end_dates: End dates, broadcast against ``start_dates``.
+        :return: Number of business days, negative when end is before start.
+        :rtype: np.ndarray
+        """
+        return self.rank[self._offsets(end_dates)] - self.rank[self._offsets(start_dates)]
+
+    def _lookup(self, ranks: np.ndarray) -> np.ndarray:
+        if np.any((ranks < 0) | (ranks >= self.business_days.size)):
+            raise ValueError(f"Dates must fall between {self.start_year} and {self.end_year}.")
+        return self.business_days[ranks]
+
+
+_uk_calendar: Optional[UKBusinessCalendar] = None
+_uk_calendar_lock = threading.Lock()
+
+
+def get_uk_calendar() -> UKBusinessCalendar:
+    """
+    Shared UK business day calendar covering 1970 to 2100, built once on first use, from any thread.
+
+    :return: UK business day calendar (read-only).
+    :rtype: UKBusinessCalendar
+    """
+    global _uk_calendar
+    if _uk_calendar is None:
+        with _uk_calendar_lock:
+            if _uk_calendar is None:
+                _uk_calendar = UKBusinessCalendar()
+    return _uk_calendar
+
+
+def get_settlement_dates(trade_date, settlement_days: int = 1) -> np.ndarray:
+    """
+    Settlement dates for trade dates under the gilt market T+n convention (T+1 by default).
+
+    The result can be passed straight to the batch pricers as ``settlement_date``.
+
+    :param trade_date: Trade dates as 'YYYY-MM-DD' strings or ``datetime64`` values.
+    :param settlement_days: Number of business days between trade and settlement.
+    :return: Settlement dates as ``datetime64[D]``.
+    :rtype: np.ndarray
+
+    :Example:
+        >>> get_settlement_dates(["2025-04-17", "2025-12-24"])
+        array(['2025-04-22', '2025-12-29'], dtype='datetime64[D]')
+    """
+    return get_uk_calendar().add_business_days(trade_date, settlement_days)
@@ -6,14 +6,23 @@ Zero Coupon Bond functionalities for bond price modelling.
 
 """
 
-from fift_analytics.gilts.zero_coupon.zc_pricers import get_zero_coupon_gilt_price
+from fift_analytics.gilts.zero_coupon.zc_pricers import get_zero_coupon_gilt_price, get_zero_coupon_gilt_price_batch
 from fift_analytics.gilts.zero_coupon.zc_convexity import calculate_zero_coupon_bond_convexity
 from fift_analytics.gilts.zero_coupon.zc_duration import calculate_zero_coupon_bond_duration
-from fift_analytics.gilts.zero_coupon.zc_dvone import calculate_zero_coupon_bond_dv01
+from fift_analytics.gilts.zero_coupon.zc_dvone import (
+    calculate_zero_coupon_bond_dv01,
+    calculate_zero_coupon_bond_dv01_batch,
+)
+from fift_analytics.gilts.zero_coupon.short_rate import HullWhiteModel, VasicekModel, simulate_zero_coupon_prices
 
 __all__ = [
     "get_zero_coupon_gilt_price",
+    "get_zero_coupon_gilt_price_batch",
     "calculate_zero_coupon_bond_convexity",
     "calculate_zero_coupon_bond_duration",
     "calculate_zero_coupon_bond_dv01",
+    "calculate_zero_coupon_bond_dv01_batch",
+    "HullWhiteModel",
+    "VasicekModel",
+    "simulate_zero_coupon_prices",
 ]
\ No newline at end of file
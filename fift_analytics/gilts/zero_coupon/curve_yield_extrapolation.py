@@ -11,8 +11,10 @@ zero coupon bond curve.
    :toctree: generated/
 
    derive_yield_from_zero_curve
+   derive_yield_from_zero_curve_batch
 
 """
+import numpy as np
 from pydantic import validate_call
 
 @validate_call
@@ -82,3 +84,43 @@ def derive_yield_from_zero_curve(
     extrapolated_yield = y_last + ((y_final - y_last) * (target_maturity - t_last)) / (t_final - t_last)
     
     return extrapolated_yield
+
+
+def derive_yield_from_zero_curve_batch(
+    zero_curve: list[tuple[int, float]],
+    target_maturity,
+) -> np.ndarray:
+    """
+    Derive the implicit yields for an array of maturities using a zero-coupon bond curve.
+
+    Vectorised counterpart of :func:`derive_yield_from_zero_curve`, with the same flat yield
+    below 3 months, linear interpolation within the curve and linear extrapolation beyond it.
+
+    :param zero_curve: A list of tuples representing the zero-coupon bond curve.
+                       Each tuple contains (maturity_in_months, annual_yield).
+    :type zero_curve: list
+    :param target_maturity: The target maturities in months, of any shape.
+    :return: The interpolated or extrapolated yields, with the shape of ``target_maturity``.
+    :rtype: np.ndarray
+
+    :Example:
+        >>> zero_curve = [(3, 0.01), (6, 0.015), (12, 0.02), (18, 0.025)]
+        >>> derive_yield_from_zero_curve_batch(zero_curve, [2, 9, 24])
+        array([0.01  , 0.0175, 0.03  ])
+    """
+    if not zero_curve or len(zero_curve) < 2:
+        raise ValueError("Zero curve must contain at least two points.")
+
+    target_maturity = np.asarray(target_maturity, dtype=np.float64)
+    if np.any(target_maturity < 0):
+        raise ValueError("Target maturity must be non-negative.")
+
+    tenors, yields = np.asarray(sorted(zero_curve, key=lambda x: x[0]), dtype=np.float64).T
+
+    # extrapolate from the last two points, then overwrite within the curve and below 3 months
+    slope = (yields[-1] - yields[-2]) / (tenors[-1] - tenors[-2])
+    result = yields[-2] + slope * (target_maturity - tenors[-2])
+    within = (target_maturity >= tenors[0]) & (target_maturity <= tenors[-1])
+    result = np.where(within, np.interp(target_maturity, tenors, yields), result)
+
+    return np.where(target_maturity < 3, yields[0], result)
@@ -0,0 +1,355 @@
+"""
+Short Rate Monte Carlo
+======================
+
+Price distributions of a zero-coupon book at a horizon under stochastic short rates.
+
+Two one-factor models are available, both calibrated to a zero curve in the format of
+:func:`~fift_analytics.gilts.zero_coupon.curve_yield_extrapolation.derive_yield_from_zero_curve`
+(continuously compounded yields, as in :func:`~fift_analytics.gilts.zero_coupon.zc_pricers.get_zero_coupon_gilt_price`):
+
+- :class:`VasicekModel`, :math:`dr = a (b - r) dt + \\sigma dW`, with the initial and long-term rates fitted to
+  the curve by least squares for a given mean reversion and volatility.
+- :class:`HullWhiteModel`, :math:`dr = (\\theta(t) - a r) dt + \\sigma dW`, which reprices the curve exactly.
+
+Short rates are simulated with the exact Gaussian transition on a time grid, a block of paths at a time, and
+each zero-coupon gilt is priced on each path at the horizon with the closed-form bond price of the model.
+
+Paths are split into chunks of at most ``chunk_size`` paths, so memory is bounded by the chunk size whatever
+the number of paths. Each chunk draws from its own stream spawned from one :class:`numpy.random.SeedSequence`,
+so the results for a seed do not depend on the number of workers, and chunks can run on a process pool.
+
+:Example:
+    >>> zero_curve = [(3, 0.04), (60, 0.042), (120, 0.045)]
+    >>> model = HullWhiteModel(zero_curve, mean_reversion=0.1, volatility=0.01)
+    >>> simulation = simulate_zero_coupon_prices(
+    ...     model, 100, ["2030-02-17", "2035-02-17"], "2025-02-17", "2026-02-17", n_paths=20_000, seed=7
+    ... )
+    >>> simulation.price.shape
+    (20000, 2)
+    >>> (simulation.price * simulation.discount_factor[:, None]).mean(axis=0).round(1)
+    array([81. , 63.7])
+    >>> maturity = year_fraction("2025-02-17", ["2030-02-17", "2035-02-17"])
+    >>> (100 * np.exp(model.market_log_price(maturity))).round(1)
+    array([81. , 63.7])
+
+"""
+import os
+from typing import NamedTuple, Optional, Union
+
+import numpy as np
+
+from fift_analytics.gilts.day_count import year_fraction
+from fift_analytics.gilts.parallel import ExecutorKind, make_executor
+from fift_analytics.gilts.precision import OutputDType, get_output_dtype
+from fift_analytics.gilts.uk_calendar import to_datetime64
+from fift_analytics.gilts.zero_coupon.curve_yield_extrapolation import derive_yield_from_zero_curve_batch
+
+DEFAULT_PATH_CHUNK_SIZE = 10_000
+
+DEFAULT_STEPS_PER_YEAR = 52
+
+FORWARD_RATE_STEP = 1e-4
+
+
+def _ou_transition(mean_reversion: float, volatility: float, dt: float) -> tuple[float, float]:
+    """
+    Decay factor and standard deviation of an Ornstein-Uhlenbeck process over ``dt`` years.
+    """
+    decay = np.exp(-mean_reversion * dt)
+    return decay, volatility * np.sqrt((1 - decay**2) / (2 * mean_reversion))
+
+
+def _duration_factor(mean_reversion: float, tau):
+    return (1 - np.exp(-mean_reversion * tau)) / mean_reversion
+
+
+class VasicekModel:
+    """
+    Vasicek short rate model :math:`dr = a (b - r) dt + \\sigma dW`.
+
+    :param mean_reversion: Mean reversion speed :math:`a` (per year).
+    :param volatility: Short rate volatility :math:`\\sigma` (per year).
+    :param long_term_rate: Long-term short rate :math:`b`.
+    :param initial_rate: Short rate today :math:`r_0`.
+    :raises ValueError: If the mean reversion or the volatility is not positive.
+    """
+
+    def __init__(self, mean_reversion: float, volatility: float, long_term_rate: float, initial_rate: float) -> None:
+        if mean_reversion <= 0 or volatility <= 0:
+            raise ValueError("Mean reversion and volatility must be positive.")
+        self.mean_reversion = mean_reversion
+        self.volatility = volatility
+        self.long_term_rate = long_term_rate
+        self.initial_rate = initial_rate
+
+    @classmethod
+    def calibrate(cls, zero_curve: list[tuple[int, float]], mean_reversion: float, volatility: float) -> "VasicekModel":
+        """
+        Fit the initial and long-term rates to a zero curve by least squares on its tenors.
+
+        Model yields are linear in :math:`r_0` and :math:`b` for a given mean reversion and volatility.
+
+        :param zero_curve: Zero curve as a list of (maturity_in_months, annual_yield).
+        :param mean_reversion: Mean reversion speed :math:`a` (per year).
+        :param volatility: Short rate volatility :math:`\\sigma` (per year).
+        :return: The calibrated model.
+        :rtype: VasicekModel
+
+        :Example:
+            >>> model = VasicekModel.calibrate([(3, 0.04), (60, 0.042), (120, 0.045)], 0.1, 0.01)
+            >>> round(model.initial_rate, 4), round(model.long_term_rate, 4)
+            (0.0395, 0.0557)
+        """
+        model = cls(mean_reversion, volatility, 0.0, 0.0)
+        tau = np.array([tenor for tenor, _ in zero_curve], dtype=np.float64) / 12
+        observed = np.array([annual_yield for _, annual_yield in zero_curve], dtype=np.float64)
+
+        duration = _duration_factor(mean_reversion, tau)
+        convexity = model._log_price(tau, 0.0)
+        design = np.column_stack([duration / tau, (tau - duration) / tau])
+        (initial_rate, long_term_rate), *_ = np.linalg.lstsq(design, observed + convexity / tau, rcond=None)
+        model.initial_rate, model.long_term_rate = float(initial_rate), float(long_term_rate)
+        return model
+
+    def _log_price(self, tau, short_rate):
+        """
+        Log price of a unit zero-coupon bond with ``tau`` years to maturity when the short rate is ``short_rate``.
+        """
+        a, sigma = self.mean_reversion, self.volatility
+        duration = _duration_factor(a, tau)
+        log_a = (self.long_term_rate - sigma**2 / (2 * a**2)) * (duration - tau) - sigma**2 * duration**2 / (4 * a)
+        return log_a - duration * short_rate
+
+    def short_rate_paths(self, time: np.ndarray, normals: np.ndarray) -> np.ndarray:
+        """
+        Simulate short rate paths with the exact Gaussian transition.
+
+        :param time: Time grid in years, starting at 0.
+        :param normals: Standard normal draws of shape ``(n_paths, len(time) - 1)``.
+        :return: Short rates of shape ``(n_paths, len(time))``.
+        :rtype: np.ndarray
+        """
+        rates = np.empty((normals.shape[0], time.size))
+        rates[:, 0] = self.initial_rate
+        for step, dt in enumerate(np.diff(time)):
+            decay, deviation = _ou_transition(self.mean_reversion, self.volatility, dt)
+            mean = rates[:, step] * decay + self.long_term_rate * (1 - decay)
+            rates[:, step + 1] = mean + deviation * normals[:, step]
+        return rates
+
+    def bond_price(self, horizon: float, maturity, short_rate) -> np.ndarray:
+        """
+        Price at ``horizon`` of unit zero-coupon bonds maturing at ``maturity``, given the short rate at the horizon.
+
+        :param horizon: Horizon in years.
+        :param maturity: Maturities in years, after the horizon.
+        :param short_rate: Short rates at the horizon, broadcast against ``maturity``.
+        :return: Bond prices.
+        :rtype: np.ndarray
+        """
+        return np.exp(self._log_price(np.asarray(maturity) - horizon, short_rate))
+
+
+class HullWhiteModel:
+    """
+    Hull-White one-factor short rate model :math:`dr = (\\theta(t) - a r) dt + \\sigma dW`, fitted exactly to a
+    zero curve.
+
+    The short rate is simulated as :math:`r(t) = x(t) + \\alpha(t)` with :math:`x` a zero-mean Ornstein-Uhlenbeck
+    process and :math:`\\alpha(t) = f(0, t) + \\frac{\\sigma^2}{2 a^2} (1 - e^{-a t})^2`, where the instantaneous
+    forward rate :math:`f(0, t)` is differentiated numerically from the interpolated curve.
+
+    :param zero_curve: Zero curve as a list of (maturity_in_months, annual_yield).
+    :param mean_reversion: Mean reversion speed :math:`a` (per year).
+    :param volatility: Short rate volatility :math:`\\sigma` (per year).
+    :raises ValueError: If the mean reversion or the volatility is not positive or the curve has fewer than two points.
+    """
+
+    def __init__(self, zero_curve: list[tuple[int, float]], mean_reversion: float, volatility: float) -> None:
+        if mean_reversion <= 0 or volatility <= 0:
+            raise ValueError("Mean reversion and volatility must be positive.")
+        if not zero_curve or len(zero_curve) < 2:
+            raise ValueError("Zero curve must contain at least two points.")
+        self.zero_curve = zero_curve
+        self.mean_reversion = mean_reversion
+        self.volatility = volatility
+
+    def market_log_price(self, time) -> np.ndarray:
+        """
+        Log discount factors of the zero curve, :math:`-y(t) \\, t`.
+
+        :param time: Times in years.
+        :return: Log discount factors.
+        :rtype: np.ndarray
+        """
+        time = np.asarray(time, dtype=np.float64)
+        return -derive_yield_from_zero_curve_batch(self.zero_curve, 12 * time) * time
+
+    def forward_rate(self, time) -> np.ndarray:
+        """
+        Instantaneous forward rates :math:`f(0, t)` of the zero curve, by central differences.
+
+        :param time: Times in years.
+        :return: Forward rates.
+        :rtype: np.ndarray
+        """
+        time = np.asarray(time, dtype=np.float64)
+        lower = np.maximum(time - FORWARD_RATE_STEP, 0.0)
+        upper = time + FORWARD_RATE_STEP
+        return -(self.market_log_price(upper) - self.market_log_price(lower)) / (upper - lower)
+
+    def _alpha(self, time):
+        a, sigma = self.mean_reversion, self.volatility
+        return self.forward_rate(time) + sigma**2 / (2 * a**2) * (1 - np.exp(-a * time)) ** 2
+
+    def short_rate_paths(self, time: np.ndarray, normals: np.ndarray) -> np.ndarray:
+        """
+        Simulate short rate paths with the exact Gaussian transition.
+
+        :param time: Time grid in years, starting at 0.
+        :param normals: Standard normal draws of shape ``(n_paths, len(time) - 1)``.
+        :return: Short rates of shape ``(n_paths, len(time))``.
+        :rtype: np.ndarray
+        """
+        factor = np.zeros((normals.shape[0], time.size))
+        for step, dt in enumerate(np.diff(time)):
+            decay, deviation = _ou_transition(self.mean_reversion, self.volatility, dt)
+            factor[:, step + 1] = factor[:, step] * decay + deviation * normals[:, step]
+        return factor + self._alpha(time)
+
+    def bond_price(self, horizon: float, maturity, short_rate) -> np.ndarray:
+        """
+        Price at ``horizon`` of unit zero-coupon bonds maturing at ``maturity``, given the short rate at the horizon.
+
+        :param horizon: Horizon in years.
+        :param maturity: Maturities in years, after the horizon.
+        :param short_rate: Short rates at the horizon, broadcast against ``maturity``.
+        :return: Bond prices.
+        :rtype: np.ndarray
+        """
+        a, sigma = self.mean_reversion, self.volatility
+        maturity = np.asarray(maturity, dtype=np.float64)
+        duration = _duration_factor(a, maturity - horizon)
+        log_price = (
+            self.market_log_price(maturity)
+            - self.market_log_price(horizon)
+            + duration * self.forward_rate(horizon)
+            - sigma**2 / (4 * a) * (1 - np.exp(-2 * a * horizon)) * duration**2
+            - duration * short_rate
+        )
+        return np.exp(log_price)
+
+
+ShortRateModel = Union[VasicekModel, HullWhiteModel]
+
+
+class ShortRateSimulation(NamedTuple):
+    """
+    Simulated zero-coupon prices at the horizon.
+
+    :param price: Price of each bond on each path, ``(n_paths, n_bonds)``, or the book value
+                  ``(n_paths,)`` when aggregated.
+    :param discount_factor: Pathwise discount factor :math:`e^{-\\int_0^H r dt}` from the horizon to settlement,
+                            so that ``(price * discount_factor).mean()`` is the model value today.
+    :param short_rate: Short rate at the horizon on each path.
+    """
+
+    price: np.ndarray
+    discount_factor: np.ndarray
+    short_rate: np.ndarray
+
+
+def _simulate_chunk(
+    model: ShortRateModel,
+    seed: np.random.SeedSequence,
+    n_paths: int,
+    time: np.ndarray,
+    maturity: np.ndarray,
+    face_value: np.ndarray,
+    aggregate: bool,
+    dtype: OutputDType,
+) -> ShortRateSimulation:
+    """
+    Simulate one chunk of paths from its own random stream.
+    """
+    normals = np.random.default_rng(seed).standard_normal((n_paths, time.size - 1))
+    rates = model.short_rate_paths(time, normals)
+    short_rate = rates[:, -1]
+    discount_factor = np.exp(-np.trapezoid(rates, time, axis=1))
+
+    price = face_value * model.bond_price(time[-1], maturity, short_rate[:, None])
+    if aggregate:
+        price = price.sum(axis=1)
+    return ShortRateSimulation(price.astype(get_output_dtype(dtype), copy=False), discount_factor, short_rate)
+
+
+def simulate_zero_coupon_prices(
+    model: ShortRateModel,
+    face_value,
+    maturity_date,
+    settlement_date,
+    horizon_date,
+    n_paths: int,
+    steps_per_year: int = DEFAULT_STEPS_PER_YEAR,
+    seed: Optional[int] = None,
+    chunk_size: int = DEFAULT_PATH_CHUNK_SIZE,
+    workers: Optional[int] = 1,
+    executor: ExecutorKind = "process",
+    aggregate: bool = False,
+    dtype: OutputDType = "float64",
+) -> ShortRateSimulation:
+    """
+    Simulate the price distribution of a zero-coupon book at a horizon date.
+
+    :param model: A :class:`VasicekModel` or :class:`HullWhiteModel`.
+    :param face_value: Face values of the bonds.
+    :param maturity_date: Maturity dates, after the horizon date.
+    :param settlement_date: Valuation date, time 0 of the simulation.
+    :param horizon_date: Date at which the bonds are priced on each path.
+    :param n_paths: Number of paths.
+    :param steps_per_year: Time steps per year of the short rate paths (used by the pathwise discount factors).
+    :param seed: Seed of the root :class:`numpy.random.SeedSequence`; the same seed gives the same paths
+                 whatever the number of workers.
+    :param chunk_size: Largest number of paths simulated at once, bounding the working memory.
+    :param workers: Number of workers; 1 (default) simulates in the calling process.
+    :param executor: "process" (default) or "thread" pool when ``workers`` is not 1.
+    :param aggregate: True to return the book value on each path instead of each bond's price.
+    :param dtype: Output dtype of the prices, "float64" (default) or "float32". Simulation is in float64.
+    :raises ValueError: If the horizon is not after settlement, a bond matures on or before the horizon,
+                        a face value is not positive or the number of paths or chunk size is not positive.
+    :return: Prices, pathwise discount factors and short rates at the horizon.
+    :rtype: ShortRateSimulation
+    """
+    if n_paths < 1 or chunk_size < 1:
+        raise ValueError("Number of paths and chunk size must be positive.")
+
+    face_value, maturity_date = np.broadcast_arrays(
+        np.asarray(face_value, dtype=np.float64), to_datetime64(maturity_date)
+    )
+    face_value, maturity_date = face_value.reshape(-1), maturity_date.reshape(-1)
+    if np.any(face_value <= 0):
+        raise ValueError("Face value must be positive.")
+
+    horizon = float(year_fraction(settlement_date, horizon_date))
+    if horizon <= 0:
+        raise ValueError("Horizon date must be after the settlement date.")
+    maturity = year_fraction(settlement_date, maturity_date)
+    if np.any(maturity <= horizon):
+        raise ValueError("Maturity date must be after the horizon date.")
+
+    time = np.linspace(0.0, horizon, max(int(np.ceil(horizon * steps_per_year)), 1) + 1)
+    chunk_paths = np.diff(np.append(np.arange(0, n_paths, chunk_size), n_paths))
+    seeds = np.random.SeedSequence(seed).spawn(chunk_paths.size)
+    arguments = [
+        (model, chunk_seed, int(paths), time, maturity, face_value, aggregate, dtype)
+        for chunk_seed, paths in zip(seeds, chunk_paths)
+    ]
+
+    if workers == 1:
+        chunks = [_simulate_chunk(*chunk_arguments) for chunk_arguments in arguments]
+    else:
+        with make_executor(executor, workers or os.cpu_count()) as pool:
+            chunks = list(pool.map(_simulate_chunk, *zip(*arguments)))
+
+    return ShortRateSimulation(*(np.concatenate(field) for field in zip(*chunks)))
@@ -12,9 +12,25 @@ Current implementation relies on:
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union
 
-from fift_analytics.gilts.zero_coupon.zc_pricers import get_zero_coupon_gilt_price
+import numpy as np
+
+from fift_analytics.gilts.day_count import year_fraction
+from fift_analytics.gilts.precision import OutputDType, PrecisionMode, apply_precision, cast_output, get_precision_mode
+from fift_analytics.gilts.row_errors import (
+    ErrorPolicy,
+    MaskedResult,
+    check_policy,
+    evaluate_valid_rows,
+    validate_bond_rows,
+)
+from fift_analytics.gilts.uk_calendar import to_datetime64
+from fift_analytics.gilts.zero_coupon.zc_pricers import (
+    _zero_coupon_price,
+    get_zero_coupon_gilt_price,
+    get_zero_coupon_gilt_price_batch,
+)
 
 
 def calculate_zero_coupon_bond_dv01(
@@ -23,7 +39,8 @@ def calculate_zero_coupon_bond_dv01(
     maturity_date: str,
     settlement_date: Optional[str] = None,
     maturity_threshold: float = 7/365,
-    n_decimals: int | None = None
+    n_decimals: int | None = None,
+    precision: Optional[PrecisionMode] = None,
 ) -> float:
     """
     Calculate the DV01 of a zero-coupon bond using the get_zero_coupon_gilt_price function.
@@ -34,6 +51,9 @@ def calculate_zero_coupon_bond_dv01(
     :param settlement_date: The settlement date in 'YYYY-MM-DD' format. Defaults to today if not provided.
     :param maturity_threshold: Threshold (in years) below which DV01 is considered zero (default is 7 days).
     :param n_decimals: Decimal precision of the returned dv01.
+    :param precision: "reporting" to reprice with penny rounded prices, "raw" to bump unrounded prices
+                      and return an unrounded DV01. Defaults to the current
+                      :func:`~fift_analytics.gilts.precision.precision_mode`.
     :return: DV01 of the zero-coupon bond.
     """
     # Calculate time to maturity
@@ -41,7 +61,7 @@ def calculate_zero_coupon_bond_dv01(
         settlement_date = datetime.now().strftime('%Y-%m-%d')
     settlement_date_obj = datetime.strptime(settlement_date, '%Y-%m-%d')
     maturity_date_obj = datetime.strptime(maturity_date, '%Y-%m-%d')
-    time_to_maturity = (maturity_date_obj - settlement_date_obj).days / 365.0
+    time_to_maturity = float(year_fraction(settlement_date_obj, maturity_date_obj, "Actual/365"))
 
     if time_to_maturity <= 0:
         raise ValueError("Time to maturity must be positive.")
@@ -49,19 +69,104 @@ def calculate_zero_coupon_bond_dv01(
     if time_to_maturity <= maturity_threshold:
         return 0.0
 
+    precision = get_precision_mode(precision)
+
     # Calculate the current price
-    price = get_zero_coupon_gilt_price(face_value, yield_to_maturity, maturity_date, settlement_date)
+    price = get_zero_coupon_gilt_price(face_value, yield_to_maturity, maturity_date, settlement_date, precision)
 
     # Calculate price after 1bp increase in yield
-    price_up = get_zero_coupon_gilt_price(face_value, yield_to_maturity + 0.0001, maturity_date, settlement_date)
+    price_up = get_zero_coupon_gilt_price(
+        face_value, yield_to_maturity + 0.0001, maturity_date, settlement_date, precision
+    )
 
     # Calculate DV01
     dv01 = price - price_up
     
+    if precision == "raw":
+        return dv01
+
     if not n_decimals:
         return round(dv01, 2)
     
     return dv01
 
-    
 
+def calculate_zero_coupon_bond_dv01_batch(
+    face_value,
+    yield_to_maturity,
+    maturity_date,
+    settlement_date=None,
+    maturity_threshold: float = 7/365,
+    precision: Optional[PrecisionMode] = None,
+    dtype: OutputDType = "float64",
+    out=None,
+    errors: ErrorPolicy = "raise",
+) -> Union[np.ndarray, MaskedResult]:
+    """
+    Calculate the DV01 of many zero-coupon bonds in one vectorised call.
+
+    Array counterpart of :func:`calculate_zero_coupon_bond_dv01`: all arguments are broadcast against
+    each other and dates can be 'YYYY-MM-DD' strings, ``datetime64`` values
+    or integer day ordinals. NumPy arrays, memoryviews and Arrow columns of float64, int64 day ordinals or
+    ``datetime64[D]`` are read without copying.
+
+    :param face_value: Face values of the bonds.
+    :param yield_to_maturity: Annual yields to maturity as decimals.
+    :param maturity_date: Maturity dates.
+    :param settlement_date: Settlement dates. Defaults to today if not provided.
+    :param maturity_threshold: Threshold (in years) below which DV01 is considered zero (default is 7 days).
+    :param precision: "reporting" to reprice with penny rounded prices and round the DV01, "raw" for full float64.
+    :param dtype: Output dtype, "float64" (default) or "float32". DV01 is computed in float64 either way.
+    :param out: Optional writable float32 or float64 buffer receiving the results, e.g. a column of a frame.
+    :param errors: "raise" (default) to raise on the first invalid row, "mask" to compute the valid rows only
+                   and return a :class:`~fift_analytics.gilts.row_errors.MaskedResult`.
+    :raises ValueError: If any face value is not positive or any maturity date is not after its settlement date
+                        (with ``errors="raise"``).
+    :return: DV01 of the zero-coupon bonds.
+    :rtype: Union[np.ndarray, MaskedResult]
+
+    :Example:
+        >>> calculate_zero_coupon_bond_dv01_batch(1000000, [0.05, 0.0], "2035-02-17", "2025-02-17")
+        array([ 606.39, 1000.05])
+    """
+    check_policy(errors)
+    precision = get_precision_mode(precision)
+    if errors == "mask":
+        face_value = np.asarray(face_value, dtype=np.float64)
+        yield_to_maturity = np.asarray(yield_to_maturity, dtype=np.float64)
+        settlement_date = np.datetime64("today", "D") if settlement_date is None else settlement_date
+        settlement_date, maturity_date, error_code = validate_bond_rows(
+            settlement_date, maturity_date, face_value=face_value, numbers=(yield_to_maturity,)
+        )
+        return evaluate_valid_rows(
+            calculate_zero_coupon_bond_dv01_batch,
+            error_code,
+            {
+                "face_value": face_value,
+                "yield_to_maturity": yield_to_maturity,
+                "maturity_date": maturity_date,
+                "settlement_date": settlement_date,
+            },
+            out=out,
+            maturity_threshold=maturity_threshold,
+            precision=precision,
+            dtype=dtype,
+        )
+
+    settlement_date = np.datetime64("today", "D") if settlement_date is None else to_datetime64(settlement_date)
+    maturity_date = to_datetime64(maturity_date)
+
+    price = get_zero_coupon_gilt_price_batch(face_value, yield_to_maturity, maturity_date, settlement_date, precision)
+    price_up = apply_precision(
+        _zero_coupon_price(
+            np.asarray(face_value, dtype=np.float64),
+            np.asarray(yield_to_maturity, dtype=np.float64) + 0.0001,
+            settlement_date,
+            maturity_date,
+        ),
+        precision,
+    )
+    time_to_maturity = year_fraction(settlement_date, maturity_date, "Actual/365")
+    dv01 = np.where(time_to_maturity <= maturity_threshold, 0.0, price - price_up)
+
+    return cast_output(apply_precision(dv01, precision), dtype, out)
@@ -1,11 +1,28 @@
 from datetime import datetime
 import math
-from typing import Optional
+from typing import Optional, Union
+
+import numpy as np
 from pydantic import validate_call
 
+from fift_analytics.gilts.day_count import is_leap_year, year_fraction  # noqa: F401
+from fift_analytics.gilts.precision import OutputDType, PrecisionMode, apply_precision, cast_output
+from fift_analytics.gilts.row_errors import (
+    ErrorPolicy,
+    MaskedResult,
+    check_policy,
+    evaluate_valid_rows,
+    validate_bond_rows,
+)
+from fift_analytics.gilts.uk_calendar import to_datetime64
+
 @validate_call
 def get_zero_coupon_gilt_price(
-    face_value: float, annual_yield: float, maturity_date: str, settlement_date: Optional[str] = None
+    face_value: float,
+    annual_yield: float,
+    maturity_date: str,
+    settlement_date: Optional[str] = None,
+    precision: Optional[PrecisionMode] = None,
 ) -> float:
     """
     Calculate the theoretical price of a zero-coupon gilt using continuous compounding.
@@ -18,8 +35,11 @@ def get_zero_coupon_gilt_price(
     :type maturity_date: str
     :param settlement_date: The settlement date in 'YYYY-MM-DD' format. Defaults to today if not provided.
     :type settlement_date: Optional[str]
+    :param precision: "reporting" to round to 2 decimal places, "raw" for full float64.
+                      Defaults to the current :func:`~fift_analytics.gilts.precision.precision_mode`.
+    :type precision: Optional[str]
     :raises ValueError: If inputs are invalid (e.g., negative face value or invalid dates).
-    :return: The theoretical price of the zero-coupon gilt rounded to 2 decimal places.
+    :return: The theoretical price of the zero-coupon gilt rounded to 2 decimal places (unrounded in "raw" mode).
     :rtype: float
     
     :Example:
@@ -42,7 +62,7 @@ def get_zero_coupon_gilt_price(
         # as the bond due to T+1 settlement would be unlikely to trade or would have large delivery risk
         return face_value
     # Compute price using continuous compounding formula
-    price = compute_continuous_price(face_value, annual_yield, time_to_maturity)
+    price = compute_continuous_price(face_value, annual_yield, time_to_maturity, precision)
 
     return price
 
@@ -92,7 +112,8 @@ def parse_maturity_date(maturity_date: str) -> datetime:
 
 def calculate_time_to_maturity(settlement_date: datetime, maturity_date: datetime) -> float:
     """
-    Calculate time to maturity in years using Actual/Actual (ISMA) day count convention.
+    Calculate time to maturity in years using the "Actual/Actual" day count convention of
+    :func:`~fift_analytics.gilts.day_count.year_fraction` (days over the length of the settlement year, not ISMA).
 
     :param settlement_date: Settlement date as a datetime object.
     :param maturity_date: Maturity date as a datetime object.
@@ -109,25 +130,16 @@ def calculate_time_to_maturity(settlement_date: datetime, maturity_date: datetim
         # we return zero for days to maturity less then 3 and we handle this in the pricer to yield the face value
         return 0
 
-    # Determine if it's a leap year for Actual/Actual convention
-    year_length = 366 if is_leap_year(settlement_date.year) else 365
-    
-    return days_to_maturity / year_length
-
-
-def is_leap_year(year: int) -> bool:
-    """
-    Check if a given year is a leap year.
-
-    :param year: Year to check.
-    :return: True if leap year, False otherwise.
-    """
-    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
-
+    return float(year_fraction(settlement_date, maturity_date, "Actual/Actual"))
 
 
 @validate_call
-def compute_continuous_price(face_value: float, annual_yield: float, time_to_maturity: float) -> float:
+def compute_continuous_price(
+    face_value: float,
+    annual_yield: float,
+    time_to_maturity: float,
+    precision: Optional[PrecisionMode] = None,
+) -> float:
     """
     Compute the price of a zero-coupon gilt using continuous compounding.
 
@@ -137,15 +149,17 @@ def compute_continuous_price(face_value: float, annual_yield: float, time_to_mat
     :type annual_yield: float
     :param time_to_maturity: Time to maturity in years.
     :type time_to_maturity: float
-    :return: The price of the zero-coupon gilt rounded to 2 decimal places.
+    :param precision: "reporting" to round to 2 decimal places, "raw" for full float64.
+                      Defaults to the current :func:`~fift_analytics.gilts.precision.precision_mode`.
+    :type precision: Optional[str]
+    :return: The price of the zero-coupon gilt rounded to 2 decimal places (unrounded in "raw" mode).
     :rtype: float
     
     **Calculation Steps**:
         - If time_to_maturity is very small (approaching zero), return face value directly.
-        - Compute intermediate result using the continuous compounding formula:
+        - Compute the price using the continuous compounding formula:
           `P = F * exp(-r * t)`
-        - Round intermediate result to six decimal places for precision.
-        - Round final result to two decimal places for financial reporting standards.
+        - Round the result to two decimal places for financial reporting standards, unless in "raw" mode.
     
     :Example:
         >>> compute_continuous_price(1000, -0.01, 10)
@@ -156,15 +170,101 @@ def compute_continuous_price(face_value: float, annual_yield: float, time_to_mat
         raise ValueError("Time to maturity cannot be negative.")
     
     if time_to_maturity == 0 or time_to_maturity < 1 / 365:  # Less than one day
-        return round(face_value, 2)
+        return apply_precision(face_value, precision)
 
     # Continuous compounding formula: P = F * e^(-r * t)
-    intermediate_price = face_value * math.exp(-annual_yield * time_to_maturity)
+    price = face_value * math.exp(-annual_yield * time_to_maturity)
+
+    # Round to 2 decimal places (nearest penny) unless in raw mode
+    return apply_precision(price, precision)
+
+
+def get_zero_coupon_gilt_price_batch(
+    face_value,
+    annual_yield,
+    maturity_date,
+    settlement_date=None,
+    precision: Optional[PrecisionMode] = None,
+    dtype: OutputDType = "float64",
+    out=None,
+    errors: ErrorPolicy = "raise",
+) -> Union[np.ndarray, MaskedResult]:
+    """
+    Calculate the theoretical prices of many zero-coupon gilts using continuous compounding in one vectorised call.
 
-    # Round intermediate result to 6 decimal places
-    intermediate_price = round(intermediate_price, 6)
+    Array counterpart of :func:`get_zero_coupon_gilt_price`: all arguments are broadcast against each other
+    and dates can be 'YYYY-MM-DD' strings, ``datetime64`` values
+    or integer day ordinals. NumPy arrays, memoryviews and Arrow columns of float64, int64 day ordinals or
+    ``datetime64[D]`` are read without copying.
 
-    # Round final result to 2 decimal places (nearest penny)
-    final_price = round(intermediate_price, 2)
+    :param face_value: Face values of the bonds.
+    :param annual_yield: Annual yields to maturity as decimals.
+    :param maturity_date: Maturity dates.
+    :param settlement_date: Settlement dates. Defaults to today if not provided.
+    :param precision: "reporting" to round to 2 decimal places, "raw" for full float64.
+                      Defaults to the current :func:`~fift_analytics.gilts.precision.precision_mode`.
+    :param dtype: Output dtype, "float64" (default) or "float32". Prices are computed in float64 either way.
+    :param out: Optional writable float32 or float64 buffer receiving the results, e.g. a column of a frame.
+    :param errors: "raise" (default) to raise on the first invalid row, "mask" to price the valid rows only
+                   and return a :class:`~fift_analytics.gilts.row_errors.MaskedResult`.
+    :raises ValueError: If any face value is not positive, any date is invalid or any maturity
+                        date is not after its settlement date (with ``errors="raise"``).
+    :return: Prices of the zero-coupon gilts rounded to 2 decimal places (unrounded in "raw" mode).
+    :rtype: Union[np.ndarray, MaskedResult]
+
+    :Example:
+        >>> get_zero_coupon_gilt_price_batch(1000, [0.03, -0.01], "2035-02-17", "2025-02-17")
+        array([ 740.7 , 1105.23])
+    """
+    check_policy(errors)
+    face_value = np.asarray(face_value, dtype=np.float64)
+    if errors == "mask":
+        annual_yield = np.asarray(annual_yield, dtype=np.float64)
+        settlement_date = np.datetime64("today", "D") if settlement_date is None else settlement_date
+        settlement_date, maturity_date, error_code = validate_bond_rows(
+            settlement_date, maturity_date, face_value=face_value, numbers=(annual_yield,)
+        )
+        return evaluate_valid_rows(
+            get_zero_coupon_gilt_price_batch,
+            error_code,
+            {
+                "face_value": face_value,
+                "annual_yield": annual_yield,
+                "maturity_date": maturity_date,
+                "settlement_date": settlement_date,
+            },
+            out=out,
+            precision=precision,
+            dtype=dtype,
+        )
+
+    if np.any(face_value <= 0):
+        raise ValueError("Face value must be positive.")
+
+    settlement_date = np.datetime64("today", "D") if settlement_date is None else to_datetime64(settlement_date)
+    maturity_date = to_datetime64(maturity_date)
+    # NaT compares False with everything, so it would pass the maturity check and price at face value
+    if np.any(np.isnat(settlement_date)) or np.any(np.isnat(maturity_date)):
+        raise ValueError("Invalid date format. Use YYYY-MM-DD.")
+    if np.any(maturity_date <= settlement_date):
+        raise ValueError("Maturity date must be after the settlement date.")
+
+    price = _zero_coupon_price(face_value, annual_yield, settlement_date, maturity_date)
+
+    return cast_output(apply_precision(price, precision), dtype, out)
+
+
+def _zero_coupon_price(face_value, annual_yield, settlement_date, maturity_date) -> np.ndarray:
+    """
+    Unrounded continuous compounding price of zero-coupon gilts, settling at face value within 3 days of maturity.
+
+    :param face_value: Face values of the bonds.
+    :param annual_yield: Annual yields to maturity as decimals.
+    :param settlement_date: Settlement dates as ``datetime64[D]``.
+    :param maturity_date: Maturity dates as ``datetime64[D]``, after the settlement dates.
+    :return: Unrounded prices.
+    """
+    days_to_maturity = (maturity_date - settlement_date).astype(np.int64)
+    time_to_maturity = np.where(days_to_maturity < 3, 0.0, year_fraction(settlement_date, maturity_date))
 
-    return final_price
+    return face_value * np.exp(-np.asarray(annual_yield, dtype=np.float64) * time_to_maturity)
@@ -0,0 +1,95 @@
+import csv
+
+import pytest
+from fift_analytics.cli import main
+from fift_analytics.gilts.zero_coupon.zc_pricers import get_zero_coupon_gilt_price
+
+
+@pytest.fixture
+def files(tmp_path):
+    zero_coupon = tmp_path / "zc.csv"
+    zero_coupon.write_text("face_value,maturity_date,annual_yield\n1000,2035-02-17,0.03\n1000,2030-02-17,-0.01\n")
+    conventional = tmp_path / "conv.csv"
+    conventional.write_text(
+        "annual_coupon_rate,maturity_date,nominal_redemption_yield,nominal\n"
+        "0.04,2030-03-07,0.04,1000000\n0.04,2035-09-07,0.05,100\n"
+    )
+    curve = tmp_path / "curve.csv"
+    curve.write_text("date,tenor_months,yield\n2025-02-14,3,0.03\n2025-02-14,120,0.045\n")
+    return tmp_path
+
+
+def _read(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_batch_price_zero_coupon(files, capsys):
+    output = files / "out.csv"
+    assert main(["batch-price", "zero-coupon", str(files / "zc.csv"), "--settlement-date", "2025-02-17",
+                 "--output", str(output)]) == 0
+    rows = _read(output)
+    assert float(rows[0]["price"]) == get_zero_coupon_gilt_price(1000, 0.03, "2035-02-17", "2025-02-17")
+    report = capsys.readouterr().err
+    assert "rows/s" in report and "compute" in report and "peak RSS" in report
+    assert "allocations" not in report
+
+
+def test_trace_memory_adds_stage_allocations(files, capsys):
+    main(["curve", str(files / "curve.csv"), "3", "--trace-memory"])
+    report = capsys.readouterr().err
+    assert "peak RSS" in report and "allocations (main process, excludes worker processes)" in report
+    assert [line.split()[0] for line in report.splitlines()[-3:]] == ["read", "compute", "write"]
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_conventional_risk_parallel_matches_serial(files, executor):
+    serial, parallel = files / "serial.csv", files / "parallel.csv"
+    args = ["risk", "conventional", str(files / "conv.csv"), "--settlement-date", "2025-03-07"]
+    main(args + ["--output", str(serial)])
+    main(args + ["--output", str(parallel), "--workers", "2", "--chunk-size", "1", "--executor", executor])
+    assert _read(serial) == _read(parallel)
+    assert float(_read(serial)[0]["dv01"]) == 449.01
+
+
+@pytest.mark.parametrize("command", ["batch-price", "risk"])
+def test_conventional_settlement_defaults_to_today(files, command):
+    output = files / "out.csv"
+    assert main([command, "conventional", str(files / "conv.csv"), "--output", str(output)]) == 0
+    assert len(_read(output)) == 2
+
+
+def test_settlement_date_column_settles_each_row(files, capsys):
+    positions, output = files / "settled.csv", files / "out.csv"
+    positions.write_text(
+        "face_value,maturity_date,annual_yield,settlement_date\n"
+        "1000,2035-02-17,0.03,2025-02-17\n1000,2035-02-17,0.03,2020-01-01\n"
+    )
+    assert main(["batch-price", "zero-coupon", str(positions), "--output", str(output)]) == 0
+    prices = [float(row["price"]) for row in _read(output)]
+    assert prices == [
+        get_zero_coupon_gilt_price(1000, 0.03, "2035-02-17", "2025-02-17"),
+        get_zero_coupon_gilt_price(1000, 0.03, "2035-02-17", "2020-01-01"),
+    ]
+
+    with pytest.raises(SystemExit):
+        main(["batch-price", "zero-coupon", str(positions), "--settlement-date", "2025-02-17"])
+    assert "not both" in capsys.readouterr().err
+
+
+def test_risk_from_curve(files):
+    output = files / "out.csv"
+    main(["risk", "zero-coupon", str(files / "zc.csv"), "--settlement-date", "2025-02-17",
+          "--curve", str(files / "curve.csv"), "--output", str(output)])
+    assert float(_read(output)[0]["annual_yield"]) == pytest.approx(0.045, abs=1e-4)
+
+
+def test_curve_interpolation(files, capsys):
+    main(["curve", str(files / "curve.csv"), "3", "120"])
+    assert capsys.readouterr().out.splitlines()[1:] == ["3.0,0.03", "120.0,0.045"]
+
+
+def test_missing_columns(files, capsys):
+    with pytest.raises(SystemExit):
+        main(["risk", "zero-coupon", str(files / "conv.csv")])
+    assert "Missing columns in position file" in capsys.readouterr().err
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from fift_analytics.gilts.curve_factors import (
+    FactorSensitivities,
+    factor_node_shocks,
+    factor_scores,
+    fit_curve_factors,
+    simulate_factor_moves,
+)
+from fift_analytics.gilts.curve_sensitivities import build_fixed_coupon_sensitivities
+
+TENORS = np.array([3, 12, 24, 60, 120, 240, 360])
+
+
+def make_history(n_curves=500, seed=1):
+    rng = np.random.default_rng(seed)
+    level, slope, curvature = rng.standard_normal((3, n_curves, 1)) * np.array([6e-4, 3e-4, 1e-4])[:, None, None]
+    x = TENORS / 360
+    moves = level + slope * (x - 0.5) + curvature * (x - 0.5) ** 2 + 1e-6 * rng.standard_normal((n_curves, TENORS.size))
+    yields = 0.04 + np.cumsum(moves, axis=0)
+    return [list(zip(TENORS.tolist(), row.tolist())) for row in yields]
+
+
+def test_three_factors_explain_a_three_factor_history():
+    model = fit_curve_factors(make_history())
+    assert model.loadings.shape == (3, TENORS.size)
+    assert model.explained_variance_ratio.sum() > 0.999
+    np.testing.assert_allclose(model.loadings @ model.loadings.T, np.eye(3), atol=1e-12)
+    assert (model.loadings[0] > 0).all()
+    assert (np.diff(model.explained_variance_ratio) < 0).all()
+
+
+def test_factor_scores_reconstruct_curve_changes():
+    history = make_history()
+    model = fit_curve_factors(history)
+    changes = factor_node_shocks(model, factor_scores(model, history))
+    yields = np.array([[y for _, y in curve] for curve in history])
+    np.testing.assert_allclose(changes, np.diff(yields, axis=0), atol=1e-5)
+
+
+def test_factor_pnl_matches_full_reprice():
+    history = make_history()
+    model = fit_curve_factors(history)
+    zero_curve = [(3, 0.041), (24, 0.039), (60, 0.042), (120, 0.045), (360, 0.048)]
+    book = build_fixed_coupon_sensitivities(
+        [0.04, 0.0125, 0.0425], [1e6, 2e6, 5e5], "2025-03-07", ["2030-03-07", "2026-07-22", "2055-12-07"], zero_curve
+    )
+    factors = FactorSensitivities(book, model)
+    assert factors.exposure.shape == (3, 3)
+
+    moves = simulate_factor_moves(model, 50, horizon=20, seed=3)
+    pnl = factors.scenario_pnl(moves)
+    full = factors.full_reprice(moves)
+    assert np.abs(pnl - full).max() < 1e-2 * np.abs(full).max()
+    assert np.abs(factors.scenario_pnl(moves, second_order=False) - full).max() > np.abs(pnl - full).max()
+    np.testing.assert_allclose(factors.scenario_pnl(moves, bonds=[2]), pnl[:, [2]])
+
+
+def test_invalid_inputs():
+    history = make_history(n_curves=10)
+    with pytest.raises(ValueError, match="at least two changes"):
+        fit_curve_factors(history[:2])
+    with pytest.raises(ValueError, match="Number of factors"):
+        fit_curve_factors(history, n_factors=8)
+    model = fit_curve_factors(history, n_factors=2)
+    book = build_fixed_coupon_sensitivities([0.04], [1e6], "2025-03-07", ["2030-03-07"], [(3, 0.04), (120, 0.045)])
+    with pytest.raises(ValueError, match="Factor moves"):
+        FactorSensitivities(book, model).scenario_pnl([0.001, 0.0, 0.0])
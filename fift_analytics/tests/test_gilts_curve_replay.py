@@ -0,0 +1,88 @@
+import csv
+import numpy as np
+import pytest
+from fift_analytics.gilts.curve_replay import (
+    CurveReplay,
+    CurveSnapshot,
+    read_curve_snapshots,
+    write_replay_results,
+)
+from fift_analytics.gilts.fixed_coupon.dmo_fixed_pricers import calculate_fixed_coupon_gilt_price_dmo
+
+FLAT_CURVE = [(3, 0.04), (120, 0.04), (360, 0.04)]
+
+
+def write_curves(path, dates, curve):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["date", "tenor_months", "yield"])
+        for date in dates:
+            for tenor, value in curve:
+                writer.writerow([date, tenor, value])
+
+
+def test_read_curve_snapshots_is_lazy_and_grouped(tmp_path):
+    path = tmp_path / "curves.csv"
+    write_curves(path, ["2025-01-02", "2025-01-03"], FLAT_CURVE)
+    snapshots = read_curve_snapshots(path)
+    first = next(snapshots)
+    assert first.date == np.datetime64("2025-01-02")
+    assert first.zero_curve == FLAT_CURVE
+    assert next(snapshots).date == np.datetime64("2025-01-03")
+
+
+def test_read_curve_snapshots_rejects_unordered_dates(tmp_path):
+    path = tmp_path / "curves.csv"
+    write_curves(path, ["2025-01-03", "2025-01-02"], FLAT_CURVE)
+    with pytest.raises(ValueError, match="ascending date order"):
+        list(read_curve_snapshots(path))
+
+
+def test_replay_prices_match_dmo_pricer():
+    replay = CurveReplay("2025-01-02", [0.04], ["2030-03-07"], [100])
+    result = replay.step(CurveSnapshot(np.datetime64("2025-01-02"), FLAT_CURVE))
+    expected = calculate_fixed_coupon_gilt_price_dmo(100, 0.04, "2025-01-02", "2030-03-07", 0.04, precision="raw")
+    assert result.price[0] == pytest.approx(expected)
+    assert result.pnl == 0.0
+
+
+def test_replay_pnl_adds_up_to_cashflows_over_life():
+    days = np.arange(np.datetime64("2025-01-02"), np.datetime64("2031-01-01"))
+    replay = CurveReplay("2025-01-02", [0.04], ["2030-03-07"], [100], ["2027-06-07"], [100])
+    results = replay.run(CurveSnapshot(day, FLAT_CURVE) for day in days)
+    first = next(results)
+    total_cash = 0.0
+    for last in results:
+        total_cash += last.cash
+    # 11 coupons of 2 and the redemption of both bonds
+    assert total_cash == pytest.approx(222.0)
+    assert last.cumulative_pnl == pytest.approx(total_cash - first.market_value)
+    assert last.market_value == 0.0
+
+
+def test_replay_rebalance_is_applied_next_day():
+    def hedge(result):
+        return np.array([100.0, -result.instrument_dv01[0] * 100 / result.instrument_dv01[1]])
+
+    replay = CurveReplay("2025-01-02", [0.04], ["2030-03-07"], [100], ["2029-06-07"], [0], rebalance=hedge)
+    curves = [FLAT_CURVE, [(3, 0.041), (120, 0.041), (360, 0.041)]]
+    days = [np.datetime64("2025-01-02"), np.datetime64("2025-01-03")]
+    results = list(replay.run(CurveSnapshot(d, c) for d, c in zip(days, curves)))
+    assert results[1].nominal[1] < 0
+    assert abs(results[1].pnl) < 0.05 * abs(results[1].nominal[0] / 100 * results[0].instrument_dv01[0] * 10)
+
+
+def test_write_replay_results_streams_rows(tmp_path):
+    days = np.arange(np.datetime64("2025-01-02"), np.datetime64("2025-01-12"))
+    replay = CurveReplay("2025-01-02", [0.04], ["2030-03-07"], [100])
+    path = tmp_path / "pnl.csv"
+    assert write_replay_results(replay.run(CurveSnapshot(d, FLAT_CURVE) for d in days), path) == 10
+    with open(path) as f:
+        rows = list(csv.DictReader(f))
+    assert rows[0]["date"] == "2025-01-02"
+    assert len(rows) == 10
+
+
+def test_replay_rejects_mismatched_lengths():
+    with pytest.raises(ValueError, match="matching lengths"):
+        CurveReplay("2025-01-02", [0.04, 0.05], ["2030-03-07"], [100])
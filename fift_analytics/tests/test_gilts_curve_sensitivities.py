@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from fift_analytics.gilts.curve_sensitivities import (
+    build_fixed_coupon_sensitivities,
+    build_zero_coupon_sensitivities,
+    curve_node_weights,
+)
+from fift_analytics.gilts.zero_coupon.curve_yield_extrapolation import derive_yield_from_zero_curve_batch
+
+ZERO_CURVE = [(3, 0.03), (12, 0.035), (60, 0.04), (120, 0.045), (360, 0.05)]
+TENORS = np.array([3, 12, 60, 120, 360])
+
+
+def _shifted_curve(shocks):
+    return [(tenor, y + shock) for (tenor, y), shock in zip(ZERO_CURVE, shocks)]
+
+
+def test_node_weights_reproduce_interpolation():
+    targets = np.array([1, 7, 60, 200, 400])
+    tenors, weights = curve_node_weights(ZERO_CURVE, targets)
+    np.testing.assert_array_equal(tenors, TENORS)
+    curve_yields = np.array([y for _, y in ZERO_CURVE])
+    np.testing.assert_allclose(weights @ curve_yields, derive_yield_from_zero_curve_batch(ZERO_CURVE, targets))
+
+
+def test_zero_coupon_delta_gamma_close_to_full_reprice():
+    book = build_zero_coupon_sensitivities(
+        [1_000_000, 2_000_000], ["2030-02-17", "2041-06-30"], ZERO_CURVE, "2025-02-17"
+    )
+    shocks = np.array([[0.001, 0.0005, -0.0005, 0.001, 0.002], [0.0, 0.0, 0.0, 0.0, 0.0]])
+    result = book.reprice(shocks)
+    full = book.full_reprice(shocks)
+    np.testing.assert_allclose(result.pnl, full, rtol=1e-2, atol=1e-6)
+    np.testing.assert_allclose(result.error_estimate, np.abs(result.pnl - full).max(axis=1))
+
+
+def test_fixed_coupon_full_reprice_matches_shifted_curve():
+    args = ([0.04, 0.0125], [1_000_000, 500_000], "2025-03-07", ["2030-03-07", "2026-07-22"])
+    book = build_fixed_coupon_sensitivities(*args, ZERO_CURVE)
+    shocks = np.array([0.0, 0.001, 0.002, 0.0, 0.0])
+    shifted = build_fixed_coupon_sensitivities(*args, _shifted_curve(shocks))
+    np.testing.assert_allclose(book.full_reprice(shocks)[0], shifted.price - book.price)
+    result = book.reprice(shocks, n_checked=1)
+    assert result.checked_bonds.size == 1
+    np.testing.assert_allclose(result.pnl[0], shifted.price - book.price, rtol=1e-3)
+
+
+def test_fixed_coupon_scalar_coupon_and_nominal_broadcast():
+    maturity = ["2030-03-07", "2026-07-22"]
+    book = build_fixed_coupon_sensitivities(0.04, 1_000_000, "2025-03-07", maturity, ZERO_CURVE)
+    expected = build_fixed_coupon_sensitivities([0.04, 0.04], [1_000_000] * 2, "2025-03-07", maturity, ZERO_CURVE)
+    np.testing.assert_array_equal(book.price, expected.price)
+    shocks = np.array([0.0, 0.001, 0.002, 0.0, 0.0])
+    np.testing.assert_array_equal(book.full_reprice(shocks), expected.full_reprice(shocks))
+
+
+def test_delta_matches_finite_difference_on_node():
+    book = build_zero_coupon_sensitivities([1_000_000], ["2032-02-17"], ZERO_CURVE, "2025-02-17")
+    bump = np.zeros(5)
+    bump[2] = 0.0001
+    up = build_zero_coupon_sensitivities([1_000_000], ["2032-02-17"], _shifted_curve(bump), "2025-02-17")
+    assert book.delta[0, 2] * 0.0001 == pytest.approx(up.price[0] - book.price[0], rel=1e-3)
+
+
+def test_invalid_node_shocks():
+    book = build_zero_coupon_sensitivities([100], ["2030-02-17"], ZERO_CURVE, "2025-02-17")
+    with pytest.raises(ValueError, match="Node shocks must have shape"):
+        book.reprice([0.001, 0.001])
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from datetime import datetime
+from fift_analytics.gilts.day_count import calculate_day_count, is_leap_year, year_fraction
+from fift_analytics.gilts.fixed_coupon.fixed_pricers import calculate_30_360_years, calculate_total_periods
+from fift_analytics.gilts.fixed_coupon.quasi_coupon import get_quasi_coupon_dates
+
+
+def test_is_leap_year_vectorised():
+    years = np.array([2023, 2024, 1900, 2000])
+    np.testing.assert_array_equal(is_leap_year(years), [False, True, False, True])
+    assert is_leap_year(2024) is True
+
+
+def test_actual_actual_uses_start_year_length():
+    result = year_fraction(["2024-02-17", "2025-02-17"], ["2034-02-17", "2035-02-17"], "Actual/Actual")
+    np.testing.assert_allclose(result, [3653 / 366, 3652 / 365])
+
+
+def test_actual_365():
+    assert year_fraction("2024-01-01", "2025-01-01", "Actual/365") == pytest.approx(366 / 365)
+
+
+def test_30_360_caps_days_at_30():
+    assert year_fraction("2025-01-31", "2025-07-31", "30/360") == pytest.approx(0.5)
+
+
+def test_accepts_day_ordinals():
+    start = np.datetime64("2025-02-17").astype(np.int64)
+    result = year_fraction(start, np.array([start + 365, start + 730]), "Actual/365")
+    np.testing.assert_allclose(result, [1.0, 2.0])
+
+
+def test_actual_actual_isma_counts_quasi_coupon_periods():
+    settlement = np.array(["2025-03-10", "2024-02-17"], dtype="datetime64[D]")
+    maturity = np.array(["2030-03-07", "2034-02-17"], dtype="datetime64[D]")
+    prior_date, next_date, n_periods = get_quasi_coupon_dates(settlement, maturity, 2)
+    expected = (n_periods + (next_date - settlement).astype(int) / (next_date - prior_date).astype(int)) / 2
+    np.testing.assert_allclose(year_fraction(settlement, maturity, "Actual/Actual (ISMA)"), expected)
+    assert year_fraction("2024-02-17", "2034-02-17", "Actual/Actual (ISMA)") == 10.0
+
+    # a whole year between coupon dates is 1 whatever the calendar year lengths, unlike start-year Actual/Actual
+    one_year = year_fraction("2023-09-07", "2024-09-07", "Actual/Actual (ISMA)")
+    assert one_year == 1.0
+    assert year_fraction("2023-09-07", "2024-09-07", "Actual/Actual") != 1.0
+    # between two dates that are not coupon dates, the schedule comes from the reference date
+    partial = year_fraction("2025-03-10", "2025-06-07", "Actual/Actual (ISMA)", reference_date="2030-03-07")
+    assert partial == pytest.approx(89 / 184 / 2)
+
+    day_count = calculate_day_count("2025-03-10", "2030-03-07", 2, "Actual/Actual (ISMA)")
+    assert day_count.n_periods == 9
+    assert calculate_total_periods(datetime(2025, 3, 10), datetime(2030, 3, 7), 2, "Actual/Actual (ISMA)") == 9
+
+
+def test_unsupported_convention():
+    with pytest.raises(ValueError, match="Unsupported day count convention."):
+        year_fraction("2025-01-01", "2026-01-01", "Actual/360")
+
+
+def test_day_count_periods_match_scalar():
+    settlement = ["2025-02-17", "2025-05-03", "2026-11-30"]
+    maturity = ["2035-02-17", "2031-01-31", "2055-06-15"]
+    for convention in ("Actual/Actual", "30/360", "Actual/365"):
+        result = calculate_day_count(settlement, maturity, 2, convention)
+        expected = [
+            calculate_total_periods(datetime.fromisoformat(s), datetime.fromisoformat(m), 2, convention)
+            for s, m in zip(settlement, maturity)
+        ]
+        np.testing.assert_array_equal(result.n_periods, expected)
+
+
+def test_calculate_30_360_years():
+    assert calculate_30_360_years(datetime(2025, 2, 17), datetime(2035, 2, 17)) == 10.0
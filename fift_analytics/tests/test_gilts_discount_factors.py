@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from fift_analytics.gilts.fixed_coupon.discount_factors import DiscountFactorTable
+from fift_analytics.gilts.fixed_coupon.fixed_pricers import (
+    calculate_fixed_coupon_gilt_price_with_curve,
+    calculate_fixed_coupon_gilt_price_with_curve_batch,
+)
+
+BOND_CURVE = list(np.linspace(0.03, 0.045, 60))
+
+
+def _loop_price(face_value, coupon_rate, n_periods, bond_curve, coupon_frequency):
+    coupon = face_value * coupon_rate / coupon_frequency
+    price = sum(coupon / (1 + bond_curve[i - 1] / coupon_frequency) ** i for i in range(1, n_periods + 1))
+    return price + face_value / (1 + bond_curve[n_periods - 1] / coupon_frequency) ** n_periods
+
+
+@pytest.mark.parametrize("coupon_frequency", [1, 2, 4])
+def test_table_matches_period_loop(coupon_frequency):
+    table = DiscountFactorTable(BOND_CURVE)
+    for n_periods in (1, 7, 60):
+        expected = _loop_price(100, 0.04, n_periods, BOND_CURVE, coupon_frequency)
+        assert table.price(100, 1.0 * 4 / coupon_frequency, n_periods, coupon_frequency) == pytest.approx(
+            expected, rel=1e-14
+        )
+
+
+def test_table_is_lazy_and_extends_on_demand():
+    table = DiscountFactorTable(BOND_CURVE)
+    assert table.n_cached(2) == 0
+    table.discount_factors(5)
+    assert table.n_cached(2) == 5 and table.n_cached(4) == 0
+    first = table.discount_factors(5).copy()
+    table.discount_factors(7)
+    assert table.n_cached(2) == 10
+    np.testing.assert_array_equal(table.discount_factors(5), first)
+
+
+def test_table_too_short():
+    with pytest.raises(ValueError, match="Bond curve must have at least"):
+        DiscountFactorTable([0.03] * 4).discount_factors(5)
+
+
+def test_batch_matches_scalar_with_shared_table():
+    table = DiscountFactorTable(BOND_CURVE)
+    maturities = ["2026-02-17", "2030-08-17", "2045-01-31", "2025-05-17"]
+    prices = calculate_fixed_coupon_gilt_price_with_curve_batch(
+        1000, 0.04, "2025-02-17", maturities, table, precision="raw"
+    )
+    for price, maturity in zip(prices, maturities):
+        expected = calculate_fixed_coupon_gilt_price_with_curve(
+            1000, 0.04, "2025-02-17", maturity, BOND_CURVE, precision="raw"
+        )
+        assert price == pytest.approx(expected, rel=1e-14)
+        assert calculate_fixed_coupon_gilt_price_with_curve(
+            1000, 0.04, "2025-02-17", maturity, table, precision="raw"
+        ) == pytest.approx(expected, rel=1e-14)
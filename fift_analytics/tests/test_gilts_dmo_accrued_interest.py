@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from fift_analytics.gilts.fixed_coupon.quasi_coupon import add_months, get_quasi_coupon_dates, get_ex_dividend_dates
+from fift_analytics.gilts.fixed_coupon.dmo_fixed_pricers import (
+    calculate_fixed_coupon_gilt_price_dmo,
+    calculate_fixed_coupon_gilt_price_dmo_batch,
+)
+from fift_analytics.gilts.fixed_coupon.dmo_accrued_interest import (
+    calculate_gilt_accrued_interest_batch,
+    calculate_gilt_clean_price_batch,
+)
+
+
+def test_add_months_clamps_to_month_end():
+    assert add_months(np.datetime64("2025-08-31"), -6) == np.datetime64("2025-02-28")
+    assert add_months(np.datetime64("2024-08-31"), -6) == np.datetime64("2024-02-29")
+
+
+def test_quasi_coupon_dates_bracket_settlement():
+    prior, next_, n = get_quasi_coupon_dates(["2025-05-01", "2025-03-07"], ["2030-03-07", "2030-03-07"])
+    assert list(prior) == [np.datetime64("2025-03-07"), np.datetime64("2025-03-07")]
+    assert list(next_) == [np.datetime64("2025-09-07"), np.datetime64("2025-09-07")]
+    assert list(n) == [9, 9]
+
+
+def test_quasi_coupon_dates_last_period():
+    prior, next_, n = get_quasi_coupon_dates("2030-01-15", "2030-03-07")
+    assert prior == np.datetime64("2029-09-07")
+    assert next_ == np.datetime64("2030-03-07")
+    assert n == 0
+
+
+def test_ex_dividend_date_is_seven_business_days_before_coupon():
+    # 7 March 2025 is a Friday
+    assert get_ex_dividend_dates("2025-03-07") == np.datetime64("2025-02-26")
+
+
+def test_accrued_interest_zero_on_coupon_date():
+    result = calculate_gilt_accrued_interest_batch(0.04, "2025-03-07", "2030-03-07")
+    assert result.accrued_interest == 0.0
+    assert not result.ex_dividend
+
+
+def test_accrued_interest_cum_dividend():
+    result = calculate_gilt_accrued_interest_batch(0.04, "2025-06-07", "2030-03-07")
+    assert result.accrued_interest == pytest.approx(2 * 92 / 184)
+
+
+def test_accrued_interest_ex_dividend_is_negative():
+    result = calculate_gilt_accrued_interest_batch(0.04, "2025-09-01", "2030-09-07")
+    assert result.ex_dividend
+    assert result.accrued_interest == pytest.approx(-2 * 6 / 184)
+
+
+def test_accrued_interest_invalid_dates():
+    with pytest.raises(ValueError, match="Settlement date must be before maturity date."):
+        calculate_gilt_accrued_interest_batch([0.04, 0.04], ["2025-01-01", "2031-01-01"], "2030-03-07")
+
+
+def test_dmo_price_at_par_on_coupon_date():
+    assert calculate_fixed_coupon_gilt_price_dmo(100, 0.04, "2025-03-07", "2030-03-07", 0.04) == 100.0
+
+
+def test_dmo_price_zero_yield_sums_cashflows():
+    # ex-dividend: remaining cashflows are 10 coupons of 2 plus redemption
+    assert calculate_fixed_coupon_gilt_price_dmo(100, 0.04, "2025-09-01", "2030-09-07", 0.0) == 120.0
+
+
+def test_dmo_batch_matches_scalar():
+    settlement = ["2025-02-17", "2025-06-30", "2025-09-01", "2029-12-01"]
+    maturity = ["2035-02-17", "2031-07-22", "2030-09-07", "2030-03-07"]
+    coupons = [0.05, 0.0425, 0.04, 0.0125]
+    yields = [0.03, 0.045, 0.041, 0.039]
+    batch = calculate_fixed_coupon_gilt_price_dmo_batch(coupons, settlement, maturity, yields)
+    scalar = [
+        calculate_fixed_coupon_gilt_price_dmo(100, c, s, m, y)
+        for c, s, m, y in zip(coupons, settlement, maturity, yields)
+    ]
+    np.testing.assert_array_equal(batch, scalar)
+
+
+def test_clean_price_is_dirty_minus_accrued():
+    result = calculate_gilt_clean_price_batch(
+        [0.04, 0.04], ["2025-06-07", "2025-09-01"], ["2030-03-07", "2030-09-07"], [0.045, 0.045]
+    )
+    np.testing.assert_allclose(result.clean_price, result.dirty_price - result.accrued_interest, atol=0.005)
+    assert list(result.ex_dividend) == [False, True]
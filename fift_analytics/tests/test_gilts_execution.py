@@ -0,0 +1,154 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+from fift_analytics.gilts.execution import (
+    ExecutionPolicy,
+    WorkBuffers,
+    allocation_stage,
+    estimate_row_bytes,
+    execution_policy,
+    parse_memory_size,
+    resolve_chunk_rows,
+    run_batch,
+    track_allocations,
+)
+from fift_analytics.gilts.fixed_coupon.dmo_fixed_pricers import calculate_fixed_coupon_gilt_price_dmo_batch
+from fift_analytics.gilts.parallel import map_batch
+from fift_analytics.gilts.scenario_pnl import calculate_fixed_coupon_scenario_pnl
+from fift_analytics.gilts.tick_stream import TickStream
+
+N_ROWS = 50_000
+COLUMNS = {
+    "annual_coupon_rate": np.full(N_ROWS, 0.04),
+    "settlement_date": "2025-03-07",
+    "maturity_date": np.datetime64("2026-03-07") + np.arange(N_ROWS) % 9000,
+    "nominal_redemption_yield": np.linspace(0.0, 0.08, N_ROWS),
+}
+
+
+def test_memory_sizes_and_chunk_rows():
+    assert parse_memory_size("512MB") == 512 * 2**20
+    assert parse_memory_size(4096) == 4096
+    assert parse_memory_size("512M") == 512 * 2**20
+    assert parse_memory_size("2G") == 2 * 2**30
+    assert parse_memory_size("1k") == 1024
+    with pytest.raises(ValueError, match="Unsupported memory size"):
+        parse_memory_size("512 MiB")
+    with pytest.raises(ValueError, match="Unsupported memory size"):
+        parse_memory_size("a lot")
+    with pytest.raises(ValueError, match="positive"):
+        parse_memory_size(0)
+
+    policy = ExecutionPolicy(memory_budget=100_000, min_chunk_rows=10, max_chunk_rows=500)
+    assert policy.chunk_rows(1_000) == 100
+    assert policy.chunk_rows(1_000_000) == 10
+    assert policy.chunk_rows(1) == 500
+    assert policy.chunk_rows(1_000, n_rows=42) == 42
+
+
+def test_explicit_chunk_size_and_default_outside_policy():
+    assert resolve_chunk_rows(7, 100.0, 1_000, default=50) == 7
+    assert resolve_chunk_rows(None, 100.0, 1_000, default=50) == 50
+    with execution_policy(10_000, min_chunk_rows=1):
+        assert resolve_chunk_rows(None, 100.0, 1_000, default=50) == 100
+    with pytest.raises(ValueError, match="Chunk size must be positive."):
+        resolve_chunk_rows(0, 100.0, 1_000)
+
+
+def test_run_batch_matches_one_call_within_budget():
+    expected = calculate_fixed_coupon_gilt_price_dmo_batch(**COLUMNS, precision="raw")
+    buffers = WorkBuffers()
+    with track_allocations() as tracker, execution_policy("1MB") as policy:
+        prices = run_batch(calculate_fixed_coupon_gilt_price_dmo_batch, COLUMNS, buffers=buffers, precision="raw")
+    np.testing.assert_array_equal(prices, expected)
+
+    stages = {stage.stage: stage for stage in tracker.report()}
+    rows = policy.chunk_rows(estimate_row_bytes(COLUMNS), N_ROWS)
+    assert stages["run_batch.evaluate"].calls == -(-N_ROWS // rows)
+    assert stages["run_batch.evaluate"].peak_bytes < policy.memory_budget
+    assert stages["run_batch"].peak_bytes >= stages["run_batch.evaluate"].peak_bytes
+    assert buffers.nbytes == 0
+    assert "run_batch.stage_inputs" in tracker.format_report()
+
+
+def test_run_batch_stages_only_string_dates():
+    buffers = WorkBuffers()
+    columns = {**COLUMNS, "maturity_date": COLUMNS["maturity_date"].astype(str)}
+    prices = run_batch(calculate_fixed_coupon_gilt_price_dmo_batch, columns, chunk_size=7_000, buffers=buffers)
+    np.testing.assert_array_equal(prices, calculate_fixed_coupon_gilt_price_dmo_batch(**COLUMNS))
+    assert buffers.nbytes == 8 * 7_000
+    for bad_date in ("x", "", "NaT", "2030-03"):
+        with pytest.raises(ValueError, match="Invalid date format"):
+            malformed = {**COLUMNS, "maturity_date": ["2030-03-07", bad_date] * (N_ROWS // 2)}
+            run_batch(calculate_fixed_coupon_gilt_price_dmo_batch, malformed)
+
+
+def test_run_batch_passes_other_object_columns_through():
+    buffers = WorkBuffers()
+    columns = {**COLUMNS, "nominal_redemption_yield": COLUMNS["nominal_redemption_yield"].astype(object)}
+    prices = run_batch(calculate_fixed_coupon_gilt_price_dmo_batch, columns, chunk_size=7_000, buffers=buffers)
+    np.testing.assert_array_equal(prices, calculate_fixed_coupon_gilt_price_dmo_batch(**COLUMNS))
+    assert buffers.nbytes == 0
+
+
+def test_run_batch_writes_into_out_and_dtype():
+    out = np.empty(N_ROWS, dtype=np.float32)
+    result = run_batch(calculate_fixed_coupon_gilt_price_dmo_batch, COLUMNS, chunk_size=7_000, out=out)
+    assert result is out
+    np.testing.assert_allclose(out, calculate_fixed_coupon_gilt_price_dmo_batch(**COLUMNS), rtol=1e-6)
+    with pytest.raises(ValueError, match="one element per row"):
+        run_batch(calculate_fixed_coupon_gilt_price_dmo_batch, COLUMNS, out=np.empty(3))
+
+
+def test_map_batch_chunks_share_the_budget():
+    seen = []
+
+    def record(annual_yield):
+        seen.append(annual_yield.size)
+        return annual_yield
+
+    with execution_policy(64_000, min_chunk_rows=1):
+        map_batch(record, {"annual_yield": np.zeros(10_000)}, workers=2)
+    assert max(seen) <= 64_000 // (2 * estimate_row_bytes({"annual_yield": np.zeros(1)}))
+    assert sum(seen) == 10_000
+
+
+def test_tracker_keeps_thread_stages_apart_and_outer_peak():
+    def priced_in_stage(annual_yield):
+        with allocation_stage("worker"):
+            with allocation_stage("price"):
+                return annual_yield * 2
+
+    tracemalloc.start()
+    try:
+        block = np.ones(2**20)
+        del block
+        with track_allocations() as tracker:
+            with allocation_stage("run"):
+                map_batch(priced_in_stage, {"annual_yield": np.zeros(10_000)}, workers=4, chunk_size=100)
+        outer_peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    stages = {stage.stage: stage.calls for stage in tracker.report()}
+    assert stages == {"run": 1, "worker": 100, "worker.price": 100}
+    assert outer_peak >= 8 * 2**20
+
+
+def test_scenario_cube_and_tick_stream_follow_the_policy():
+    arguments = ([0.04, 0.0425], [1e6, 2e6], "2025-03-07", ["2030-03-07", "2055-12-07"], [0.04, 0.045])
+    shocks = np.linspace(-0.01, 0.01, 301)
+    expected = calculate_fixed_coupon_scenario_pnl(*arguments, shocks)
+    with track_allocations() as tracker, execution_policy(min_chunk_rows=1, max_chunk_rows=2):
+        np.testing.assert_array_equal(calculate_fixed_coupon_scenario_pnl(*arguments, shocks), expected)
+
+        maturity_date = ["2030-03-07", "2035-03-07", "2024-03-07"]
+        stream = TickStream("2025-03-07", ["A", "B", "C"], [0.04, 0.04, 0.05], maturity_date)
+        published = []
+        stream.subscribe(published.append)
+        stream.on_ticks(["A", "B", "C"], [0.04, 0.05, 0.04])
+        stream.drain()
+    assert {stage.stage for stage in tracker.report()} == {"scenario_pnl", "tick_stream.reprice"}
+    assert published[0].valid.tolist() == [True, True, False]
+    assert published[0].price[0] == 100.0
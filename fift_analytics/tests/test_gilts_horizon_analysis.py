@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from fift_analytics.gilts.horizon_analysis import calculate_fixed_coupon_horizon, calculate_zero_coupon_horizon
+from fift_analytics.gilts.fixed_coupon.dmo_fixed_pricers import calculate_fixed_coupon_gilt_price_dmo
+from fift_analytics.gilts.zero_coupon.zc_pricers import get_zero_coupon_gilt_price
+from fift_analytics.gilts.zero_coupon.curve_yield_extrapolation import (
+    derive_yield_from_zero_curve,
+    derive_yield_from_zero_curve_batch,
+)
+
+ZERO_CURVE = [(3, 0.03), (12, 0.035), (60, 0.04), (120, 0.045), (360, 0.05)]
+COUPONS = [0.04, 0.0125, 0.0425]
+MATURITIES = ["2030-03-07", "2026-07-22", "2031-07-22"]
+YIELDS = [0.041, 0.039, 0.045]
+
+
+def test_curve_batch_matches_scalar():
+    targets = [0, 2, 3, 7.5, 12, 100, 360, 480]
+    expected = [derive_yield_from_zero_curve(ZERO_CURVE, t) for t in targets]
+    np.testing.assert_allclose(derive_yield_from_zero_curve_batch(ZERO_CURVE, targets), expected)
+
+
+def test_fixed_coupon_horizon_matches_scalar_pricer():
+    dates = np.arange(np.datetime64("2025-01-02"), np.datetime64("2027-01-01"), 17)
+    grid = calculate_fixed_coupon_horizon(COUPONS, MATURITIES, dates, YIELDS, precision="raw")
+    assert grid.price.shape == (dates.size, 3)
+    for i, settlement in enumerate(dates):
+        for j, (coupon, maturity, ytm) in enumerate(zip(COUPONS, MATURITIES, YIELDS)):
+            if settlement < np.datetime64(maturity):
+                expected = calculate_fixed_coupon_gilt_price_dmo(100, coupon, str(settlement), maturity, ytm, "raw")
+                assert grid.price[i, j] == pytest.approx(expected, rel=1e-12)
+            else:
+                assert np.isnan(grid.price[i, j])
+
+
+def test_zero_coupon_horizon_matches_scalar_pricer():
+    dates = ["2025-02-17", "2026-05-01", "2029-12-31"]
+    grid = calculate_zero_coupon_horizon([100, 1000], ["2030-02-17", "2035-02-17"], dates, [0.04, 0.045])
+    for i, settlement in enumerate(dates):
+        assert grid.price[i, 0] == get_zero_coupon_gilt_price(100, 0.04, "2030-02-17", settlement)
+        assert grid.price[i, 1] == get_zero_coupon_gilt_price(1000, 0.045, "2035-02-17", settlement)
+
+
+def test_horizon_dv01_positive():
+    grid = calculate_zero_coupon_horizon(1000000, ["2035-02-17"], ["2025-02-17"], [0.05], precision="raw")
+    assert grid.dv01[0, 0] > 0
+
+
+def test_rolldown_uses_remaining_maturity_yield():
+    grid = calculate_zero_coupon_horizon(100, ["2035-02-17"], ["2025-02-17", "2030-02-17"], zero_curve=ZERO_CURVE)
+    assert grid.annual_yield[0, 0] == pytest.approx(0.045, abs=1e-4)
+    assert grid.annual_yield[1, 0] == pytest.approx(0.04, abs=1e-4)
+
+
+def test_forward_equals_spot_on_curve_date():
+    grid = calculate_zero_coupon_horizon(
+        100, ["2035-02-17"], ["2025-02-17", "2030-02-17"], zero_curve=ZERO_CURVE, curve_mode="forward"
+    )
+    assert grid.annual_yield[0, 0] == pytest.approx(0.045, abs=1e-4)
+    assert grid.annual_yield[1, 0] == pytest.approx(0.05, abs=1e-3)
+
+
+def test_bond_matured_before_the_horizon_is_nan():
+    dates = ["2025-03-07", "2025-09-07"]
+    for curve_mode in ("rolldown", "forward"):
+        zero_grid = calculate_zero_coupon_horizon(
+            100, ["2024-02-17", "2035-02-17"], dates, zero_curve=ZERO_CURVE, curve_mode=curve_mode
+        )
+        fixed_grid = calculate_fixed_coupon_horizon(
+            [0.04, 0.04], ["2024-03-07", "2030-03-07"], dates, zero_curve=ZERO_CURVE, curve_mode=curve_mode
+        )
+        for grid in (zero_grid, fixed_grid):
+            assert np.isnan(grid.price[:, 0]).all() and np.isnan(grid.dv01[:, 0]).all()
+            assert np.isfinite(grid.price[:, 1]).all()
+
+    alone = calculate_zero_coupon_horizon(100, ["2035-02-17"], dates, zero_curve=ZERO_CURVE, curve_mode="forward")
+    np.testing.assert_array_equal(zero_grid.price[:, 1], alone.price[:, 0])
+
+
+def test_horizon_requires_one_yield_source():
+    with pytest.raises(ValueError, match="Provide exactly one of annual_yield or zero_curve."):
+        calculate_zero_coupon_horizon(100, ["2035-02-17"], ["2025-02-17"])
+    with pytest.raises(ValueError, match="Provide exactly one of annual_yield or zero_curve."):
+        calculate_fixed_coupon_horizon([0.04], ["2035-02-17"], ["2025-02-17"], [0.04], zero_curve=ZERO_CURVE)
@@ -0,0 +1,79 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from fift_analytics.gilts.fixed_coupon.discount_factors import DiscountFactorTable
+from fift_analytics.gilts.fixed_coupon.dmo_accrued_interest import calculate_gilt_clean_price_batch
+from fift_analytics.gilts.fixed_coupon.fixed_pricers import calculate_fixed_coupon_gilt_price_with_curve_batch
+from fift_analytics.gilts.parallel import map_batch
+from fift_analytics.gilts.precision import precision_mode
+from fift_analytics.gilts.uk_calendar import get_uk_calendar
+from fift_analytics.gilts.zero_coupon.zc_pricers import get_zero_coupon_gilt_price_batch
+
+MATURITIES = np.datetime64("2025-02-17") + np.arange(30, 30 + 1000 * 11, 11).astype("timedelta64[D]")
+YIELDS = np.linspace(-0.01, 0.06, MATURITIES.size)
+
+
+def test_thread_map_matches_single_call():
+    columns = {"face_value": 100.0, "annual_yield": YIELDS, "maturity_date": MATURITIES}
+    expected = get_zero_coupon_gilt_price_batch(100.0, YIELDS, MATURITIES, "2025-02-17")
+    result = map_batch(
+        get_zero_coupon_gilt_price_batch, columns, workers=4, chunk_size=128, settlement_date="2025-02-17"
+    )
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_thread_map_inherits_precision_context():
+    columns = {"face_value": 100.0, "annual_yield": YIELDS, "maturity_date": MATURITIES}
+    with precision_mode("raw"):
+        result = map_batch(get_zero_coupon_gilt_price_batch, columns, workers=2, chunk_size=100,
+                           settlement_date="2025-02-17")
+    assert not np.array_equal(result, np.round(result, 2))
+
+
+def test_process_map_and_named_tuples():
+    columns = {"annual_coupon_rate": 0.04, "maturity_date": MATURITIES[200:260], "nominal_redemption_yield": 0.05}
+    expected = calculate_gilt_clean_price_batch(0.04, "2025-02-17", MATURITIES[200:260], 0.05)
+    result = map_batch(calculate_gilt_clean_price_batch, columns, workers=2, chunk_size=16, executor="process",
+                       settlement_date="2025-02-17")
+    assert type(result) is type(expected)
+    np.testing.assert_array_equal(result.clean_price, expected.clean_price)
+
+
+def test_unsupported_executor():
+    with pytest.raises(ValueError, match="Unsupported executor"):
+        map_batch(get_zero_coupon_gilt_price_batch, {"face_value": [100]}, executor="fork")
+
+
+def test_discount_factor_table_concurrent_extension():
+    bond_curve = np.linspace(0.03, 0.05, 400)
+    shared = DiscountFactorTable(bond_curve)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda n: shared.discount_factors(n), range(1, 401)))
+    np.testing.assert_array_equal(shared.discount_factors(400), DiscountFactorTable(bond_curve).discount_factors(400))
+
+
+def test_process_map_with_discount_factor_table():
+    table = DiscountFactorTable(np.linspace(0.03, 0.05, 400))
+    table.discount_factors(10)
+    columns = {"face_value": 100.0, "annual_coupon_rate": 0.04, "maturity_date": MATURITIES[:60]}
+    expected = calculate_fixed_coupon_gilt_price_with_curve_batch(
+        100.0, 0.04, "2025-02-17", MATURITIES[:60], table, precision="raw"
+    )
+    result = map_batch(
+        calculate_fixed_coupon_gilt_price_with_curve_batch, columns, workers=2, chunk_size=16, executor="process",
+        settlement_date="2025-02-17", bond_curve=table, precision="raw",
+    )
+    np.testing.assert_array_equal(result, expected)
+
+    copy = pickle.loads(pickle.dumps(table))
+    assert not copy.bond_curve.flags.writeable and not copy.discount_factors(10).flags.writeable
+    np.testing.assert_array_equal(copy.discount_factors(400), table.discount_factors(400))
+
+
+def test_uk_calendar_is_shared_and_read_only():
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        calendars = list(pool.map(lambda _: get_uk_calendar(), range(8)))
+    assert all(calendar is calendars[0] for calendar in calendars)
+    assert not calendars[0].business_days.flags.writeable
@@ -0,0 +1,61 @@
+import math
+import numpy as np
+import pytest
+from fift_analytics.gilts.precision import apply_precision, get_precision_mode, precision_mode, round_for_reporting
+from fift_analytics.gilts.zero_coupon.zc_pricers import compute_continuous_price, get_zero_coupon_gilt_price
+from fift_analytics.gilts.zero_coupon.zc_dvone import calculate_zero_coupon_bond_dv01
+from fift_analytics.gilts.fixed_coupon.dmo_fixed_pricers import (
+    calculate_fixed_coupon_gilt_price_dmo,
+    calculate_fixed_coupon_gilt_price_dmo_batch,
+)
+
+
+def test_default_mode_is_reporting():
+    assert get_precision_mode() == "reporting"
+
+
+def test_invalid_precision_mode():
+    with pytest.raises(ValueError, match="Unsupported precision mode."):
+        get_precision_mode("exact")
+
+
+def test_raw_per_call():
+    assert compute_continuous_price(1000, 0.03, 10, "raw") == 1000 * math.exp(-0.3)
+
+
+def test_raw_context_is_restored():
+    with precision_mode("raw"):
+        assert get_zero_coupon_gilt_price(1000, 0.03, "2035-02-17", "2025-02-17") != 740.7
+    assert get_zero_coupon_gilt_price(1000, 0.03, "2035-02-17", "2025-02-17") == 740.7
+
+
+def test_per_call_overrides_context():
+    with precision_mode("raw"):
+        assert compute_continuous_price(1000, 0.03, 10, "reporting") == 740.82
+
+
+def test_dmo_raw_rounds_to_reporting():
+    raw = calculate_fixed_coupon_gilt_price_dmo(100, 0.0425, "2025-06-30", "2031-07-22", 0.045, precision="raw")
+    reported = calculate_fixed_coupon_gilt_price_dmo(100, 0.0425, "2025-06-30", "2031-07-22", 0.045)
+    assert round_for_reporting(raw) == reported
+
+
+def test_dmo_batch_raw_is_unrounded():
+    raw = calculate_fixed_coupon_gilt_price_dmo_batch([0.04, 0.05], "2025-06-30", "2031-07-22", 0.045, precision="raw")
+    np.testing.assert_array_equal(round_for_reporting(raw), calculate_fixed_coupon_gilt_price_dmo_batch(
+        [0.04, 0.05], "2025-06-30", "2031-07-22", 0.045
+    ))
+    assert not np.array_equal(raw, np.round(raw, 2))
+
+
+def test_dv01_raw_uses_unrounded_prices():
+    dv01 = calculate_zero_coupon_bond_dv01(100, 0.04, "2035-02-17", "2025-02-17", precision="raw")
+    price = get_zero_coupon_gilt_price(100, 0.04, "2035-02-17", "2025-02-17", "raw")
+    price_up = get_zero_coupon_gilt_price(100, 0.0401, "2035-02-17", "2025-02-17", "raw")
+    assert dv01 == pytest.approx(price - price_up, rel=1e-12)
+
+
+def test_apply_precision_array():
+    values = np.array([1.234, 5.678])
+    np.testing.assert_array_equal(apply_precision(values, "reporting"), [1.23, 5.68])
+    assert apply_precision(values, "raw") is values
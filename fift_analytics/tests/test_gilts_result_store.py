@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+from fift_analytics.gilts.fixed_coupon.discount_factors import DiscountFactorTable
+from fift_analytics.gilts import result_store
+from fift_analytics.gilts.result_store import ResultStore
+from fift_analytics.gilts.zero_coupon.zc_pricers import get_zero_coupon_gilt_price_batch
+from fift_analytics.gilts.zero_coupon.zc_dvone import (
+    calculate_zero_coupon_bond_dv01,
+    calculate_zero_coupon_bond_dv01_batch,
+)
+from fift_analytics.gilts.fixed_coupon.dmo_fixed_pricers import calculate_fixed_coupon_gilt_price_dmo_batch
+
+COLUMNS = {
+    "face_value": [1000, 1000, 500],
+    "annual_yield": [0.03, -0.01, 0.04],
+    "maturity_date": ["2035-02-17", "2035-02-17", "2030-06-07"],
+    "settlement_date": "2025-02-17",
+}
+
+
+class CountingPricer:
+    def __init__(self):
+        self.rows = 0
+        self.__module__ = get_zero_coupon_gilt_price_batch.__module__
+        self.__qualname__ = get_zero_coupon_gilt_price_batch.__qualname__
+
+    def __call__(self, **kwargs):
+        self.rows += np.size(kwargs["face_value"])
+        return get_zero_coupon_gilt_price_batch(**kwargs)
+
+
+def test_keys_are_deterministic_and_distinct(tmp_path):
+    store = ResultStore(tmp_path)
+    keys = store.make_keys("f", COLUMNS, "v1")
+    np.testing.assert_array_equal(keys, store.make_keys("f", COLUMNS, "v1"))
+    assert len(set(keys.tolist())) == 3
+    assert not np.any(keys == store.make_keys("f", COLUMNS, "v2"))
+    assert not np.any(keys == ResultStore(tmp_path, library_version="9.9.9").make_keys("f", COLUMNS, "v1"))
+
+
+def test_library_version_comes_from_the_installed_distribution(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_store, "version", lambda name: "1.2.3")
+    assert ResultStore(tmp_path).library_version == "1.2.3"
+    np.testing.assert_array_equal(
+        ResultStore(tmp_path).make_keys("f", COLUMNS), ResultStore(tmp_path, "1.2.3").make_keys("f", COLUMNS)
+    )
+
+
+def test_dates_are_normalised(tmp_path):
+    store = ResultStore(tmp_path)
+    as_datetime64 = dict(COLUMNS, maturity_date=np.array(COLUMNS["maturity_date"], dtype="datetime64[D]"))
+    np.testing.assert_array_equal(store.make_keys("f", COLUMNS), store.make_keys("f", as_datetime64))
+
+
+def test_options_are_hashed_in_full_and_normalised(tmp_path):
+    store = ResultStore(tmp_path)
+    columns = {"annual_yield": [0.03, 0.04]}
+    curve = np.linspace(0.03, 0.05, 2_000)
+    shifted = curve.copy()
+    shifted[1_000] += 1e-6
+    keys = store.make_keys("f", columns, options={"curve": curve})
+    assert not np.any(keys == store.make_keys("f", columns, options={"curve": shifted}))
+
+    as_string = store.make_keys("f", columns, options={"settlement_date": "2025-02-17", "precision": "raw"})
+    as_datetime64 = store.make_keys(
+        "f", columns, options={"settlement_date": np.datetime64("2025-02-17"), "precision": "raw"}
+    )
+    np.testing.assert_array_equal(as_string, as_datetime64)
+
+    ordinals = dict(COLUMNS, maturity_date=np.array(COLUMNS["maturity_date"], dtype="datetime64[D]").astype(np.int64))
+    np.testing.assert_array_equal(store.make_keys("f", COLUMNS), store.make_keys("f", ordinals))
+
+
+def test_curve_tables_hash_by_curve_and_objects_are_rejected(tmp_path):
+    store = ResultStore(tmp_path)
+    columns = {"annual_yield": [0.03, 0.04]}
+    curve = [0.03] * 20
+    keys = store.make_keys("f", columns, options={"bond_curve": DiscountFactorTable(curve)})
+    for same_curve in (DiscountFactorTable(curve), curve):
+        np.testing.assert_array_equal(keys, store.make_keys("f", columns, options={"bond_curve": same_curve}))
+    with pytest.raises(TypeError, match="Option 'pricer' cannot be hashed"):
+        store.make_keys("f", columns, options={"pricer": object()})
+
+
+def test_evaluate_only_computes_missing_rows(tmp_path):
+    pricer = CountingPricer()
+    first = ResultStore(tmp_path).evaluate(pricer, COLUMNS, "v1")
+    assert pricer.rows == 3
+
+    # rerun from a fresh process-level store with one changed row
+    changed = dict(COLUMNS, annual_yield=[0.03, -0.01, 0.05])
+    second = ResultStore(tmp_path).evaluate(pricer, changed, "v1")
+    assert pricer.rows == 4
+    np.testing.assert_array_equal(second[:2], first[:2])
+    np.testing.assert_array_equal(second, get_zero_coupon_gilt_price_batch(**changed))
+
+
+def test_evaluate_rejects_masked_results(tmp_path):
+    with pytest.raises(ValueError, match="errors='raise'"):
+        ResultStore(tmp_path).evaluate(get_zero_coupon_gilt_price_batch, COLUMNS, "v1", {"errors": "mask"})
+
+
+def test_new_curve_version_recomputes(tmp_path):
+    pricer = CountingPricer()
+    store = ResultStore(tmp_path)
+    store.evaluate(pricer, COLUMNS, "v1")
+    store.evaluate(pricer, COLUMNS, "v2")
+    assert pricer.rows == 6
+
+
+def test_options_are_part_of_the_key(tmp_path):
+    store = ResultStore(tmp_path)
+    columns = {
+        "annual_coupon_rate": [0.04, 0.05],
+        "settlement_date": "2025-06-30",
+        "maturity_date": "2031-07-22",
+        "nominal_redemption_yield": 0.045,
+    }
+    reported = store.evaluate(calculate_fixed_coupon_gilt_price_dmo_batch, columns, "v1")
+    raw = store.evaluate(calculate_fixed_coupon_gilt_price_dmo_batch, columns, "v1", {"precision": "raw"})
+    np.testing.assert_array_equal(reported, np.round(raw, 2))
+    assert not np.array_equal(reported, raw)
+
+
+def test_dv01_batch_matches_scalar():
+    maturities = ["2035-02-17", "2025-02-20", "2055-02-17"]
+    batch = calculate_zero_coupon_bond_dv01_batch(1000000, 0.05, maturities, "2025-02-17")
+    scalar = [calculate_zero_coupon_bond_dv01(1000000, 0.05, m, "2025-02-17") for m in maturities]
+    np.testing.assert_array_equal(batch, scalar)
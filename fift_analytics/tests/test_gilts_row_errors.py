@@ -0,0 +1,142 @@
+import numpy as np
+import pytest
+from fift_analytics.gilts.fixed_coupon.dmo_accrued_interest import calculate_gilt_clean_price_batch
+from fift_analytics.gilts.fixed_coupon.dmo_fixed_pricers import (
+    calculate_fixed_coupon_gilt_price_dmo,
+    calculate_fixed_coupon_gilt_price_dmo_batch,
+)
+from fift_analytics.gilts.fixed_coupon.fixed_pricers import calculate_fixed_coupon_gilt_price_with_curve_batch
+from fift_analytics.gilts.row_errors import MaskedResult, RowError, error_messages, flag_rows
+from fift_analytics.gilts.uk_calendar import to_datetime64_masked
+from fift_analytics.gilts.zero_coupon.zc_dvone import calculate_zero_coupon_bond_dv01_batch
+from fift_analytics.gilts.zero_coupon.zc_pricers import get_zero_coupon_gilt_price, get_zero_coupon_gilt_price_batch
+
+
+def test_to_datetime64_masked_flags_malformed_dates():
+    dates, valid = to_datetime64_masked(["2024-02-29", "2025-02-29", "2025-13-01", "2025-1-01", "", "2025-02-17"])
+    np.testing.assert_array_equal(valid, [True, False, False, True, False, True])
+    assert dates[0] == np.datetime64("2024-02-29")
+    assert np.isnat(dates[1])
+
+
+@pytest.mark.parametrize(
+    "maturity_date, expected", [("2035-2-17", "2035-02-17"), ("2035-02-7", "2035-02-07"), ("2035-2-7", "2035-02-07")]
+)
+def test_unpadded_month_and_day_are_valid_like_the_scalar_pricer(maturity_date, expected):
+    dates, valid = to_datetime64_masked([maturity_date, "2035-002-17", "2035-2-"])
+    np.testing.assert_array_equal(valid, [True, False, False])
+    assert dates[0] == np.datetime64(expected)
+    result = get_zero_coupon_gilt_price_batch(1000, 0.03, [maturity_date], "2025-02-17", errors="mask")
+    assert result.values[0] == get_zero_coupon_gilt_price(1000, 0.03, maturity_date, "2025-02-17")
+
+
+def test_partial_dates_are_invalid_in_a_clean_column():
+    dates, valid = to_datetime64_masked(["2030-03", "2030", "2030-03-07"])
+    np.testing.assert_array_equal(valid, [False, False, True])
+    mixed = np.array(["2030-03", np.datetime64("2030-03-07")], dtype=object)
+    np.testing.assert_array_equal(to_datetime64_masked(mixed)[1], [False, True])
+
+    result = calculate_fixed_coupon_gilt_price_dmo_batch(
+        0.04, "2025-03-07", ["2030-03", "2030-03-07"], 0.04, errors="mask"
+    )
+    np.testing.assert_array_equal(result.error_code, [RowError.INVALID_DATE, RowError.VALID])
+    assert np.isnan(result.values[0]) and result.values[1] == 100.0
+
+
+def test_flag_rows_first_failed_check_wins():
+    error_code = flag_rows(
+        (np.array([True, False, False]), RowError.NON_POSITIVE_FACE_VALUE),
+        (np.array([True, True, False]), RowError.INVALID_DATE),
+    )
+    np.testing.assert_array_equal(error_code, [1, 2, 0])
+
+
+def test_zero_coupon_mask_prices_valid_rows_like_scalar():
+    result = get_zero_coupon_gilt_price_batch(
+        [1000, 0, 1000, 1000, 1000],
+        [0.03, 0.03, 0.03, 0.03, np.inf],
+        ["2035-02-17", "2035-02-17", "2035/02/17", "2024-02-17", "2035-02-17"],
+        "2025-02-17",
+        errors="mask",
+    )
+    assert isinstance(result, MaskedResult)
+    np.testing.assert_array_equal(
+        result.error_code,
+        [
+            RowError.VALID,
+            RowError.NON_POSITIVE_FACE_VALUE,
+            RowError.INVALID_DATE,
+            RowError.MATURITY_NOT_AFTER_SETTLEMENT,
+            RowError.NON_FINITE_INPUT,
+        ],
+    )
+    assert result.values[0] == get_zero_coupon_gilt_price(1000, 0.03, "2035-02-17", "2025-02-17")
+    assert np.isnan(result.values[1:]).all()
+
+
+@pytest.mark.parametrize(
+    "face_value, maturity_date",
+    [(0, "2035-02-17"), (1000, "2035-02-30"), (1000, "2024-02-17")],
+)
+def test_zero_coupon_error_codes_match_scalar_messages(face_value, maturity_date):
+    with pytest.raises(ValueError) as excinfo:
+        get_zero_coupon_gilt_price(face_value, 0.03, maturity_date, "2025-02-17")
+    result = get_zero_coupon_gilt_price_batch([face_value], 0.03, [maturity_date], "2025-02-17", errors="mask")
+    assert error_messages(result.error_code)[0] == str(excinfo.value)
+
+
+def test_mask_with_no_valid_rows():
+    result = calculate_zero_coupon_bond_dv01_batch([-1, -2], 0.05, "2035-02-17", "2025-02-17", errors="mask")
+    assert not result.valid.any()
+    assert np.isnan(result.values).all()
+
+
+def test_mask_writes_into_caller_buffer():
+    out = np.zeros(3, dtype=np.float32)
+    result = calculate_fixed_coupon_gilt_price_dmo_batch(
+        0.04, "2025-03-07", ["2030-03-07", "2020-03-07", "2035-09-07"], 0.04, dtype="float32", out=out, errors="mask"
+    )
+    assert result.values is out
+    np.testing.assert_array_equal(result.valid, [True, False, True])
+    assert np.isnan(out[1])
+
+
+def test_clean_price_mask_fills_every_field():
+    result = calculate_gilt_clean_price_batch(0.04, ["2025-03-07", "bad"], "2030-03-07", 0.04, errors="mask")
+    assert result.values.clean_price[0] == 100.0
+    assert np.isnan(result.values.dirty_price[1])
+    assert not result.values.ex_dividend[1]
+
+
+def test_curve_batch_flags_bonds_beyond_curve():
+    result = calculate_fixed_coupon_gilt_price_with_curve_batch(
+        1000, [0.05, -0.01, 0.05], "2025-02-17", ["2030-02-17", "2030-02-17", "2045-02-17"], [0.03] * 20,
+        errors="mask",
+    )
+    np.testing.assert_array_equal(
+        result.error_code, [RowError.VALID, RowError.NEGATIVE_COUPON_RATE, RowError.CURVE_TOO_SHORT]
+    )
+
+
+def test_dates_outside_the_calendar_are_flagged_not_raised():
+    settlement_date = ["1960-01-01", "2025-03-07", "1970-01-02", "2025-03-07"]
+    maturity_date = ["2030-03-07", "2030-03-07", "1970-03-01", "2101-03-07"]
+    result = calculate_fixed_coupon_gilt_price_dmo_batch(0.04, settlement_date, maturity_date, 0.04, errors="mask")
+    np.testing.assert_array_equal(result.valid, [False, True, False, False])
+    assert (result.error_code[~result.valid] == RowError.DATE_OUTSIDE_CALENDAR).all()
+    assert result.values[1] == 100.0
+
+    with pytest.raises(ValueError) as excinfo:
+        calculate_fixed_coupon_gilt_price_dmo(100, 0.04, "1960-01-01", "2030-03-07", 0.04)
+    assert error_messages(result.error_code)[0] == str(excinfo.value)
+    clean = calculate_gilt_clean_price_batch(0.04, settlement_date, maturity_date, 0.04, errors="mask")
+    np.testing.assert_array_equal(clean.error_code, result.error_code)
+    # the zero-coupon pricers do not use the calendar
+    assert get_zero_coupon_gilt_price_batch(100, 0.03, "2030-03-07", "1960-01-01", errors="mask").valid.all()
+
+
+def test_raise_policy_is_unchanged_and_policy_is_validated():
+    with pytest.raises(ValueError, match="Face value must be positive."):
+        get_zero_coupon_gilt_price_batch([1000, -5], 0.03, "2035-02-17", "2025-02-17")
+    with pytest.raises(ValueError, match="Unsupported error policy"):
+        get_zero_coupon_gilt_price_batch(1000, 0.03, "2035-02-17", "2025-02-17", errors="ignore")
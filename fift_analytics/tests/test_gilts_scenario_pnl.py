@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from fift_analytics.gilts.scenario_pnl import (
+    aggregate_scenario_pnl,
+    calculate_fixed_coupon_scenario_pnl,
+    calculate_zero_coupon_scenario_pnl,
+)
+from fift_analytics.gilts.fixed_coupon.dmo_fixed_pricers import (
+    calculate_fixed_coupon_gilt_price_dmo,
+    calculate_fixed_coupon_gilt_price_dmo_batch,
+)
+from fift_analytics.gilts.zero_coupon.zc_pricers import get_zero_coupon_gilt_price, get_zero_coupon_gilt_price_batch
+
+SHOCKS = np.linspace(-0.02, 0.02, 9)
+
+
+def test_zero_coupon_pnl_matches_scalar_reference():
+    pnl = calculate_zero_coupon_scenario_pnl(
+        [1_000_000, 500_000], [0.04, 0.02], ["2035-02-17", "2027-06-30"], "2025-02-17", SHOCKS, chunk_size=4
+    )
+    assert pnl.shape == (9, 2)
+    for i, shock in enumerate(SHOCKS):
+        base = get_zero_coupon_gilt_price(1_000_000, 0.04, "2035-02-17", "2025-02-17", precision="raw")
+        shocked = get_zero_coupon_gilt_price(1_000_000, 0.04 + shock, "2035-02-17", "2025-02-17", precision="raw")
+        assert pnl[i, 0] == pytest.approx(shocked - base, rel=1e-9, abs=1e-6)
+
+
+def test_fixed_coupon_pnl_matches_scalar_reference():
+    pnl = calculate_fixed_coupon_scenario_pnl(
+        [0.04, 0.0125], [2_000_000, 100], "2025-03-07", ["2030-03-07", "2026-07-22"], [0.041, 0.039], SHOCKS
+    )
+    for i, shock in enumerate(SHOCKS):
+        base = calculate_fixed_coupon_gilt_price_dmo(100, 0.0125, "2025-03-07", "2026-07-22", 0.039, "raw")
+        shocked = calculate_fixed_coupon_gilt_price_dmo(100, 0.0125, "2025-03-07", "2026-07-22", 0.039 + shock, "raw")
+        assert pnl[i, 1] == pytest.approx(shocked - base, rel=1e-9, abs=1e-9)
+
+
+def test_float32_cube_accuracy():
+    args = ([0.04, 0.0125], [100_000_000, 50_000_000], "2025-03-07", ["2030-03-07", "2026-07-22"], [0.041, 0.039])
+    pnl64 = calculate_fixed_coupon_scenario_pnl(*args, SHOCKS)
+    pnl32 = calculate_fixed_coupon_scenario_pnl(*args, SHOCKS, dtype="float32")
+    assert pnl32.dtype == np.float32
+    np.testing.assert_allclose(pnl32, pnl64, rtol=2**-24)
+
+
+def test_aggregation_accumulates_in_float64():
+    pnl = np.full((2, 100_000), 0.1, dtype=np.float32)
+    totals = aggregate_scenario_pnl(pnl)
+    assert totals.dtype == np.float64
+    assert totals[0] == pytest.approx(100_000 * float(np.float32(0.1)), rel=1e-12)
+
+
+def test_grouped_aggregation():
+    pnl = np.arange(6, dtype=np.float32).reshape(2, 3)
+    np.testing.assert_array_equal(aggregate_scenario_pnl(pnl, ["b", "a", "b"], chunk_size=1), [[1, 2], [4, 8]])
+
+
+def test_batch_pricers_output_dtype():
+    zc = get_zero_coupon_gilt_price_batch([100, 100], [0.03, 0.04], "2035-02-17", "2025-02-17", dtype="float32")
+    dmo = calculate_fixed_coupon_gilt_price_dmo_batch(0.04, "2025-03-07", "2030-03-07", 0.04, dtype="float32")
+    assert zc.dtype == np.float32 and dmo.dtype == np.float32
+
+
+def test_invalid_dtype():
+    with pytest.raises(ValueError, match="Unsupported output dtype"):
+        calculate_zero_coupon_scenario_pnl(100, 0.03, "2035-02-17", "2025-02-17", SHOCKS, dtype="float16")
+
+
+def test_invalid_shock_shape():
+    with pytest.raises(ValueError, match="Yield shocks must have shape"):
+        calculate_zero_coupon_scenario_pnl([100, 100], 0.03, ["2035-02-17"] * 2, "2025-02-17", np.zeros((2, 3)))
+
+
+def test_scenario_pnl_into_out_buffer():
+    out = np.empty((SHOCKS.size, 1), dtype=np.float32)
+    pnl = calculate_zero_coupon_scenario_pnl([100], [0.03], ["2035-02-17"], "2025-02-17", SHOCKS, out=out)
+    assert pnl is out
+    np.testing.assert_allclose(out, calculate_zero_coupon_scenario_pnl(100, 0.03, ["2035-02-17"], "2025-02-17", SHOCKS))
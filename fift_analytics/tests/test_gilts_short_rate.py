@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from fift_analytics.gilts.day_count import year_fraction
+from fift_analytics.gilts.zero_coupon.short_rate import HullWhiteModel, VasicekModel, simulate_zero_coupon_prices
+
+ZERO_CURVE = [(3, 0.041), (24, 0.039), (60, 0.042), (120, 0.045), (360, 0.048)]
+MATURITIES = ["2027-02-17", "2030-02-17", "2045-02-17"]
+
+
+def discounted_mean(simulation):
+    discounted = simulation.price * simulation.discount_factor[:, None]
+    return discounted.mean(axis=0), discounted.std(axis=0) / np.sqrt(discounted.shape[0])
+
+
+def test_hull_white_reprices_the_zero_curve():
+    model = HullWhiteModel(ZERO_CURVE, mean_reversion=0.05, volatility=0.012)
+    simulation = simulate_zero_coupon_prices(model, 100, MATURITIES, "2025-02-17", "2026-02-17", 40_000, seed=3)
+    mean, standard_error = discounted_mean(simulation)
+    curve_price = 100 * np.exp(model.market_log_price(year_fraction("2025-02-17", MATURITIES)))
+    assert (np.abs(mean - curve_price) < 4 * standard_error).all()
+
+
+def test_vasicek_calibration_and_martingale():
+    model = VasicekModel.calibrate(ZERO_CURVE, mean_reversion=0.2, volatility=0.01)
+    tenors = np.array([tenor for tenor, _ in ZERO_CURVE]) / 12
+    fitted = -model._log_price(tenors, model.initial_rate) / tenors
+    assert np.abs(fitted - [y for _, y in ZERO_CURVE]).max() < 0.005
+
+    simulation = simulate_zero_coupon_prices(model, 100, MATURITIES, "2025-02-17", "2027-02-16", 40_000, seed=11)
+    mean, standard_error = discounted_mean(simulation)
+    model_price = 100 * np.exp(model._log_price(year_fraction("2025-02-17", MATURITIES), model.initial_rate))
+    assert (np.abs(mean - model_price) < 4 * standard_error).all()
+
+    horizon = float(year_fraction("2025-02-17", "2027-02-16"))
+    decay = np.exp(-model.mean_reversion * horizon)
+    expected_rate = model.initial_rate * decay + model.long_term_rate * (1 - decay)
+    assert simulation.short_rate.mean() == pytest.approx(expected_rate, abs=2e-4)
+
+
+@pytest.mark.parametrize("workers, executor", [(2, "thread"), (2, "process")])
+def test_seed_gives_same_paths_whatever_the_workers(workers, executor):
+    model = HullWhiteModel(ZERO_CURVE, 0.05, 0.012)
+    arguments = (model, [100, 50], MATURITIES[:2], "2025-02-17", "2025-08-17", 2_500)
+    serial = simulate_zero_coupon_prices(*arguments, seed=42, chunk_size=1_000)
+    parallel = simulate_zero_coupon_prices(*arguments, seed=42, chunk_size=1_000, workers=workers, executor=executor)
+    np.testing.assert_array_equal(serial.price, parallel.price)
+    np.testing.assert_array_equal(serial.discount_factor, parallel.discount_factor)
+    other = simulate_zero_coupon_prices(*arguments, seed=43, chunk_size=1_000)
+    assert not np.array_equal(serial.price, other.price)
+
+
+def test_aggregate_and_dtype():
+    model = HullWhiteModel(ZERO_CURVE, 0.05, 0.012)
+    arguments = (model, [100, 50], MATURITIES[:2], "2025-02-17", "2025-08-17", 3_000)
+    prices = simulate_zero_coupon_prices(*arguments, seed=5, chunk_size=700)
+    book = simulate_zero_coupon_prices(*arguments, seed=5, chunk_size=700, aggregate=True, dtype="float32")
+    assert prices.price.shape == (3_000, 2)
+    assert book.price.shape == (3_000,)
+    assert book.price.dtype == np.float32
+    np.testing.assert_allclose(book.price, prices.price.sum(axis=1), rtol=1e-6)
+
+
+def test_invalid_inputs():
+    model = HullWhiteModel(ZERO_CURVE, 0.05, 0.012)
+    with pytest.raises(ValueError, match="after the horizon"):
+        simulate_zero_coupon_prices(model, 100, "2025-06-17", "2025-02-17", "2026-02-17", 10)
+    with pytest.raises(ValueError, match="Horizon date"):
+        simulate_zero_coupon_prices(model, 100, "2030-02-17", "2025-02-17", "2025-02-17", 10)
+    with pytest.raises(ValueError, match="Number of paths"):
+        simulate_zero_coupon_prices(model, 100, "2030-02-17", "2025-02-17", "2026-02-17", 0)
+    with pytest.raises(ValueError, match="positive"):
+        HullWhiteModel(ZERO_CURVE, 0.0, 0.01)
+    with pytest.raises(ValueError, match="positive"):
+        VasicekModel(0.1, -0.01, 0.04, 0.04)
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from fift_analytics.gilts.fixed_coupon.quasi_coupon import build_cash_flows
+from fift_analytics.gilts.fixed_coupon.strips import price_stripped_gilts, strip_gilts
+from fift_analytics.gilts.fixed_coupon.z_spread import calculate_z_spread_batch
+
+ZERO_CURVE = [(3, 0.041), (24, 0.039), (60, 0.042), (120, 0.045), (360, 0.048)]
+COUPONS = [0.04, 0.0125, 0.0425, 0.0375, 0.04]
+NOMINALS = [1_000_000, 500_000, 2_000_000, 750_000, 250_000]
+MATURITIES = ["2030-03-07", "2026-07-22", "2055-12-07", "2030-09-07", "2035-03-07"]
+
+
+def test_strips_net_shared_payment_dates():
+    strips = strip_gilts(COUPONS, NOMINALS, "2025-03-10", MATURITIES)
+    flows = build_cash_flows(COUPONS, "2025-03-10", MATURITIES)
+    assert strips.payment_date.size == np.unique(flows.payment_date[flows.amount > 0]).size
+    assert (np.diff(strips.payment_date).astype(int) > 0).all()
+    assert strips.coupon_strips.sum() + strips.principal_strips.sum() == pytest.approx(strips.amount.sum())
+    assert strips.principal_strips.sum() == pytest.approx(sum(NOMINALS))
+
+    on_2030_03_07 = strips.payment_date == np.datetime64("2030-03-07")
+    assert strips.principal_strips[on_2030_03_07] == pytest.approx(1_000_000)
+    assert strips.coupon_strips[on_2030_03_07] == pytest.approx(20_000 + 750_000 * 0.01875 + 250_000 * 0.02)
+
+
+def test_ex_dividend_coupon_is_not_stripped():
+    cum = strip_gilts(0.04, 100, "2025-08-20", "2030-03-07")
+    ex = strip_gilts(0.04, 100, "2025-09-01", "2030-03-07")
+    assert cum.payment_date[0] == np.datetime64("2025-09-07")
+    assert ex.payment_date[0] == np.datetime64("2026-03-07")
+    assert cum.payment_date.size == ex.payment_date.size + 1
+
+
+def test_gilt_values_are_discounted_cash_flows_on_the_curve():
+    strips = strip_gilts(COUPONS, NOMINALS, "2025-03-10", MATURITIES)
+    valuation = price_stripped_gilts(strips, ZERO_CURVE, precision="raw")
+    assert valuation.discount_factor.shape == strips.payment_date.shape
+    assert valuation.strip_value.sum() == pytest.approx(valuation.gilt_value.sum())
+
+    dirty_price = 100 * valuation.gilt_value / np.array(NOMINALS)
+    result = calculate_z_spread_batch(COUPONS, "2025-03-10", MATURITIES, dirty_price, ZERO_CURVE)
+    np.testing.assert_allclose(result.z_spread, 0.0, atol=1e-12)
+
+
+def test_invalid_inputs_raise():
+    with pytest.raises(ValueError, match="single date"):
+        strip_gilts(0.04, 100, ["2025-03-10", "2025-03-11"], "2030-03-07")
+    with pytest.raises(ValueError, match="before maturity date"):
+        strip_gilts(0.04, 100, "2030-03-10", "2030-03-07")
@@ -0,0 +1,157 @@
+import threading
+
+import numpy as np
+import pytest
+from fift_analytics.gilts.fixed_coupon.dmo_fixed_pricers import calculate_fixed_coupon_gilt_price_dmo
+from fift_analytics.gilts.tick_stream import TickStream
+from fift_analytics.gilts.zero_coupon.zc_pricers import get_zero_coupon_gilt_price
+
+
+class ManualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_stream(**kwargs):
+    return TickStream(
+        "2025-03-07",
+        ["UKT 4 2030", "UKT 4 2035"],
+        [0.04, 0.04],
+        ["2030-03-07", "2035-03-07"],
+        zero_coupon_instrument=["STRIP 2035"],
+        zero_coupon_maturity_date=["2035-03-07"],
+        **kwargs,
+    )
+
+
+def test_drain_reprices_only_changed_instruments_like_scalar_pricers():
+    stream = make_stream()
+    published = []
+    stream.subscribe(published.append)
+    stream.on_tick("UKT 4 2035", 0.045)
+    stream.on_tick("STRIP 2035", 0.03)
+    assert stream.drain() == 2
+
+    batch = published[0]
+    assert batch.instrument.tolist() == ["UKT 4 2035", "STRIP 2035"]
+    assert batch.price[0] == calculate_fixed_coupon_gilt_price_dmo(100, 0.04, "2025-03-07", "2035-03-07", 0.045)
+    assert batch.price[1] == get_zero_coupon_gilt_price(100, 0.03, "2035-03-07", "2025-03-07")
+    assert stream.drain() == 0
+    assert len(published) == 1
+
+
+def test_latest_value_wins_and_counters():
+    stream = make_stream(clock=ManualClock())
+    published = []
+    stream.subscribe(published.append)
+    stream.on_tick("UKT 4 2030", 0.05, timestamp=1.0)
+    stream.on_tick("UKT 4 2030", 0.04, timestamp=2.0)
+    stream.on_tick("UKT 4 2030", 0.06, timestamp=1.5)
+    stream.on_tick("UNKNOWN", 0.04)
+    stream.on_tick("UKT 4 2035", np.nan)
+    stream.drain()
+
+    assert published[0].annual_yield.tolist() == [0.04]
+    stats = stream.stats()
+    assert (stats.received, stats.coalesced, stats.dropped, stats.priced, stats.drains) == (5, 1, 3, 1, 1)
+
+
+def test_on_ticks_batch_matches_tick_by_tick():
+    names = ["UKT 4 2030", "STRIP 2035", "UKT 4 2030", "UNKNOWN", "STRIP 2035", "UKT 4 2035"]
+    yields = [0.05, 0.03, 0.041, 0.04, 0.031, 0.045]
+    one_by_one, batched = make_stream(clock=ManualClock()), make_stream(clock=ManualClock())
+    for name, annual_yield in zip(names, yields):
+        one_by_one.on_tick(name, annual_yield)
+    batched.on_ticks(names, yields)
+
+    results = []
+    for stream in (one_by_one, batched):
+        stream.subscribe(results.append)
+        stream.drain()
+    np.testing.assert_array_equal(results[0].annual_yield, results[1].annual_yield)
+    np.testing.assert_array_equal(results[0].price, results[1].price)
+    assert one_by_one.stats()[:3] == batched.stats()[:3] == (6, 2, 1)
+
+
+def test_on_ticks_drops_stale_ticks_within_a_batch_like_on_tick():
+    names = ["UKT 4 2030", "UKT 4 2030", "STRIP 2035", "UKT 4 2030", "STRIP 2035", "UKT 4 2030", "UKT 4 2035"]
+    yields = [0.05, 0.03, 0.031, 0.045, 0.032, 0.046, 0.04]
+    times = [2.0, 1.0, 5.0, 2.0, 4.0, 3.0, 0.5]
+    one_by_one, batched = make_stream(clock=ManualClock()), make_stream(clock=ManualClock())
+    one_by_one.on_tick("UKT 4 2035", 0.04, timestamp=1.0)
+    batched.on_tick("UKT 4 2035", 0.04, timestamp=1.0)
+    for name, annual_yield, timestamp in zip(names, yields, times):
+        one_by_one.on_tick(name, annual_yield, timestamp)
+    batched.on_ticks(names, yields, times)
+
+    results = []
+    for stream in (one_by_one, batched):
+        stream.subscribe(results.append)
+        stream.drain()
+    assert results[1].annual_yield.tolist() == [0.046, 0.04, 0.031]
+    np.testing.assert_array_equal(results[0].tick_time, results[1].tick_time)
+    assert one_by_one.stats()[:3] == batched.stats()[:3] == (8, 2, 3)
+
+    batched.on_ticks(["UKT 4 2030", "UKT 4 2030"], [0.05, 0.03], [12.0, 11.0])
+    batched.drain()
+    assert results[-1].annual_yield.tolist() == [0.05]
+    batched.on_ticks(["UNKNOWN", "UKT 4 2030"], [0.04, 0.04], [13.0, 1.0])
+    assert batched.drain() == 0
+
+
+def test_latency_percentiles_from_tick_time():
+    clock = ManualClock()
+    stream = make_stream(clock=clock)
+    assert np.isnan(stream.stats().latency[50.0])
+    stream.on_tick("UKT 4 2030", 0.04, timestamp=0.0)
+    stream.on_tick("UKT 4 2035", 0.04, timestamp=0.5)
+    clock.now = 1.0
+    stream.drain()
+    latency = stream.stats(percentiles=(0.0, 100.0)).latency
+    assert latency == {0.0: 0.5, 100.0: 1.0}
+
+
+def test_matured_instrument_is_published_as_invalid():
+    stream = TickStream("2031-01-02", ["UKT 4 2030", "UKT 4 2035"], [0.04, 0.04], ["2030-03-07", "2035-03-07"])
+    published = []
+    stream.subscribe(published.append)
+    stream.on_ticks(["UKT 4 2030", "UKT 4 2035"], 0.04)
+    stream.drain()
+    assert published[0].valid.tolist() == [False, True]
+    assert np.isnan(published[0].price[0])
+
+
+def test_background_drain_publishes_from_feed_thread():
+    stream = make_stream(cadence=0.001)
+    received = threading.Event()
+    stream.subscribe(lambda batch: received.set())
+    with stream:
+        stream.on_tick("UKT 4 2030", 0.04)
+        assert received.wait(5)
+    assert stream.stats().priced == 1
+
+
+def test_subscriber_error_is_raised_on_stop():
+    stream = make_stream(cadence=0.001)
+
+    def failing(batch):
+        raise RuntimeError("subscriber failed")
+
+    stream.subscribe(failing)
+    stream.start()
+    stream.on_tick("UKT 4 2030", 0.04)
+    stream._thread.join(5)
+    with pytest.raises(RuntimeError, match="subscriber failed"):
+        stream.stop()
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError, match="matching lengths"):
+        TickStream("2025-03-07", ["A"], [0.04, 0.05], ["2030-03-07"])
+    with pytest.raises(ValueError, match="unique"):
+        TickStream("2025-03-07", ["A", "A"], [0.04, 0.05], ["2030-03-07", "2031-03-07"])
+    with pytest.raises(ValueError, match="Cadence"):
+        TickStream("2025-03-07", cadence=0)
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+from datetime import date
+from fift_analytics.gilts.uk_calendar import (
+    UKBusinessCalendar,
+    easter_sunday,
+    get_settlement_dates,
+    get_uk_calendar,
+    to_datetime64,
+    uk_bank_holidays,
+)
+from fift_analytics.gilts.fixed_coupon.quasi_coupon import get_ex_dividend_dates
+
+
+def test_easter_sunday():
+    assert easter_sunday(2024) == date(2024, 3, 31)
+    assert easter_sunday(2025) == date(2025, 4, 20)
+    assert easter_sunday(2038) == date(2038, 4, 25)
+
+
+def test_bank_holidays_with_substitute_days():
+    holidays = uk_bank_holidays(2021)
+    assert date(2021, 12, 27) in holidays
+    assert date(2021, 12, 28) in holidays
+    assert date(2021, 12, 25) not in holidays
+
+
+def test_bank_holidays_special_days():
+    holidays = uk_bank_holidays(2022)
+    assert date(2022, 6, 2) in holidays
+    assert date(2022, 6, 3) in holidays
+    assert date(2022, 9, 19) in holidays
+    assert date(2022, 5, 30) not in holidays
+
+    holidays = uk_bank_holidays(2002)
+    assert date(2002, 6, 3) in holidays
+    assert date(2002, 6, 4) in holidays
+    assert date(2002, 5, 27) not in holidays
+    assert list(get_uk_calendar().is_business_day(["2002-05-31", "2002-06-03", "2002-06-05"])) == [True, False, True]
+
+
+def test_is_business_day():
+    calendar = get_uk_calendar()
+    result = calendar.is_business_day(["2025-04-18", "2025-04-19", "2025-04-22"])
+    assert list(result) == [False, False, True]
+
+
+def test_roll_conventions():
+    calendar = get_uk_calendar()
+    dates = ["2025-05-31", "2025-12-25"]
+    assert list(calendar.roll(dates, "following")) == list(
+        np.array(["2025-06-02", "2025-12-29"], dtype="datetime64[D]")
+    )
+    assert list(calendar.roll(dates, "preceding")) == list(
+        np.array(["2025-05-30", "2025-12-24"], dtype="datetime64[D]")
+    )
+    assert list(calendar.roll(dates, "modified_following")) == list(
+        np.array(["2025-05-30", "2025-12-29"], dtype="datetime64[D]")
+    )
+
+
+def test_roll_invalid_convention():
+    with pytest.raises(ValueError, match="Unsupported roll convention"):
+        get_uk_calendar().roll("2025-05-31", "nearest")
+
+
+def test_add_business_days_matches_numpy():
+    calendar = get_uk_calendar()
+    dates = np.arange(np.datetime64("2020-01-01"), np.datetime64("2030-01-01"), 13)
+    expected = np.busday_offset(dates, 5, roll="forward", holidays=calendar.holidays)
+    np.testing.assert_array_equal(calendar.add_business_days(dates, 5), expected)
+
+
+def test_count_business_days_matches_numpy():
+    calendar = get_uk_calendar()
+    start = np.arange(np.datetime64("2020-01-01"), np.datetime64("2021-01-01"), 7)
+    end = start + 45
+    expected = np.busday_count(start, end, holidays=calendar.holidays)
+    np.testing.assert_array_equal(calendar.count_business_days(start, end), expected)
+
+
+def test_dates_outside_range():
+    calendar = UKBusinessCalendar(2020, 2021)
+    with pytest.raises(ValueError, match="Dates must fall between 2020 and 2021."):
+        calendar.add_business_days("2019-06-01", 1)
+
+
+def test_settlement_dates_t_plus_one():
+    result = get_settlement_dates(["2025-04-17", "2025-12-24", "2025-06-02"])
+    assert list(result) == list(np.array(["2025-04-22", "2025-12-29", "2025-06-03"], dtype="datetime64[D]"))
+
+
+def test_ex_dividend_date_skips_bank_holidays():
+    # 7 business days before 22 April 2025 skip Good Friday and Easter Monday
+    assert get_ex_dividend_dates("2025-04-22") == np.datetime64("2025-04-09")
+
+
+def test_to_datetime64_views_ordinal_buffers():
+    ordinals = np.array([20136, 20137], dtype=np.int64)
+    dates = to_datetime64(memoryview(ordinals))
+    assert np.shares_memory(dates, ordinals)
+    np.testing.assert_array_equal(dates, np.array(["2025-02-17", "2025-02-18"], dtype="datetime64[D]"))
+    np.testing.assert_array_equal(to_datetime64(ordinals.astype(np.int32)), dates)
+    np.testing.assert_array_equal(to_datetime64(dates.astype("datetime64[ns]")), dates)
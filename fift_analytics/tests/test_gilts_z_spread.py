@@ -0,0 +1,79 @@
+import math
+
+import numpy as np
+import pytest
+from fift_analytics.gilts.day_count import year_fraction
+from fift_analytics.gilts.fixed_coupon.dmo_fixed_pricers import calculate_fixed_coupon_gilt_price_dmo
+from fift_analytics.gilts.fixed_coupon.quasi_coupon import build_cash_flows, get_quasi_coupon_dates
+from fift_analytics.gilts.fixed_coupon.z_spread import calculate_z_spread_batch
+from fift_analytics.gilts.row_errors import RowError
+from fift_analytics.gilts.zero_coupon.curve_yield_extrapolation import derive_yield_from_zero_curve
+
+ZERO_CURVE = [(3, 0.041), (24, 0.039), (60, 0.042), (120, 0.045), (360, 0.048)]
+COUPONS = [0.04, 0.0125, 0.0425, 0.0]
+MATURITIES = ["2030-03-07", "2026-07-22", "2055-12-07", "2027-09-07"]
+
+
+def reference_price(annual_coupon_rate, settlement_date, maturity_date, z_spread):
+    flows = build_cash_flows(annual_coupon_rate, settlement_date, maturity_date)
+    price = 0.0
+    for payment_date, amount in zip(flows.payment_date[0], flows.amount[0]):
+        time = float(year_fraction(settlement_date, payment_date))
+        zero_yield = derive_yield_from_zero_curve(ZERO_CURVE, 12 * time)
+        price += amount * math.exp(-(zero_yield + z_spread) * time)
+    return price
+
+
+@pytest.mark.parametrize("settlement_date", ["2025-03-07", "2025-08-29", "2025-09-01"])
+def test_cash_flows_reproduce_dmo_price(settlement_date):
+    flows = build_cash_flows(0.04, settlement_date, "2030-03-07")
+    prior_date, next_date, _ = get_quasi_coupon_dates(settlement_date, "2030-03-07")
+    r = (next_date - np.datetime64(settlement_date)).astype(int)
+    s = (next_date - prior_date).astype(int)
+    v = 1 / 1.02
+    exponents = r / s + np.arange(flows.amount.shape[1])
+    price = (flows.amount[0] * v**exponents).sum()
+    assert price == pytest.approx(
+        calculate_fixed_coupon_gilt_price_dmo(100, 0.04, settlement_date, "2030-03-07", 0.04, precision="raw"), abs=1e-9
+    )
+
+
+def test_solver_recovers_spread_of_reference_prices():
+    spreads = np.array([0.0025, -0.001, 0.01, 0.0])
+    prices = [reference_price(c, "2025-03-10", m, s) for c, m, s in zip(COUPONS, MATURITIES, spreads)]
+    result = calculate_z_spread_batch(COUPONS, "2025-03-10", MATURITIES, prices, ZERO_CURVE)
+    np.testing.assert_allclose(result.z_spread, spreads, atol=1e-12)
+    assert result.converged.all()
+    assert (result.iterations <= 5).all()
+    assert (np.abs(result.price_error) <= 1e-10).all()
+
+
+def test_broadcast_shape_is_preserved():
+    result = calculate_z_spread_batch(0.04, "2025-03-10", [["2030-03-07"], ["2035-03-07"]], [[95.0, 99.0]], ZERO_CURVE)
+    assert result.z_spread.shape == (2, 2)
+    assert result.z_spread[0, 0] > result.z_spread[0, 1]
+
+
+def test_iteration_cap_reports_unconverged_bonds():
+    result = calculate_z_spread_batch(0.04, "2025-03-10", "2055-12-07", 60.0, ZERO_CURVE, max_iterations=0)
+    assert not result.converged
+    assert result.iterations == 0
+    assert abs(result.price_error) > 1e-10
+
+
+def test_mask_flags_invalid_rows():
+    result = calculate_z_spread_batch(
+        0.04, "2025-03-10", ["2030-03-07", "2024-03-07", "2030-03-07"], [98.0, 98.0, -1.0], ZERO_CURVE, errors="mask"
+    )
+    np.testing.assert_array_equal(
+        result.error_code, [RowError.VALID, RowError.MATURITY_NOT_AFTER_SETTLEMENT, RowError.NON_POSITIVE_PRICE]
+    )
+    assert np.isnan(result.values.z_spread[1:]).all()
+    assert result.values.converged.tolist() == [True, False, False]
+
+
+def test_invalid_inputs_raise():
+    with pytest.raises(ValueError, match="Dirty price must be positive."):
+        calculate_z_spread_batch(0.04, "2025-03-10", "2030-03-07", 0.0, ZERO_CURVE)
+    with pytest.raises(ValueError, match="Settlement date must be before maturity date."):
+        calculate_z_spread_batch(0.04, "2030-03-10", "2030-03-07", 98.0, ZERO_CURVE)
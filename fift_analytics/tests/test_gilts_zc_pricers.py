@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 from datetime import datetime
 from fift_analytics.gilts.zero_coupon.zc_pricers import (
@@ -8,6 +9,7 @@ from fift_analytics.gilts.zero_coupon.zc_pricers import (
     calculate_time_to_maturity,
     is_leap_year,
     compute_continuous_price,
+    get_zero_coupon_gilt_price_batch,
 )
 
 
@@ -104,3 +106,30 @@ def test_get_zero_coupon_gilt_price_invalid_dates():
 def test_get_zero_coupon_gilt_price_invalid_face_value():
     with pytest.raises(ValueError, match="Face value must be positive."):
         get_zero_coupon_gilt_price(-1000, 0.03, "2035-02-17", "2025-02-17")
+
+
+def test_batch_price_from_buffers_into_out():
+    face_value = np.full(3, 1000.0)
+    annual_yield = np.array([0.03, 0.04, -0.01])
+    maturity = np.array(["2035-02-17"] * 3, dtype="datetime64[D]").astype(np.int64)
+    out = np.zeros(3, dtype=np.float32)
+    result = get_zero_coupon_gilt_price_batch(
+        memoryview(face_value), memoryview(annual_yield), memoryview(maturity), "2025-02-17", out=memoryview(out)
+    )
+    assert np.shares_memory(result, out)
+    expected = get_zero_coupon_gilt_price_batch(face_value, annual_yield, "2035-02-17", "2025-02-17")
+    np.testing.assert_allclose(out, expected)
+
+
+def test_batch_price_out_shape_mismatch():
+    with pytest.raises(ValueError, match="Output buffer shape"):
+        get_zero_coupon_gilt_price_batch([1000, 1000], 0.03, "2035-02-17", "2025-02-17", out=np.zeros(3))
+
+
+@pytest.mark.parametrize("maturity_date", ["", "NaT", "2035", "2035-02"])
+def test_batch_price_rejects_missing_and_partial_dates(maturity_date):
+    with pytest.raises(ValueError, match="Invalid date format"):
+        get_zero_coupon_gilt_price_batch(100, [0.03, 0.03], ["2035-02-17", maturity_date], "2025-02-17")
+    with pytest.raises(ValueError, match="Invalid date format"):
+        maturity = np.array(["2035-02-17", "NaT"], dtype="datetime64[D]")
+        get_zero_coupon_gilt_price_batch(100, [0.03, 0.03], maturity, "2025-02-17")